@@ -36,6 +36,16 @@ BEGIN
 END;
 GO
 
+IF NOT EXISTS (SELECT * FROM sys.external_file_formats WHERE name = 'ParquetFormat')
+BEGIN
+    CREATE EXTERNAL FILE FORMAT ParquetFormat
+    WITH (
+        FORMAT_TYPE = PARQUET,
+        DATA_COMPRESSION = 'org.apache.hadoop.io.compress.SnappyCodec'
+    );
+END;
+GO
+
 -- External table for manual uploaded data
 CREATE EXTERNAL TABLE IF NOT EXISTS bronze.manual_properties_external (
     advertisement_number VARCHAR(50),
@@ -114,4 +124,120 @@ WITH (
     DATA_SOURCE = AzureDataLakeStorage,
     FILE_FORMAT = CSVFormat
 );
+GO
+
+-- External table for the scraper's change-data-capture output
+-- change_type is new, changed or gone; gone rows only carry ad_id
+CREATE EXTERNAL TABLE IF NOT EXISTS bronze.scraped_properties_delta_external (
+    change_type VARCHAR(20),
+    type NVARCHAR(100),
+    listing_type VARCHAR(20),
+    city NVARCHAR(100),
+    district NVARCHAR(100),
+    district_en VARCHAR(100),
+    price VARCHAR(50),
+    price_numeric VARCHAR(20),
+    area VARCHAR(50),
+    area_numeric VARCHAR(20),
+    bedrooms VARCHAR(10),
+    ad_id VARCHAR(50),
+    code VARCHAR(50),
+    title NVARCHAR(500),
+    lat VARCHAR(20),
+    lng VARCHAR(20),
+    created_at VARCHAR(50),
+    source VARCHAR(50),
+    extraction_date VARCHAR(50),
+    file_date DATE
+)
+WITH (
+    LOCATION = '/bronze/scraped_properties_delta/*/*.csv',
+    DATA_SOURCE = AzureDataLakeStorage,
+    FILE_FORMAT = CSVFormat
+);
+GO
+
+-- External table for the near-duplicate clusters found by the scraper
+-- Every clustered listing points at its cluster's canonical listing, itself included
+CREATE EXTERNAL TABLE IF NOT EXISTS bronze.property_duplicates_external (
+    ad_id VARCHAR(50),
+    source VARCHAR(50),
+    canonical_id VARCHAR(50),
+    canonical_source VARCHAR(50),
+    file_date DATE
+)
+WITH (
+    LOCATION = '/bronze/property_duplicates/*/*.csv',
+    DATA_SOURCE = AzureDataLakeStorage,
+    FILE_FORMAT = CSVFormat
+);
+GO
+
+-- External table for web scraped data written as typed Parquet
+CREATE EXTERNAL TABLE IF NOT EXISTS bronze.scraped_properties_parquet_external (
+    type NVARCHAR(100),
+    listing_type VARCHAR(20),
+    city NVARCHAR(100),
+    district NVARCHAR(100),
+    district_en VARCHAR(100),
+    price_numeric FLOAT,
+    area_numeric FLOAT,
+    bedrooms FLOAT,
+    ad_id VARCHAR(50),
+    code VARCHAR(50),
+    title NVARCHAR(500),
+    lat FLOAT,
+    lng FLOAT,
+    created_at DATETIME2,
+    source VARCHAR(50),
+    extraction_date DATETIME2,
+    file_date DATE
+)
+WITH (
+    LOCATION = '/raw/source=dealapp/*/*.parquet',
+    DATA_SOURCE = AzureDataLakeStorage,
+    FILE_FORMAT = ParquetFormat
+);
+GO
+
+-- External table for manual uploads normalized to typed Parquet by the scraper's normalize command
+CREATE EXTERNAL TABLE IF NOT EXISTS bronze.manual_properties_parquet_external (
+    type NVARCHAR(100),
+    listing_type VARCHAR(20),
+    city NVARCHAR(100),
+    district NVARCHAR(100),
+    district_en VARCHAR(100),
+    price_numeric FLOAT,
+    area_numeric FLOAT,
+    bedrooms FLOAT,
+    ad_id VARCHAR(50),
+    lat FLOAT,
+    lng FLOAT,
+    created_at DATETIME2,
+    source VARCHAR(50),
+    extraction_date DATETIME2,
+    region NVARCHAR(100),
+    bathrooms INT,
+    living_rooms INT,
+    kitchens INT,
+    floor INT,
+    has_driver_room BIT,
+    has_maid_room BIT,
+    has_swimming_pool BIT,
+    is_duplex BIT,
+    is_furnished BIT,
+    families_or_singles VARCHAR(50),
+    street_direction VARCHAR(50),
+    street_width INT,
+    advertiser_type VARCHAR(50),
+    rental_period VARCHAR(50),
+    status VARCHAR(20),
+    last_updated_at DATETIME2,
+    file_date DATE
+)
+WITH (
+    LOCATION = '/raw/source=manual/*/*.parquet',
+    DATA_SOURCE = AzureDataLakeStorage,
+    FILE_FORMAT = ParquetFormat
+);
 GO
\ No newline at end of file
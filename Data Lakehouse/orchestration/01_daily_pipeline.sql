@@ -1,6 +1,10 @@
 -- Main pipeline procedure
 CREATE OR ALTER PROCEDURE dbo.sp_run_daily_pipeline
-    @file_date DATE = NULL
+    @file_date DATE = NULL,
+    @scraped_delta BIT = 0,  -- load the scraper's delta file instead of the full snapshot
+    @scraped_parquet BIT = 0,  -- load the full snapshot from the scraper's Parquet output instead of CSV
+    @manual_parquet BIT = 0,  -- load manual uploads normalized to Parquet instead of the raw CSV
+    @mark_duplicates BIT = 0  -- retire near-duplicate listings found by the scraper before refreshing gold
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -16,11 +20,38 @@ BEGIN
         PRINT 'Starting daily pipeline for ' + CAST(@file_date AS VARCHAR(10));
 
         -- Step 1: Load bronze to silver
-        PRINT 'Loading manual properties...';
-        EXEC silver.sp_load_manual_properties @file_date = @file_date;
+        IF @manual_parquet = 1
+        BEGIN
+            PRINT 'Loading normalized manual properties...';
+            EXEC silver.sp_load_manual_properties_parquet @file_date = @file_date;
+        END
+        ELSE
+        BEGIN
+            PRINT 'Loading manual properties...';
+            EXEC silver.sp_load_manual_properties @file_date = @file_date;
+        END;
+
+        IF @scraped_delta = 1
+        BEGIN
+            PRINT 'Loading scraped property changes...';
+            EXEC silver.sp_load_scraped_delta @file_date = @file_date;
+        END
+        ELSE IF @scraped_parquet = 1
+        BEGIN
+            PRINT 'Loading scraped properties from Parquet...';
+            EXEC silver.sp_load_scraped_properties_parquet @file_date = @file_date;
+        END
+        ELSE
+        BEGIN
+            PRINT 'Loading scraped properties...';
+            EXEC silver.sp_load_scraped_properties @file_date = @file_date;
+        END;
 
-        PRINT 'Loading scraped properties...';
-        EXEC silver.sp_load_scraped_properties @file_date = @file_date;
+        IF @mark_duplicates = 1
+        BEGIN
+            PRINT 'Marking near-duplicate properties...';
+            EXEC silver.sp_mark_duplicate_properties @file_date = @file_date;
+        END;
 
         -- Step 2: Refresh gold layer
         PRINT 'Refreshing property analytics...';
@@ -58,6 +58,63 @@ BEGIN
 END;
 GO
 
+-- Procedure to load manual uploads already normalized to typed Parquet
+-- Rows that failed validation were written to a rejects file instead
+CREATE OR ALTER PROCEDURE silver.sp_load_manual_properties_parquet
+    @file_date DATE = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Use current date if not provided
+    IF @file_date IS NULL
+        SET @file_date = CAST(GETDATE() AS DATE);
+
+    -- Clear staging table
+    TRUNCATE TABLE silver.properties_staging;
+
+    -- Columns are typed and cleaned, so no TRY_CAST or flag parsing is needed
+    INSERT INTO silver.properties_staging
+    SELECT 
+        'MANUAL' as source_system,
+        ad_id as source_id,
+        type as property_type,
+        listing_type,
+        city,
+        region,
+        district,
+        district_en,
+        CAST(price_numeric AS DECIMAL(18,2)) as price,
+        CAST(area_numeric AS DECIMAL(10,2)) as area,
+        CAST(bedrooms AS INT) as bedrooms,
+        bathrooms,
+        living_rooms,
+        kitchens,
+        floor,
+        has_driver_room,
+        has_maid_room,
+        has_swimming_pool,
+        is_duplex,
+        is_furnished,
+        families_or_singles,
+        street_direction,
+        street_width,
+        CAST(lat AS DECIMAL(10,6)) as latitude,
+        CAST(lng AS DECIMAL(10,6)) as longitude,
+        advertiser_type,
+        rental_period,
+        status,
+        CAST(created_at AS DATETIME) as created_date,
+        CAST(last_updated_at AS DATETIME) as last_updated_date,
+        file_date as extraction_date
+    FROM bronze.manual_properties_parquet_external
+    WHERE file_date = @file_date;
+
+    -- Merge into silver table
+    EXEC silver.sp_merge_properties;
+END;
+GO
+
 -- Procedure to load scraped properties to silver
 CREATE OR ALTER PROCEDURE silver.sp_load_scraped_properties
     @file_date DATE = NULL
@@ -114,6 +171,157 @@ BEGIN
 END;
 GO
 
+-- Procedure to load scraped properties written as typed Parquet
+CREATE OR ALTER PROCEDURE silver.sp_load_scraped_properties_parquet
+    @file_date DATE = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Use current date if not provided
+    IF @file_date IS NULL
+        SET @file_date = CAST(GETDATE() AS DATE);
+
+    -- Clear staging table
+    TRUNCATE TABLE silver.properties_staging;
+
+    -- Columns are already typed, so no TRY_CAST is needed
+    INSERT INTO silver.properties_staging
+    SELECT 
+        'SCRAPED' as source_system,
+        ad_id as source_id,
+        type as property_type,
+        listing_type,
+        city,
+        NULL as region,
+        district,
+        district_en,
+        CAST(price_numeric AS DECIMAL(18,2)) as price,
+        CAST(area_numeric AS DECIMAL(10,2)) as area,
+        CAST(bedrooms AS INT) as bedrooms,
+        NULL as bathrooms,
+        NULL as living_rooms,
+        NULL as kitchens,
+        NULL as floor,
+        0 as has_driver_room,
+        0 as has_maid_room,
+        0 as has_swimming_pool,
+        0 as is_duplex,
+        0 as is_furnished,
+        NULL as families_or_singles,
+        NULL as street_direction,
+        NULL as street_width,
+        CAST(lat AS DECIMAL(10,6)) as latitude,
+        CAST(lng AS DECIMAL(10,6)) as longitude,
+        NULL as advertiser_type,
+        NULL as rental_period,
+        'active' as status,
+        CAST(created_at AS DATETIME) as created_date,
+        CAST(extraction_date AS DATETIME) as last_updated_date,
+        file_date as extraction_date
+    FROM bronze.scraped_properties_parquet_external
+    WHERE file_date = @file_date;
+
+    -- Merge into silver table
+    EXEC silver.sp_merge_properties;
+END;
+GO
+
+-- Procedure to load only the scraped listings that changed since the last crawl
+CREATE OR ALTER PROCEDURE silver.sp_load_scraped_delta
+    @file_date DATE = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Use current date if not provided
+    IF @file_date IS NULL
+        SET @file_date = CAST(GETDATE() AS DATE);
+
+    -- Clear staging table
+    TRUNCATE TABLE silver.properties_staging;
+
+    -- Stage new and changed listings; unchanged ones are not in the delta
+    INSERT INTO silver.properties_staging
+    SELECT 
+        'SCRAPED' as source_system,
+        ad_id as source_id,
+        type as property_type,
+        listing_type,
+        city,
+        NULL as region,
+        district,
+        district_en,
+        TRY_CAST(REPLACE(REPLACE(price_numeric, ',', ''), ' ', '') AS DECIMAL(18,2)) as price,
+        TRY_CAST(area_numeric AS DECIMAL(10,2)) as area,
+        TRY_CAST(bedrooms AS INT) as bedrooms,
+        NULL as bathrooms,
+        NULL as living_rooms,
+        NULL as kitchens,
+        NULL as floor,
+        0 as has_driver_room,
+        0 as has_maid_room,
+        0 as has_swimming_pool,
+        0 as is_duplex,
+        0 as is_furnished,
+        NULL as families_or_singles,
+        NULL as street_direction,
+        NULL as street_width,
+        TRY_CAST(lat AS DECIMAL(10,6)) as latitude,
+        TRY_CAST(lng AS DECIMAL(10,6)) as longitude,
+        NULL as advertiser_type,
+        NULL as rental_period,
+        'active' as status,
+        TRY_CAST(created_at AS DATETIME) as created_date,
+        TRY_CAST(extraction_date AS DATETIME) as last_updated_date,
+        file_date as extraction_date
+    FROM bronze.scraped_properties_delta_external
+    WHERE file_date = @file_date
+        AND change_type IN ('new', 'changed');
+
+    -- Merge into silver table
+    EXEC silver.sp_merge_properties;
+
+    -- Close listings that disappeared from the market
+    UPDATE p
+    SET status = 'closed',
+        update_timestamp = GETDATE()
+    FROM silver.properties p
+    INNER JOIN bronze.scraped_properties_delta_external d
+        ON p.source_id = d.ad_id
+        AND d.file_date = @file_date
+        AND d.change_type = 'gone'
+    WHERE p.source_system = 'SCRAPED'
+        AND p.is_current = 1;
+END;
+GO
+
+-- Procedure to retire near-duplicate listings, keeping each cluster's canonical listing active
+-- Gold only reads active listings, so a property reposted or uploaded twice is counted once
+CREATE OR ALTER PROCEDURE silver.sp_mark_duplicate_properties
+    @file_date DATE = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Use current date if not provided
+    IF @file_date IS NULL
+        SET @file_date = CAST(GETDATE() AS DATE);
+
+    UPDATE p
+    SET status = 'duplicate',
+        update_timestamp = GETDATE()
+    FROM silver.properties p
+    INNER JOIN bronze.property_duplicates_external d
+        ON p.source_id = d.ad_id
+        AND p.source_system = CASE WHEN d.source = 'manual' THEN 'MANUAL' ELSE 'SCRAPED' END
+        AND d.file_date = @file_date
+    WHERE p.is_current = 1
+        AND p.status = 'active'
+        AND NOT (d.ad_id = d.canonical_id AND d.source = d.canonical_source);
+END;
+GO
+
 -- Procedure to merge staging data into main table
 CREATE OR ALTER PROCEDURE silver.sp_merge_properties
 AS
@@ -0,0 +1,88 @@
+"""Load and aggregation time of the gold analytics on synthetic scraper output
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_analytics [--rows 2000000] [--formats parquet,csv]
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from src.analytics import PropertyFrame, property_analytics
+from src.analytics.frame import CATEGORICAL_COLUMNS
+from benchmarks.sample_payload import sample_rows
+
+def synthetic_frame(rows: int, seed: int = 0) -> PropertyFrame:
+    """`rows` listings drawn from the sample output's categories with noisy prices"""
+    rng = np.random.default_rng(seed)
+    sample = sample_rows()
+    pick = rng.integers(0, len(sample), rows)
+
+    codes, values = {}, {}
+    for name in CATEGORICAL_COLUMNS:
+        values[name] = sorted({row[name] or '' for row in sample})
+        lookup = {value: i for i, value in enumerate(values[name])}
+        codes[name] = np.array([lookup[row[name] or ''] for row in sample], dtype=np.int32)[pick]
+
+    base_price = np.array([float(row['price_numeric'] or 0) for row in sample])[pick]
+    numeric = {
+        'price_numeric': np.round(base_price * rng.uniform(0.8, 1.2, rows), 2),
+        'area_numeric': np.round(np.array([float(row['area_numeric'] or 0) for row in sample])[pick]
+                                 * rng.uniform(0.9, 1.1, rows), 2),
+        'bedrooms': rng.integers(1, 6, rows).astype(np.float64),
+        'lat': np.array([float(row['lat']) for row in sample])[pick],
+        'lng': np.array([float(row['lng']) for row in sample])[pick]
+    }
+    return PropertyFrame(numeric, codes, values)
+
+def _write(frame: PropertyFrame, directory: str, extension: str) -> str:
+    import pyarrow as pa
+    columns = dict(frame.numeric)
+    for name in CATEGORICAL_COLUMNS:
+        columns[name] = pa.DictionaryArray.from_arrays(frame.codes[name], frame.values[name])
+    table = pa.table(columns)
+
+    path = os.path.join(directory, f"synthetic.{extension}")
+    if extension == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    elif extension == 'csv':
+        import pyarrow.csv as pa_csv
+        pa_csv.write_csv(table.cast(PropertyFrame._schema(pa)), path)
+    elif extension == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as f:
+            import json
+            for row in table.cast(PropertyFrame._schema(pa)).to_pylist():
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write('\n')
+    return path
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--formats', default='parquet,csv',
+                        help="comma-separated output formats to time loading from (parquet, csv, jsonl)")
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows)
+    table, seconds = _timed(lambda: property_analytics(frame))
+    groups = len(table['date_key'])
+    print(f"{args.rows:,} rows -> {groups:,} groups "
+          f"({np.count_nonzero(~np.isnan(table['bedroom_uplift_pct'])):,} with a 2->3 BR uplift)")
+    print(f"{'aggregate':<16} {seconds * 1000:9.1f} ms  {args.rows / seconds:14,.0f} rows/s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in args.formats.split(','):
+            path = _write(frame, directory, extension)
+            loaded, seconds = _timed(lambda: PropertyFrame.read(path))
+            assert len(loaded) == args.rows
+            print(f"{'load ' + extension:<16} {seconds * 1000:9.1f} ms  {args.rows / seconds:14,.0f} rows/s  "
+                  f"({os.path.getsize(path) / 2 ** 20:,.0f} MiB)")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Memory and Parquet write time of PropertyBatch, with a round-trip check
+
+Builds properties shaped like the sample payload, reports bytes per record
+for Property objects and for a PropertyBatch, then writes them through
+ParquetStreamWriter and checks that the file reads back in PARQUET_SCHEMA
+with the same rows.
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_batch [--properties 200000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.config import Settings
+from src.models import PropertyBatch
+from src.utils.parquet_writer import PARQUET_SCHEMA, ParquetStreamWriter
+from src.utils.property_parser import PropertyParser
+from benchmarks.sample_payload import sample_ads
+
+def _object_bytes(properties) -> float:
+    """Approximate bytes per Property, counting its __dict__ and field values"""
+    total = 0
+    for prop in properties:
+        total += sys.getsizeof(prop) + sys.getsizeof(vars(prop))
+        total += sum(sys.getsizeof(value) for value in vars(prop).values())
+    return total / len(properties)
+
+def check_round_trip(properties, path: str, file_date: date):
+    """Raise if the batch or the Parquet file lose or reshape any row"""
+    batch = PropertyBatch(properties)
+    if list(batch) != properties:
+        raise AssertionError("PropertyBatch rows differ from the properties it was built from")
+
+    table = pq.read_table(path)
+    if table.schema.remove_metadata() != PARQUET_SCHEMA:
+        raise AssertionError(f"Parquet schema drifted from PARQUET_SCHEMA:\n{table.schema}")
+    # Row groups are read back with their own dictionaries, so compare decoded values
+    plain = pa.schema([(f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type)
+                       for f in PARQUET_SCHEMA])
+    if not table.cast(plain).equals(batch.to_arrow(file_date).cast(plain)):
+        raise AssertionError("Parquet rows differ from PropertyBatch.to_arrow")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--properties', type=int, default=200000)
+    args = parser.parse_args()
+
+    properties = PropertyParser.parse_batch(sample_ads(args.properties))
+    # Unparsable timestamps must survive the in-memory round trip
+    properties[0].created_at = 'not a timestamp'
+
+    started = time.perf_counter()
+    batch = PropertyBatch(properties)
+    build_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as workdir:
+        Settings.OUTPUT_DIR = workdir
+        timestamp = datetime.now()
+        writer = ParquetStreamWriter(ParquetStreamWriter.path_for(timestamp))
+        started = time.perf_counter()
+        for prop in properties:
+            writer.write(prop)
+        path = writer.close()
+        write_seconds = time.perf_counter() - started
+
+        check_round_trip(properties, path, timestamp.date())
+
+    print(f"{len(properties):,} properties")
+    print(f"Property objects   {_object_bytes(properties):8.0f} bytes/record")
+    print(f"PropertyBatch      {batch.bytes_per_record:8.0f} bytes/record "
+          f"(built in {build_seconds * 1000:.0f} ms)")
+    print(f"Parquet write      {len(properties) / write_seconds:8,.0f} properties/s")
+    print("Round trip         ok")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""End-to-end crawl benchmarks against the local mock DealApp server
+
+Runs the real scrape pipeline (token harvesting, planning, fetching, parsing
+and streaming output) for each scenario and reports properties/sec, API
+requests per new property, token harvests per 1k properties and peak RSS.
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_crawl [--scenario steady] [--workers 1]
+        [--output results.json] [--baseline baseline.json] [--http-tokens]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import resource
+import tempfile
+import time
+from typing import Dict, Optional
+import requests
+from benchmarks.mock_server import MockDealApp
+
+# Mock server settings per scenario
+SCENARIOS = {
+    'steady': {'listings': 5000, 'latency': 0.02, 'token_budget': 60, 'throttle_rate': 0.0},
+    'throttled': {'listings': 5000, 'latency': 0.02, 'token_budget': 60, 'throttle_rate': 0.05},
+    'short_tokens': {'listings': 5000, 'latency': 0.02, 'token_budget': 15, 'throttle_rate': 0.0},
+    'slow_api': {'listings': 2000, 'latency': 0.2, 'token_budget': 60, 'throttle_rate': 0.0}
+}
+
+METRICS = ['properties_per_sec', 'requests_per_property', 'harvests_per_1k', 'peak_rss_mb']
+
+class HttpTokenHarvester:
+    """Reads tokens straight from the mock site's HTML, for hosts without Chromium"""
+
+    def harvest(self) -> Optional[str]:
+        from src.config import Settings
+        match = re.search(r'Bearer ([\w.]+)', requests.get(Settings.SITE_URL, timeout=10).text)
+        return match.group(1) if match else None
+
+    def close(self):
+        pass
+
+def _crawl(site_url: str, base_url: str, target: int, workers: int, http_tokens: bool, results):
+    """Run one crawl in a child process so its peak RSS is measured on its own"""
+    with tempfile.TemporaryDirectory() as workdir:
+        from src.config import Settings
+        Settings.SITE_URL = site_url
+        Settings.BASE_URL = base_url
+        Settings.TARGET_PROPERTIES = target
+        Settings.MAX_TOKENS = 1000
+        # Output, state, logs and the response archive all stay in the workdir
+        for name in [name for name in vars(Settings) if name.endswith('_DIR')]:
+            setattr(Settings, name, os.path.join(workdir, getattr(Settings, name)))
+            os.makedirs(getattr(Settings, name), exist_ok=True)
+
+        if http_tokens:
+            import src.utils.token_prefetcher
+            src.utils.token_prefetcher.TokenHarvester = HttpTokenHarvester
+
+        from src.scrapers import CrawlCoordinator, DealAppScraper
+        scraper = CrawlCoordinator(workers=workers) if workers > 1 else DealAppScraper()
+
+        started = time.perf_counter()
+        count = scraper.scrape()
+        elapsed = time.perf_counter() - started
+
+    # ru_maxrss is in KiB on Linux; children cover crawl workers and the browser
+    peak_kib = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    results.put({'properties': count, 'seconds': elapsed, 'peak_rss_mb': peak_kib / 1024})
+
+def run_scenario(name: str, target: int, workers: int = 1, http_tokens: bool = False) -> Dict:
+    """Crawl the mock server configured for a scenario and collect its metrics"""
+    with MockDealApp(**SCENARIOS[name]) as server:
+        results = multiprocessing.Queue()
+        crawl = multiprocessing.Process(
+            target=_crawl,
+            args=(server.site_url, server.base_url, target, workers, http_tokens, results)
+        )
+        crawl.start()
+        # The result is a small dict, so joining before reading it cannot block
+        crawl.join()
+        if crawl.exitcode != 0:
+            raise RuntimeError(f"Crawl for scenario {name} failed with exit code {crawl.exitcode}")
+        result = results.get()
+
+        properties = max(result['properties'], 1)
+        return {
+            'scenario': name,
+            'workers': workers,
+            'properties': result['properties'],
+            'seconds': round(result['seconds'], 2),
+            'properties_per_sec': round(result['properties'] / result['seconds'], 1),
+            'requests_per_property': round(server.stats['api_requests'] / properties, 4),
+            'harvests_per_1k': round(server.stats['tokens_issued'] * 1000 / properties, 2),
+            'peak_rss_mb': round(result['peak_rss_mb'], 1),
+            'statuses': {str(k): v for k, v in sorted(server.stats['statuses'].items())}
+        }
+
+def _report(results, baseline: Dict = None):
+    header = f"{'scenario':<14}{'props':>7}{'props/s':>10}{'req/prop':>10}{'harv/1k':>9}{'rss MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['scenario']:<14}{r['properties']:>7}{r['properties_per_sec']:>10}"
+              f"{r['requests_per_property']:>10}{r['harvests_per_1k']:>9}{r['peak_rss_mb']:>9}")
+
+        base = (baseline or {}).get(f"{r['scenario']}/{r['workers']}")
+        if base:
+            deltas = [
+                f"{metric} {(r[metric] - base[metric]) / base[metric] * 100:+.1f}%"
+                for metric in METRICS if base.get(metric)
+            ]
+            print(f"{'':<14}vs baseline: {', '.join(deltas)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="scenario to run, repeatable (default: all)")
+    parser.add_argument('--target', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', help="write results as JSON for use as a baseline")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--http-tokens', action='store_true',
+                        help="read tokens from the mock site over HTTP instead of a browser")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+
+    results = [
+        run_scenario(name, args.target, args.workers, args.http_tokens)
+        for name in args.scenario or SCENARIOS
+    ]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = {f"{r['scenario']}/{r['workers']}": r for r in json.load(f)}
+    _report(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Speed and accuracy of DuplicateDetector on synthetic listings with injected reposts
+
+Each repost moves the pin a little, changes the price by a few percent and
+edits the title; some come from manual uploads without a title. Accuracy
+is pair precision and recall against the injected clusters.
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_dedup [--listings 200000] [--repost-rate 0.2] [--pairwise 3000]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from src.utils.dedup import METERS_PER_DEGREE, DuplicateDetector, _Listing
+
+DISTRICTS = ['النرجس', 'الملقا', 'الياسمين', 'العليا', 'حطين', 'الصحافة', 'الربيع', 'قرطبة']
+TYPES = ['فيلا', 'شقة', 'أرض', 'دور', 'عمارة']
+PHRASES = ['للبيع', 'للإيجار', 'بموقع مميز', 'قريبة من الخدمات', 'على شارعين', 'تشطيب فاخر', 'مؤثثة', 'جديدة']
+
+def synthetic_listings(count: int, repost_rate: float, no_location_rate: float, seed: int = 0):
+    """Listings in crawl order, each with the id of the property it describes"""
+    rng = random.Random(seed)
+    listings, properties = [], []
+    for i in range(count):
+        if properties and rng.random() < repost_rate:
+            original, truth = rng.choice(properties)
+            record = dict(original, ad_id=f"r{i}")
+            jitter = rng.uniform(0, 30) / METERS_PER_DEGREE
+            if record['lat'] is not None:
+                record['lat'] += rng.uniform(-1, 1) * jitter
+                record['lng'] += rng.uniform(-1, 1) * jitter
+            record['price_numeric'] = round(record['price_numeric'] * rng.uniform(0.95, 1.05))
+            if rng.random() < 0.3:
+                record.update(source='manual', title=None)
+            else:
+                record['title'] = f"{record['title']} {rng.choice(PHRASES)}"
+        else:
+            rent = rng.random() < 0.4
+            located = rng.random() >= no_location_rate
+            record = {
+                'ad_id': f"a{i}",
+                'source': 'DealApp API',
+                'listing_type': 'rent' if rent else 'sale',
+                'district': rng.choice(DISTRICTS),
+                'title': ' '.join([rng.choice(TYPES)] + rng.sample(PHRASES, 3) + [str(rng.randrange(1000))]),
+                'lat': rng.gauss(24.72, 0.12) if located else None,
+                'lng': rng.gauss(46.68, 0.15) if located else None,
+                'area_numeric': round(rng.uniform(80, 900), 1),
+                'price_numeric': rng.randrange(20, 5000) * (10 if rent else 1000),
+                'bedrooms': float(rng.randint(1, 7))
+            }
+            truth = i
+            properties.append((record, truth))
+        listings.append((record, truth))
+    return listings
+
+def pair_scores(predicted, truth):
+    """Pair precision and recall of a clustering against the true clusters"""
+    pairs = lambda counts: sum(n * (n - 1) // 2 for n in counts.values())
+    both = pairs(Counter(zip(predicted, truth)))
+    found, actual = pairs(Counter(predicted)), pairs(Counter(truth))
+    return both / found if found else 1.0, both / actual if actual else 1.0
+
+def _blocked(listings):
+    detector = DuplicateDetector()
+    started = time.perf_counter()
+    canonical = [detector.add(record) for record, _ in listings]
+    seconds = time.perf_counter() - started
+    # Later listings can merge clusters, so read the final canonical ids
+    predicted = [detector.canonical(*key) for key in canonical]
+    return seconds, pair_scores(predicted, [t for _, t in listings])
+
+def _pairwise(listings):
+    """Compare every pair of listings, the quadratic baseline blocking avoids"""
+    started = time.perf_counter()
+    parsed = [_Listing(record) for record, _ in listings]
+    parent = list(range(len(parsed)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i in range(len(parsed)):
+        for j in range(i):
+            if DuplicateDetector._matches(parsed[i], parsed[j]):
+                a, b = find(i), find(j)
+                parent[max(a, b)] = min(a, b)
+    seconds = time.perf_counter() - started
+    return seconds, pair_scores([find(i) for i in range(len(parsed))], [t for _, t in listings])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listings', type=int, default=200000)
+    parser.add_argument('--repost-rate', type=float, default=0.2)
+    parser.add_argument('--no-location-rate', type=float, default=0.1)
+    parser.add_argument('--pairwise', type=int, default=3000, help="listings for the all-pairs baseline")
+    args = parser.parse_args()
+
+    for count, run in ((args.pairwise, _pairwise), (args.pairwise, _blocked), (args.listings, _blocked)):
+        listings = synthetic_listings(count, args.repost_rate, args.no_location_rate)
+        seconds, (precision, recall) = run(listings)
+        print(f"{run.__name__[1:]:<9} {count:>9,} listings  {seconds:7.2f} s  "
+              f"{count / seconds:9,.0f} listings/s  precision {precision:.3f}  recall {recall:.3f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Throughput and peak memory of ManualUploadNormalizer on synthetic manual uploads
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_normalizer [--rows 2000000] [--bad-every 1000] [--excel-rows 0]
+"""
+import argparse
+import csv
+import os
+import random
+import resource
+import tempfile
+import time
+from src.config import Settings
+from src.utils.manual_normalizer import MANUAL_COLUMNS, ManualUploadNormalizer
+
+DISTRICTS = ['النرجس', 'الملقا', 'الياسمين', 'العليا', 'حطين', 'الصحافة', 'الربيع', 'قرطبة']
+TYPES = ['فيلا', 'شقة', 'أرض', 'دور', 'عمارة']
+AMENITIES = ['يوجد', 'لا يوجد', '']
+# Values a bad row puts in one of the validated columns
+BAD_VALUES = {
+    'advertisement_number': '',
+    'price': 'على السوم',
+    'area_dimension': '350م',
+    'latitude': '124.7',
+    'creation_time': 'yesterday'
+}
+
+def synthetic_row(i: int, rng: random.Random) -> list:
+    row = dict.fromkeys(MANUAL_COLUMNS, '')
+    rent = rng.random() < 0.4
+    row.update({
+        'advertisement_number': str(10_000_000 + i),
+        'user_number': str(rng.randrange(100_000)),
+        'creation_time': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:15:00",
+        'number_of_bedrooms': str(rng.randint(1, 7)),
+        'floor': rng.choice(['1', '2', 'الأرضي']),
+        'number_of_kitchens': '1',
+        'closed': rng.choice(['مغلق', 'مفتوح']),
+        'property_type': rng.choice(TYPES),
+        'driver_room': rng.choice(AMENITIES),
+        'duplex': rng.choice(['دوبلكس', '']),
+        'furnished': rng.choice(AMENITIES),
+        'maids_room': rng.choice(AMENITIES),
+        'swimming_pool': rng.choice(AMENITIES),
+        'price': f"{rng.randrange(20, 5000) * (1000 if not rent else 10):,}",
+        'area_dimension': f"{rng.uniform(80, 900):.2f}",
+        'for_sale_or_rent': 'للإيجار' if rent else 'للبيع',
+        'number_of_bathrooms': str(rng.randint(1, 6)),
+        'latitude': f"{rng.gauss(24.72, 0.12):.6f}",
+        'longitude': f"{rng.gauss(46.68, 0.15):.6f}",
+        'region_name_ar': 'منطقة الرياض',
+        'nearest_city_name_ar': 'الرياض',
+        'district_name_ar': rng.choice(DISTRICTS)
+    })
+    return [row[name] for name in MANUAL_COLUMNS]
+
+def write_csv(path: str, rows: int, bad_every: int, seed: int = 0):
+    """Write a synthetic upload with one invalid row in every `bad_every`"""
+    rng = random.Random(seed)
+    bad_columns = list(BAD_VALUES)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(MANUAL_COLUMNS)
+        for i in range(rows):
+            row = synthetic_row(i, rng)
+            if bad_every and i % bad_every == bad_every - 1:
+                column = bad_columns[(i // bad_every) % len(bad_columns)]
+                row[MANUAL_COLUMNS.index(column)] = BAD_VALUES[column]
+            writer.writerow(row)
+
+def write_excel(path: str, rows: int, seed: int = 0):
+    # openpyxl is only needed for the Excel scenario
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(MANUAL_COLUMNS)
+    for i in range(rows):
+        sheet.append(synthetic_row(i, rng))
+    workbook.save(path)
+
+def _run(path: str) -> dict:
+    started = time.perf_counter()
+    result = ManualUploadNormalizer().normalize(path)
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--bad-every', type=int, default=1000)
+    parser.add_argument('--excel-rows', type=int, default=0, help="also time an Excel upload of this size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        Settings.OUTPUT_DIR = workdir
+        uploads = [os.path.join(workdir, 'upload.csv')]
+        started = time.perf_counter()
+        write_csv(uploads[0], args.rows, args.bad_every)
+        print(f"{args.rows:,} row CSV ({os.path.getsize(uploads[0]) / 1e6:.0f} MB) "
+              f"generated in {time.perf_counter() - started:.1f} s")
+        if args.excel_rows:
+            uploads.append(os.path.join(workdir, 'upload.xlsx'))
+            write_excel(uploads[-1], args.excel_rows)
+
+        for path in uploads:
+            result = _run(path)
+            total = result['rows'] + result['rejected']
+            print(f"{os.path.basename(path):<12} {total / result['seconds']:12,.0f} rows/s  "
+                  f"{result['seconds']:6.2f} s  {result['rejected']:,} rejected  "
+                  f"parquet {os.path.getsize(result['output']) / 1e6:.0f} MB")
+
+    # ru_maxrss is in KiB on Linux
+    print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB "
+          f"({Settings.MANUAL_CHUNK_ROWS:,} row chunks)")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""Parse throughput of PropertyParser on responses shaped like the sample payload
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_parser [--ads 100000] [--page-size 100]
+"""
+import argparse
+import json
+import time
+from src.utils.property_parser import PropertyParser, orjson
+from benchmarks.sample_payload import sample_ads
+
+def _best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ads', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ads = sample_ads(args.ads)
+    pages = [ads[i:i + args.page_size] for i in range(0, len(ads), args.page_size)]
+    bodies = [json.dumps({'data': page}, ensure_ascii=False).encode('utf-8') for page in pages]
+
+    results = {
+        'parse_property (per ad)': _best_of(lambda: [PropertyParser.parse_property(ad) for ad in ads], args.repeat),
+        'parse_batch (per page)': _best_of(lambda: [PropertyParser.parse_batch(page) for page in pages], args.repeat),
+        'json.loads': _best_of(lambda: [json.loads(body) for body in bodies], args.repeat),
+        'decode_json': _best_of(lambda: [PropertyParser.decode_json(body) for body in bodies], args.repeat),
+        'decode_json + parse_batch': _best_of(
+            lambda: [PropertyParser.parse_batch(PropertyParser.decode_json(body)['data']) for body in bodies],
+            args.repeat
+        )
+    }
+
+    print(f"{len(ads):,} ads in {len(pages):,} pages of {args.page_size} "
+          f"(orjson {'available' if orjson else 'not installed'})")
+    for name, seconds in results.items():
+        print(f"{name:<28} {seconds * 1000:9.1f} ms  {len(ads) / seconds:12,.0f} ads/s")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
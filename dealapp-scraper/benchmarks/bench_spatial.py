@@ -0,0 +1,56 @@
+"""Query latency of SpatialIndex against a linear scan over synthetic listing coordinates
+
+Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_spatial [--listings 1000000] [--queries 1000]
+"""
+import argparse
+import time
+import numpy as np
+from src.analytics.spatial import KM_PER_DEGREE, SpatialIndex, haversine_km
+
+# Listings scattered around central Riyadh
+CENTRE = (24.72, 46.68)
+SPREAD = (0.12, 0.15)
+
+def synthetic_points(count: int, rng) -> np.ndarray:
+    return np.column_stack([rng.normal(CENTRE[0], SPREAD[0], count), rng.normal(CENTRE[1], SPREAD[1], count)])
+
+def _per_query(func, queries: np.ndarray) -> float:
+    started = time.perf_counter()
+    for lat, lng in queries:
+        func(lat, lng)
+    return (time.perf_counter() - started) / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listings', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--cell-km', type=float, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = synthetic_points(args.listings, rng)
+    queries = synthetic_points(args.queries, rng)
+    lat, lng = points[:, 0].copy(), points[:, 1].copy()
+
+    started = time.perf_counter()
+    index = SpatialIndex(lat, lng, args.cell_km)
+    print(f"{args.listings:,} listings indexed in {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({index.lat_step * KM_PER_DEGREE:.2f} km cells)")
+
+    linear = min(args.queries, 20)
+    results = {
+        'nearest k=1': _per_query(lambda a, b: index.nearest(a, b, 1), queries),
+        'nearest k=10': _per_query(lambda a, b: index.nearest(a, b, 10), queries),
+        'nearest k=100': _per_query(lambda a, b: index.nearest(a, b, 100), queries),
+        'within 0.5 km': _per_query(lambda a, b: index.within(a, b, 0.5), queries),
+        'within 2 km': _per_query(lambda a, b: index.within(a, b, 2), queries),
+        'linear scan k=10': _per_query(
+            lambda a, b: np.argpartition(haversine_km(a, b, lat, lng), 10)[:10], queries[:linear]
+        )
+    }
+    for name, seconds in results.items():
+        print(f"{name:<18} {seconds * 1e6:10.1f} us/query")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
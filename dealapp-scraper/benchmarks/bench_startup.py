@@ -0,0 +1,66 @@
+"""Startup time of the CLI and the scraper modules, and which heavy dependencies each loads
+
+Every scenario runs in a fresh interpreter. Run from the dealapp-scraper directory:
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ['playwright', 'requests', 'numpy', 'pyarrow', 'dotenv']
+
+# Scenario -> code run in the child interpreter
+SCENARIOS = {
+    'python': "pass",
+    'main.py --help': "_main('--help')",
+    'main.py crawl --help': "_main('crawl', '--help')",
+    'main.py replay --help': "_main('replay', '--help')",
+    'main.py analyze --help': "_main('analyze', '--help')",
+    'import Settings': "from src.config import Settings",
+    'import DealAppScraper': "from src.scrapers import DealAppScraper",
+    'import ArchiveReplayer': "from src.scrapers import ArchiveReplayer",
+    'import OutputExporter': "from src.scrapers import OutputExporter",
+    'import src.analytics': "import src.analytics",
+}
+
+CHILD = """
+import json, runpy, sys, time
+started = time.perf_counter()
+
+def _main(*argv):
+    sys.argv = ['main.py', *argv]
+    try:
+        runpy.run_path('main.py', run_name='__main__')
+    except SystemExit:
+        pass
+
+{code}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def run_scenario(code: str) -> dict:
+    """Run one scenario in a new interpreter, timing the whole process and its imports"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', CHILD.format(code=code, heavy=HEAVY_MODULES)],
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['wall'] = time.perf_counter() - started
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<24} {'wall ms':>8} {'import ms':>10}  heavy modules loaded")
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r['wall'])
+        print(f"{name:<24} {best['wall'] * 1000:8.0f} {min(r['seconds'] for r in runs) * 1000:10.1f}  "
+              f"{', '.join(best['loaded']) or '-'}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
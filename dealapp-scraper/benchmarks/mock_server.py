@@ -0,0 +1,159 @@
+"""Local stand-in for dealapp.sa and its listings API
+
+The site pages issue a fresh bearer token and call the API with it, so the
+real TokenHarvester can capture tokens from them. The API serves /ad pages
+of synthetic listings and simulates latency, 429 throttling and 403 token
+exhaustion.
+"""
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, unquote, urlparse
+from src.config import constants
+from benchmarks.sample_payload import ad_from_row, sample_rows
+
+API_PREFIX = '/production'
+
+SITE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>DealApp mock</title></head>
+<body><script>
+fetch("{api}/ad?page=1&limit=10", {{headers: {{"Authorization": "Bearer {token}"}}}});
+</script></body></html>"""
+
+def synthetic_listings(count: int, seed: int = 1) -> List[Dict]:
+    """Listings shaped like the sample output, newest first, with spread-out prices"""
+    rng = random.Random(seed)
+    rows = sample_rows()
+    newest = datetime(2025, 9, 15, tzinfo=timezone.utc)
+
+    listings = []
+    for i in range(count):
+        ad = ad_from_row(rows[i % len(rows)], i)
+        ad['price'] = max(1, int(ad['price'] * rng.uniform(0.5, 1.5)))
+        ad['createdAt'] = (newest - timedelta(minutes=7 * i)).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        listings.append(ad)
+    return listings
+
+class MockDealApp:
+    """Threaded HTTP server serving the mock site and API"""
+
+    def __init__(self, listings: int = 5000, latency: float = 0.02, token_budget: int = 60,
+                 throttle_rate: float = 0.0, max_page_size: int = 50, seed: int = 1,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.listings = synthetic_listings(listings, seed)
+        self.latency = latency
+        self.token_budget = token_budget
+        self.throttle_rate = throttle_rate
+        self.max_page_size = max_page_size
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._token_ids = itertools.count(1)
+        self._token_requests = {}
+        self.stats = {'tokens_issued': 0, 'api_requests': 0, 'statuses': {}}
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-dealapp', daemon=True)
+
+    @property
+    def site_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.site_url}{API_PREFIX}"
+
+    def start(self) -> 'MockDealApp':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def issue_token(self) -> str:
+        """Register a new bearer token"""
+        with self._lock:
+            token = f"mock.{next(self._token_ids)}.{self._rng.getrandbits(64):016x}"
+            self._token_requests[token] = 0
+            self.stats['tokens_issued'] += 1
+        return token
+
+    def handle_api(self, path: str, query: Dict[str, str], authorization: str):
+        """Status, headers and JSON body for an API request"""
+        if path != API_PREFIX + '/ad':
+            return 404, {}, {'message': 'Not Found'}
+
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else None
+        with self._lock:
+            self.stats['api_requests'] += 1
+            if token not in self._token_requests:
+                return 401, {}, {'message': 'Unauthorized'}
+            if self._rng.random() < self.throttle_rate:
+                return 429, {'Retry-After': '0'}, {'message': 'Too Many Requests'}
+            self._token_requests[token] += 1
+            if self._token_requests[token] > self.token_budget:
+                return 403, {}, {'message': 'Forbidden'}
+
+        time.sleep(self.latency)
+        page = max(1, int(query.get('page', 1)))
+        limit = min(max(1, int(query.get('limit', 10))), self.max_page_size)
+        min_price = float(query.get('minPrice', 0))
+        max_price = float(query.get('maxPrice', float('inf')))
+
+        matches = [
+            ad for ad in self.listings
+            if query.get('city', ad['city']['_id']) == ad['city']['_id']
+            and query.get('adPurpose', ad['purpose']) == ad['purpose']
+            and min_price <= ad['price'] <= max_price
+        ]
+        return 200, {}, {'data': matches[(page - 1) * limit:page * limit]}
+
+    def _handler(self):
+        app = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.startswith(API_PREFIX):
+                    query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                    status, headers, payload = app.handle_api(
+                        url.path, query, self.headers.get('Authorization', ''))
+                    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+                    with app._lock:
+                        app.stats['statuses'][status] = app.stats['statuses'].get(status, 0) + 1
+                elif unquote(url.path) in ('/', constants.MARKET_PATH):
+                    status, headers = 200, {}
+                    body = SITE_PAGE.format(api=app.base_url, token=app.issue_token()).encode('utf-8')
+                    content_type = 'text/html; charset=utf-8'
+                else:
+                    status, headers, body, content_type = 404, {}, b'', 'text/plain'
+
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
\ No newline at end of file
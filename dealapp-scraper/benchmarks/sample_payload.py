@@ -0,0 +1,47 @@
+import csv
+import os
+from typing import Dict, List
+from src.config import constants
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..',
+    'Crawling Sample Output', 'dealapp_reliable_20250915_130955.csv'
+)
+
+PURPOSE_SUFFIXES = {'sale': ' للبيع', 'rent': ' للإيجار'}
+
+def _number(value: str):
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+def sample_rows(path: str = SAMPLE_CSV) -> List[Dict]:
+    """Rows of the crawling sample output"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+def ad_from_row(row: Dict, index: int = 0) -> Dict:
+    """Rebuild an API ad shaped like the DealApp response from a sample CSV row"""
+    suffix = PURPOSE_SUFFIXES.get(row['listing_type'], '')
+    property_type = row['type'][:-len(suffix)] if suffix and row['type'].endswith(suffix) else row['type']
+    bedrooms = int(float(row['bedrooms'] or 0))
+
+    return {
+        '_id': f"{row['ad_id'][:16]}{index:08x}",
+        'code': str(int(row['code'] or 0) + index),
+        'title': row['title'],
+        'purpose': row['listing_type'].upper(),
+        'price': _number(row['price_numeric'] or 0),
+        'area': _number(row['area_numeric'] or 0),
+        'status': 'ACTIVE',
+        'createdAt': row['created_at'],
+        'propertyType': {'propertyType_ar': property_type},
+        'city': {'_id': constants.CITY_IDS['riyadh'], 'name_ar': row['city'], 'name_en': 'Riyadh'},
+        'district': {'name_ar': row['district'], 'name_en': row['district_en']},
+        'relatedQuestions': {'roomsNumRange': f"{bedrooms}-{bedrooms + 1}" if index % 3 == 0 else str(bedrooms)},
+        'location': {'value': {'type': 'Point', 'coordinates': [float(row['lng']), float(row['lat'])]}}
+    }
+
+def sample_ads(count: int) -> List[Dict]:
+    """`count` synthetic ads with unique ids, cycling through the sample rows"""
+    rows = sample_rows()
+    return [ad_from_row(rows[i % len(rows)], i) for i in range(count)]
\ No newline at end of file
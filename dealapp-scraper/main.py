@@ -1,41 +1,152 @@
 #!/usr/bin/env python3
 """DealApp Scraper Main Entry Point"""
 
+import argparse
 import logging
+import os
 import sys
 from datetime import datetime
-from src.scrapers import DealAppScraper
 from src.config import Settings
 
-# Setup logging
-log_filename = f"{Settings.LOG_DIR}/dealapp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_filename),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+COMMANDS = ('crawl', 'replay', 'export', 'analyze', 'normalize', 'dedup')
 
-logger = logging.getLogger(__name__)
+def setup_logging():
+    """Log to a file for this run and to stdout"""
+    log_filename = os.path.join(Settings.LOG_DIR, f"dealapp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_filename),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+def parse_args(argv=None):
+    """Parse command line arguments, crawling when no command is given"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ('-h', '--help')):
+        argv = ['crawl'] + argv
+
+    parser = argparse.ArgumentParser(description="DealApp Property Scraper")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    crawl = commands.add_parser('crawl', help="crawl the DealApp API (default)")
+    crawl.add_argument('--workers', type=int,
+                       help="crawl processes, each with its own tokens (default: CRAWL_WORKERS)")
+
+    replay = commands.add_parser('replay', help="re-parse archived API responses without network access")
+    replay.add_argument('paths', nargs='+', metavar='PATH', help="archive files or directories")
+    replay.add_argument('--workers', type=int, help="parser processes (default: every core)")
+
+    export = commands.add_parser('export', help="merge JSON Lines output into other formats")
+    export.add_argument('paths', nargs='+', metavar='PATH', help="JSON Lines files or directories")
+    export.add_argument('--formats', type=lambda s: s.split(','),
+                        help="comma-separated output formats (default: OUTPUT_FORMATS)")
+
+    analyze = commands.add_parser('analyze', help="compute the gold property analytics for output files")
+    analyze.add_argument('paths', nargs='+', metavar='PATH', help="output files or directories")
+    analyze.add_argument('--backfill-districts', action='store_true',
+                         help="fill missing districts from nearby listings first")
+
+    normalize = commands.add_parser('normalize', help="convert manual CSV/Excel uploads to typed Parquet")
+    normalize.add_argument('paths', nargs='+', metavar='PATH', help="upload files")
+    normalize.add_argument('--file-date', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+                           help="ingest date of the uploads, YYYY-MM-DD (default: today)")
+    normalize.add_argument('--encoding', default='utf8', help="encoding of CSV uploads (default: utf8)")
+
+    dedup = commands.add_parser('dedup', help="cluster near-duplicate listings across output files and sources")
+    dedup.add_argument('paths', nargs='+', metavar='PATH', help="output files or directories, oldest first by name")
+
+    return parser.parse_args(argv)
+
+def crawl(args):
+    """Crawl the API, in worker processes when more than one is configured"""
+    # requests is only imported by the commands that need it; Playwright only once a browser is launched
+    from src.scrapers import DealAppScraper, CrawlCoordinator
+
+    workers = args.workers or Settings.CRAWL_WORKERS
+    scraper = CrawlCoordinator(workers=workers) if workers > 1 else DealAppScraper()
+    return scraper.scrape()
+
+def replay(args):
+    """Rebuild output files from archived responses"""
+    from src.scrapers import ArchiveReplayer
+    return ArchiveReplayer(args.paths, workers=args.workers).scrape()
+
+def export(args):
+    """Convert existing JSON Lines output into other formats"""
+    from src.scrapers import OutputExporter
+    return OutputExporter(args.paths, formats=args.formats).scrape()
+
+def analyze(args):
+    """Compute gold analytics for existing output and save them next to it"""
+    # numpy is only needed for analytics
+    from src.analytics import PropertyFrame, property_analytics, write_csv, backfill_districts
+    from src.utils import FileHandler
+
+    frame = PropertyFrame.load(args.paths)
+    if args.backfill_districts:
+        backfill_districts(frame)
+    table = property_analytics(frame)
+    path = write_csv(table, FileHandler.analytics_path(datetime.now()))
+    logger.info(f"Analytics for {len(frame)} properties in {len(table['date_key'])} groups saved to {path}")
+    return len(frame)
+
+def normalize(args):
+    """Normalize manual uploads, writing rejected rows next to the output"""
+    # pyarrow is only needed for manual uploads
+    from src.utils import ManualUploadNormalizer
+
+    normalizer = ManualUploadNormalizer(file_date=args.file_date, encoding=args.encoding)
+    results = [normalizer.normalize(path) for path in args.paths]
+    for result in results:
+        if result['rejects']:
+            logger.warning(f"{result['rejected']} rows of {result['upload']} rejected, see {result['rejects']}")
+    return sum(r['rows'] for r in results)
+
+def dedup(args):
+    """Cluster near-duplicate listings in existing output and save their canonical ids next to it"""
+    # pyarrow is only needed to read historical output
+    from src.utils import DuplicateDetector, FileHandler
+
+    detector = DuplicateDetector()
+    for path in FileHandler.find_outputs(args.paths):
+        detector.add_all(DuplicateDetector.read_records(path))
+    path, clusters = detector.save(FileHandler.duplicates_path(datetime.now()))
+    logger.info(f"{detector.duplicates} near-duplicates of {len(detector)} listings "
+                f"in {clusters} clusters saved to {path}")
+    return len(detector)
 
 def main():
     """Main function"""
+    args = parse_args()
+    Settings.init()
+    setup_logging()
+
+    scrape = args.command in ('crawl', 'replay', 'export')
+    if scrape and Settings.METRICS_PORT:
+        from src.utils import metrics
+        metrics.serve(Settings.METRICS_PORT)
+
     try:
-        logger.info("="*60)
-        logger.info("DealApp Property Scraper")
-        logger.info("="*60)
+        if scrape:
+            logger.info("="*60)
+            logger.info("DealApp Property Scraper")
+            logger.info("="*60)
 
-        scraper = DealAppScraper()
-        count = scraper.scrape()
+        count = {'crawl': crawl, 'replay': replay, 'export': export,
+                 'analyze': analyze, 'normalize': normalize, 'dedup': dedup}[args.command](args)
 
-        logger.info(f"\nScraping completed successfully!")
-        logger.info(f"Total properties scraped: {count}")
+        if scrape:
+            logger.info(f"\nScraping completed successfully!")
+            logger.info(f"Total properties scraped: {count}")
 
     except KeyboardInterrupt:
-        logger.warning("\nScraping interrupted by user")
+        logger.warning(f"\n{args.command.capitalize()} interrupted by user")
         sys.exit(1)
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
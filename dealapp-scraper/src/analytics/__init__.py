@@ -0,0 +1,6 @@
+from .frame import PropertyFrame
+from .gold import property_analytics, write_csv, GOLD_COLUMNS
+from .spatial import SpatialIndex, backfill_districts, backfill_properties, comparables
+
+__all__ = ['PropertyFrame', 'property_analytics', 'write_csv', 'GOLD_COLUMNS',
+           'SpatialIndex', 'backfill_districts', 'backfill_properties', 'comparables']
\ No newline at end of file
@@ -0,0 +1,161 @@
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from src.models import PropertyBatch
+from src.utils.file_handler import FileHandler, OUTPUT_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_COLUMNS = ('price_numeric', 'area_numeric', 'bedrooms', 'lat', 'lng')
+CATEGORICAL_COLUMNS = ('type', 'listing_type', 'city', 'district', 'district_en')
+FORMATS = OUTPUT_EXTENSIONS
+
+class PropertyFrame:
+    """Columns of scraper output as numpy arrays
+
+    Numbers are float64 with NaN for missing values. Categories are int32
+    codes into a list of values, with -1 for missing or empty strings, so
+    grouping never touches Python strings.
+    """
+
+    def __init__(self, numeric: Dict[str, np.ndarray], codes: Dict[str, np.ndarray],
+                 values: Dict[str, List[str]]):
+        self.numeric = numeric
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.numeric['price_numeric'])
+
+    @classmethod
+    def empty(cls) -> 'PropertyFrame':
+        return cls(
+            {name: np.empty(0) for name in NUMERIC_COLUMNS},
+            {name: np.empty(0, dtype=np.int32) for name in CATEGORICAL_COLUMNS},
+            {name: [] for name in CATEGORICAL_COLUMNS}
+        )
+
+    def decode(self, name: str, codes: np.ndarray) -> List[Optional[str]]:
+        """Values of a categorical column for the given codes"""
+        values = self.values[name]
+        return [values[code] if code >= 0 else None for code in codes.tolist()]
+
+    @classmethod
+    def load(cls, paths: Iterable[str]) -> 'PropertyFrame':
+        """Load scraper output files, or every output file under directories"""
+        frames = [cls.read(path) for path in cls.find(paths)]
+        return cls.concat(frames)
+
+    @staticmethod
+    def find(paths: Iterable[str]) -> List[str]:
+        """Output files under the given files or directories, skipping analytics, delta, rejects and duplicates files"""
+        return FileHandler.find_outputs(paths, FORMATS)
+
+    @classmethod
+    def read(cls, path: str) -> 'PropertyFrame':
+        """Load one CSV, JSON Lines, JSON or Parquet output file"""
+        # pyarrow parses and types the columns without building Python rows
+        import pyarrow as pa
+
+        if path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            table = pq.read_table(path, columns=list(NUMERIC_COLUMNS + CATEGORICAL_COLUMNS))
+        elif path.endswith('.csv'):
+            import pyarrow.csv as pa_csv
+            table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+                include_columns=list(NUMERIC_COLUMNS + CATEGORICAL_COLUMNS),
+                column_types=cls._schema(pa),
+                strings_can_be_null=True
+            ))
+        elif path.endswith('.jsonl'):
+            import pyarrow.json as pa_json
+            table = pa_json.read_json(path, parse_options=pa_json.ParseOptions(
+                explicit_schema=cls._schema(pa),
+                unexpected_field_behavior='ignore'
+            ))
+        elif path.endswith('.json'):
+            # FileHandler.save_to_json wraps the rows with run metadata
+            with open(path, encoding='utf-8') as f:
+                rows = json.load(f)['properties']
+            table = pa.Table.from_pylist(rows, schema=cls._schema(pa))
+        else:
+            raise ValueError(f"Unsupported output file: {path}")
+
+        logger.info(f"Loaded {table.num_rows} properties from {path}")
+        return cls._from_arrow(table)
+
+    @classmethod
+    def from_batch(cls, batch: PropertyBatch) -> 'PropertyFrame':
+        """Frame over a PropertyBatch, sharing its numeric buffers"""
+        numeric = {name: np.frombuffer(batch.numeric(name), dtype=np.float64) for name in NUMERIC_COLUMNS}
+        codes, values = {}, {}
+        for name in CATEGORICAL_COLUMNS:
+            codes[name], values[name] = _null_empty(
+                np.frombuffer(batch.codes(name), dtype=np.int32), batch.dictionary(name)
+            )
+        return cls(numeric, codes, values)
+
+    @classmethod
+    def concat(cls, frames: List['PropertyFrame']) -> 'PropertyFrame':
+        """Stack frames, remapping their category codes onto shared value lists"""
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+
+        numeric = {name: np.concatenate([f.numeric[name] for f in frames]) for name in NUMERIC_COLUMNS}
+        codes, values = {}, {}
+        for name in CATEGORICAL_COLUMNS:
+            lookup: Dict[str, int] = {}
+            parts = []
+            for frame in frames:
+                # The trailing -1 maps missing codes to themselves
+                mapping = np.array(
+                    [lookup.setdefault(value, len(lookup)) for value in frame.values[name]] + [-1],
+                    dtype=np.int32
+                )
+                parts.append(mapping[frame.codes[name]])
+            codes[name] = np.concatenate(parts)
+            values[name] = list(lookup)
+        return cls(numeric, codes, values)
+
+    @staticmethod
+    def _schema(pa):
+        return pa.schema([(name, pa.float64()) for name in NUMERIC_COLUMNS] +
+                         [(name, pa.string()) for name in CATEGORICAL_COLUMNS])
+
+    @classmethod
+    def _from_arrow(cls, table) -> 'PropertyFrame':
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        numeric = {}
+        for name in NUMERIC_COLUMNS:
+            column = table.column(name).cast(pa.float64())
+            numeric[name] = column.to_numpy() if column.num_chunks else np.empty(0)
+
+        codes, values = {}, {}
+        for name in CATEGORICAL_COLUMNS:
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type) and column.num_chunks:
+                # Parquet output is already dictionary-encoded; reuse its codes
+                column = column.unify_dictionaries()
+                dictionary = column.chunk(0).dictionary
+                indices = pa.chunked_array([chunk.indices for chunk in column.chunks])
+            else:
+                encoded = pc.dictionary_encode(column.cast(pa.string()).combine_chunks())
+                dictionary, indices = encoded.dictionary, encoded.indices
+            codes[name], values[name] = _null_empty(
+                indices.fill_null(-1).to_numpy().astype(np.int32), dictionary.to_pylist()
+            )
+        return cls(numeric, codes, values)
+
+def _null_empty(codes: np.ndarray, values: List[Optional[str]]):
+    """Treat empty strings like missing values, as the CSV round trip does"""
+    blank = [i for i, value in enumerate(values) if value is None or value == '']
+    if not blank:
+        return codes, list(values)
+    codes = codes.copy()
+    codes[np.isin(codes, blank)] = -1
+    return codes, [value if value else None for value in values]
\ No newline at end of file
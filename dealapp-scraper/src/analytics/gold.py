@@ -0,0 +1,142 @@
+import csv
+from datetime import date
+from typing import Dict, Iterator
+import numpy as np
+from src.config import Settings
+from src.analytics.frame import PropertyFrame
+
+# gold.property_analytics columns, then the README's bedroom and cap-rate analyses
+GROUP_COLUMNS = ['city', 'district', 'property_type', 'listing_type']
+GOLD_COLUMNS = [
+    'date_key', *GROUP_COLUMNS,
+    'total_properties', 'avg_price', 'min_price', 'max_price',
+    'avg_area', 'avg_bedrooms', 'total_sale_properties',
+    'total_rent_properties', 'avg_price_per_sqm',
+    'avg_price_2br', 'avg_price_3br', 'bedroom_uplift_pct',
+    'cap_rate_value', 'cap_rate_value_per_sqm'
+]
+
+# Key spaces up to this size are grouped with bincount instead of a sort
+DENSE_GROUP_LIMIT = 1 << 22
+
+# Frame column behind each gold grouping column; silver loads `type` as property_type
+SOURCE_COLUMNS = {'city': 'city', 'district': 'district', 'property_type': 'type', 'listing_type': 'listing_type'}
+
+def property_analytics(frame: PropertyFrame, date_key: int = None, cap_rate: float = None) -> Dict[str, np.ndarray]:
+    """Per (city, district, property_type, listing_type) metrics as in gold.sp_refresh_property_analytics
+
+    Prices and areas are rounded like the DECIMAL(18,2)/(10,2) silver columns
+    and bedrooms truncated like CAST(... AS INT) on the typed Parquet loads.
+    Only rows with a price above zero count, and averages skip missing values
+    as AVG does. The uplift is (avg 3BR - avg 2BR) / avg 2BR * 100, and rent
+    groups are valued as annual rent / cap rate.
+
+    Unlike the scraped CSV loads, whose TRY_CAST(bedrooms AS INT) turns text
+    such as '3.0' into NULL, scraped bedrooms are kept here, so avg_bedrooms
+    and the 2BR/3BR prices can cover rows the SQL view leaves out.
+    """
+    date_key = date_key or int(date.today().strftime('%Y%m%d'))
+    cap_rate = cap_rate or Settings.ANALYTICS_CAP_RATE
+
+    price = _round(frame.numeric['price_numeric'])
+    keep = price > 0
+    price = price[keep]
+    area = _round(frame.numeric['area_numeric'][keep])
+    bedrooms = np.trunc(frame.numeric['bedrooms'][keep])
+    keys = [frame.codes[SOURCE_COLUMNS[name]][keep] for name in GROUP_COLUMNS]
+
+    groups, group_codes, inverse = _group(keys)
+    count = np.bincount(inverse, minlength=groups)
+
+    listing_type = frame.decode('listing_type', group_codes[3])
+    is_sale = np.array([value == 'sale' for value in listing_type], dtype=bool)
+    is_rent = np.array([value == 'rent' for value in listing_type], dtype=bool)
+    per_sqm = np.where(area > 0, price / np.where(area > 0, area, 1), np.nan)
+    avg_price = _mean(price, inverse, groups)
+    avg_per_sqm = _mean(per_sqm, inverse, groups)
+    avg_2br = _mean(np.where(bedrooms == 2, price, np.nan), inverse, groups)
+    avg_3br = _mean(np.where(bedrooms == 3, price, np.nan), inverse, groups)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        uplift = np.where(avg_2br > 0, (avg_3br - avg_2br) / avg_2br * 100, np.nan)
+
+    table = {
+        'date_key': np.full(groups, date_key, dtype=np.int64),
+        'total_properties': count,
+        'avg_price': _round(avg_price),
+        'min_price': _reduce(np.minimum, price, inverse, groups, np.inf),
+        'max_price': _reduce(np.maximum, price, inverse, groups, -np.inf),
+        'avg_area': _round(_mean(area, inverse, groups)),
+        'avg_bedrooms': _round(_mean(bedrooms, inverse, groups)),
+        # listing_type is a grouping key, so each group is all sale, all rent or neither
+        'total_sale_properties': np.where(is_sale, count, 0),
+        'total_rent_properties': np.where(is_rent, count, 0),
+        'avg_price_per_sqm': _round(avg_per_sqm),
+        'avg_price_2br': _round(avg_2br),
+        'avg_price_3br': _round(avg_3br),
+        'bedroom_uplift_pct': _round(uplift),
+        'cap_rate_value': _round(np.where(is_rent, avg_price / cap_rate, np.nan)),
+        'cap_rate_value_per_sqm': _round(np.where(is_rent, avg_per_sqm / cap_rate, np.nan))
+    }
+    for name, codes in zip(GROUP_COLUMNS, group_codes):
+        table[name] = np.array(frame.decode(SOURCE_COLUMNS[name], codes), dtype=object)
+
+    return {name: table[name] for name in GOLD_COLUMNS}
+
+def iter_rows(table: Dict[str, np.ndarray]) -> Iterator[Dict]:
+    """Rows of an analytics table, with None for undefined metrics"""
+    columns = {name: values.tolist() for name, values in table.items()}
+    for i in range(len(table['date_key'])):
+        yield {
+            name: None if isinstance(values[i], float) and np.isnan(values[i]) else values[i]
+            for name, values in columns.items()
+        }
+
+def write_csv(table: Dict[str, np.ndarray], path: str) -> str:
+    """Write an analytics table as CSV"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(table))
+        writer.writeheader()
+        writer.writerows(iter_rows(table))
+    return path
+
+def _group(keys):
+    """Number of groups, each group's key codes and each row's group"""
+    if not len(keys[0]):
+        return 0, [codes[:0] for codes in keys], np.empty(0, dtype=np.int64)
+
+    # Shift codes so missing (-1) becomes 0 and the key columns pack into one int64
+    shifted = [codes.astype(np.int64) + 1 for codes in keys]
+    dims = [int(codes.max()) + 1 for codes in shifted]
+    packed = np.ravel_multi_index(shifted, dims)
+
+    size = int(np.prod(dims))
+    if size <= max(4 * len(packed), DENSE_GROUP_LIMIT):
+        # Small key space: number the occupied keys without sorting the rows
+        present = np.bincount(packed, minlength=size) > 0
+        numbering = np.cumsum(present) - 1
+        unique, inverse = np.flatnonzero(present), numbering[packed]
+    else:
+        unique, inverse = np.unique(packed, return_inverse=True)
+        inverse = inverse.ravel()
+
+    group_codes = [codes - 1 for codes in np.unravel_index(unique, dims)]
+    return len(unique), group_codes, inverse
+
+def _reduce(ufunc, values: np.ndarray, inverse: np.ndarray, groups: int, identity: float) -> np.ndarray:
+    """Per-group min or max"""
+    result = np.full(groups, identity)
+    ufunc.at(result, inverse, values)
+    return result
+
+def _mean(values: np.ndarray, inverse: np.ndarray, groups: int) -> np.ndarray:
+    """Per-group mean skipping NaN, NaN for groups without values"""
+    valid = ~np.isnan(values)
+    total = np.bincount(inverse[valid], weights=values[valid], minlength=groups)
+    count = np.bincount(inverse[valid], minlength=groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+def _round(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals, halves away from zero as DECIMAL casts do"""
+    return np.sign(values) * np.floor(np.abs(values) * 100 + 0.5) / 100
\ No newline at end of file
@@ -0,0 +1,201 @@
+import logging
+import math
+from typing import Sequence, Tuple
+import numpy as np
+from src.config import Settings
+from src.analytics.frame import PropertyFrame
+from src.models import Property, PropertyBatch
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+class SpatialIndex:
+    """Uniform latitude/longitude grid over listing coordinates
+
+    Points are sorted by cell, and cells are numbered row by row, so the
+    cells of one grid row around a query are a single slice of the sorted
+    points. A query looks up one slice per row with searchsorted and
+    measures exact haversine distances to the candidates in them.
+    """
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, cell_km: float = None):
+        cell_km = cell_km or Settings.SPATIAL_CELL_KM
+        rows = np.flatnonzero(~(np.isnan(lat) | np.isnan(lng)))
+        lat, lng = lat[rows], lng[rows]
+
+        # Longitude cells are widened so cells stay roughly square at the data's latitude
+        middle = float(np.median(lat)) if len(lat) else 0.0
+        self.lat_step = cell_km / KM_PER_DEGREE
+        self.lng_step = self.lat_step / max(math.cos(math.radians(middle)), 0.01)
+
+        iy = np.floor(lat / self.lat_step).astype(np.int64)
+        ix = np.floor(lng / self.lng_step).astype(np.int64)
+        self.y0 = int(iy.min()) if len(iy) else 0
+        self.x0 = int(ix.min()) if len(ix) else 0
+        self.width = int(ix.max()) - self.x0 + 1 if len(ix) else 1
+        self.height = int(iy.max()) - self.y0 + 1 if len(iy) else 1
+
+        keys = (iy - self.y0) * self.width + (ix - self.x0)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.rows = rows[order]
+        self.lat = lat[order]
+        self.lng = lng[order]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_frame(cls, frame: PropertyFrame, cell_km: float = None) -> 'SpatialIndex':
+        """Index a frame's listings; query results are frame row numbers"""
+        return cls(frame.numeric['lat'], frame.numeric['lng'], cell_km)
+
+    def nearest(self, lat: float, lng: float, k: int = 1,
+                max_km: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of the k listings closest to a point and their distances in km, nearest first"""
+        if not len(self) or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Grow the searched square until it holds k points, then widen it once to the
+        # k-th distance so no closer point outside the square is missed
+        radius = self.lat_step * KM_PER_DEGREE
+        limit = max_km if max_km is not None else math.inf
+        while True:
+            candidates, distances = self._candidates(lat, lng, min(radius, limit))
+            if len(candidates) >= k or radius >= limit or radius > math.pi * EARTH_RADIUS_KM:
+                break
+            radius *= 2
+
+        if len(candidates) >= k:
+            kth = np.partition(distances, k - 1)[k - 1]
+            if kth > radius and radius < limit:
+                candidates, distances = self._candidates(lat, lng, min(kth, limit))
+
+        keep = distances <= limit
+        candidates, distances = candidates[keep], distances[keep]
+        if len(candidates) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[top], distances[top]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of the listings within `radius_km` of a point and their distances, nearest first"""
+        candidates, distances = self._candidates(lat, lng, radius_km)
+        keep = distances <= radius_km
+        candidates, distances = candidates[keep], distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows in the grid cells covering a circle, with their distances to its centre"""
+        if not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # A longitude degree is shortest at the band's edge furthest from the equator
+        lat_span = radius_km / KM_PER_DEGREE
+        edge = min(abs(lat) + lat_span, 89.9)
+        lng_span = lat_span / max(math.cos(math.radians(edge)), 1e-6)
+
+        y_lo = max(math.floor((lat - lat_span) / self.lat_step) - self.y0, 0)
+        y_hi = min(math.floor((lat + lat_span) / self.lat_step) - self.y0, self.height - 1)
+        x_lo = max(math.floor((lng - lng_span) / self.lng_step) - self.x0, 0)
+        x_hi = min(math.floor((lng + lng_span) / self.lng_step) - self.x0, self.width - 1)
+        if y_lo > y_hi or x_lo > x_hi:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        row_starts = np.arange(y_lo, y_hi + 1, dtype=np.int64) * self.width
+        starts = np.searchsorted(self.keys, row_starts + x_lo, 'left')
+        ends = np.searchsorted(self.keys, row_starts + x_hi, 'right')
+        slices = [slice(s, e) for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        if not slices:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        positions = np.concatenate([np.arange(s.start, s.stop) for s in slices])
+
+        return self.rows[positions], haversine_km(lat, lng, self.lat[positions], self.lng[positions])
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km from a point to arrays of points"""
+    phi, phis = math.radians(lat), np.radians(lats)
+    a = (np.sin((phis - phi) / 2) ** 2
+         + math.cos(phi) * np.cos(phis) * np.sin(np.radians(lngs - lng) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def backfill_districts(frame: PropertyFrame, k: int = 5, max_km: float = None) -> int:
+    """Fill missing districts in place from the most common one among the nearest labelled listings
+
+    Ties go to the district of the closest neighbour. Listings with no
+    labelled neighbour within `max_km` stay blank. district_en is copied
+    from the neighbour the district came from. Returns the number filled.
+    """
+    max_km = max_km if max_km is not None else Settings.DISTRICT_BACKFILL_MAX_KM
+    districts = frame.codes['district']
+    labelled = districts >= 0
+    missing = np.flatnonzero(~labelled & ~np.isnan(frame.numeric['lat']) & ~np.isnan(frame.numeric['lng']))
+    if not len(missing) or not labelled.any():
+        return 0
+
+    # Index only labelled listings so every neighbour can vote
+    lat, lng = frame.numeric['lat'], frame.numeric['lng']
+    index = SpatialIndex(np.where(labelled, lat, np.nan), np.where(labelled, lng, np.nan))
+    district_en = frame.codes['district_en']
+
+    filled = 0
+    for row in missing.tolist():
+        neighbours, _ = index.nearest(lat[row], lng[row], k, max_km)
+        if not len(neighbours):
+            continue
+        votes = districts[neighbours]
+        counts = np.bincount(votes)
+        # Neighbours are nearest first, so the first district with the top count is the closest
+        winner = next(i for i, code in enumerate(votes.tolist()) if counts[code] == counts.max())
+        districts[row] = votes[winner]
+        district_en[row] = district_en[neighbours[winner]]
+        filled += 1
+
+    logger.info(f"Filled {filled} of {len(missing)} missing districts from nearby listings")
+    return filled
+
+def comparables(frame: PropertyFrame, index: SpatialIndex, row: int, k: int = 10,
+                area_tolerance: float = 0.2, max_km: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Nearest listings of the same type and listing type with an area within `area_tolerance`
+
+    The search radius doubles from one grid cell up to `max_km` until k
+    comparables are found. Returns their rows and distances, nearest first.
+    """
+    max_km = max_km if max_km is not None else Settings.COMPARABLE_MAX_KM
+    lat, lng = frame.numeric['lat'][row], frame.numeric['lng'][row]
+    if np.isnan(lat) or np.isnan(lng):
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    area = frame.numeric['area_numeric']
+    type_code = frame.codes['type'][row]
+    listing_code = frame.codes['listing_type'][row]
+
+    radius = index.lat_step * KM_PER_DEGREE
+    while True:
+        radius = min(radius, max_km)
+        candidates, distances = index.within(lat, lng, radius)
+        matches = (
+            (candidates != row)
+            & (frame.codes['type'][candidates] == type_code)
+            & (frame.codes['listing_type'][candidates] == listing_code)
+            & (np.abs(area[candidates] - area[row]) <= area_tolerance * area[row])
+        )
+        if np.count_nonzero(matches) >= k or radius >= max_km:
+            return candidates[matches][:k], distances[matches][:k]
+        radius *= 2
+
+def backfill_properties(properties: Sequence[Property], k: int = 5, max_km: float = None) -> int:
+    """backfill_districts for Property objects, updating them in place"""
+    frame = PropertyFrame.from_batch(PropertyBatch(properties))
+    before = frame.codes['district'].copy()
+    filled = backfill_districts(frame, k, max_km)
+
+    for row in np.flatnonzero(frame.codes['district'] != before).tolist():
+        properties[row].district = frame.values['district'][frame.codes['district'][row]]
+        code = frame.codes['district_en'][row]
+        properties[row].district_en = frame.values['district_en'][code] if code >= 0 else ''
+    return filled
\ No newline at end of file
@@ -13,33 +13,37 @@ DEFAULT_HEADERS = {
 }
 
 # Browser Args
-BROWSER_ARGS = ['--disable-blink-features=AutomationControlled']
-
-# Parameter Combinations
-PARAM_COMBINATIONS = [
-    # Basic pagination
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'page': 2, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'page': 3, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'page': 4, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'page': 5, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-
-    # Try with offset
-    {'offset': 0, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'offset': 10, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'offset': 20, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'offset': 30, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-    {'offset': 40, 'limit': 10, 'city': '6009d941950ada00061eeeab'},
-
-    # Try with sort
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'sort': 'createdAt'},
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'sort': '-createdAt'},
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'sort': 'price'},
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'sort': '-price'},
-
-    # Try with filters
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'adPurpose': 'SALE'},
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'adPurpose': 'RENT'},
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'minPrice': 500000},
-    {'page': 1, 'limit': 10, 'city': '6009d941950ada00061eeeab', 'maxPrice': 1000000},
-]
\ No newline at end of file
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',  # Important for Docker
+    '--disable-setuid-sandbox',
+    '--no-sandbox',  # Required in Docker
+    '--disable-gpu',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process'
+]
+
+# Resource types not loaded while harvesting tokens
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+# Market listings page, used when the home page makes no API call
+MARKET_PATH = '/ar/السوق/الاعلانات'
+
+# Crawl Partitions
+CITY_IDS = {
+    'riyadh': '6009d941950ada00061eeeab',
+}
+AD_PURPOSES = ['SALE', 'RENT']
+
+# Initial price bands (SAR); deep bands are split further while crawling.
+# None leaves the top band without a maxPrice filter
+PRICE_BREAKS = [0, 100000, 1000000, 3000000, None]
+
+# Listings without a price sort first by price, ahead of every priced one
+UNPRICED_SORT = 'price'
+
+# Page sizes to try, largest first
+PAGE_SIZES = [100, 50, 20, 10]
+
+# Newest first, so incremental runs can stop at already-seen ads
+CRAWL_SORT = '-createdAt'
\ No newline at end of file
@@ -1,29 +1,111 @@
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 class Settings:
-    """Application settings"""
+    """Application settings
+
+    Read from the environment when this module is imported. Entry points
+    call Settings.init() before anything else to also load a .env file and
+    create the working directories.
+    """
+
+    @classmethod
+    def load(cls):
+        """Read every setting from the environment"""
+
+        # API Configuration
+        cls.BASE_URL = os.getenv('DEALAPP_BASE_URL', 'https://api.dealapp.sa/production')
+        cls.API_ENDPOINT = '/ad'
+        cls.SITE_URL = os.getenv('DEALAPP_SITE_URL', 'https://dealapp.sa')
+
+        # Scraping Configuration
+        cls.TARGET_PROPERTIES = int(os.getenv('TARGET_PROPERTIES', 500))
+        cls.MAX_TOKENS = int(os.getenv('MAX_TOKENS', 20))
+        cls.CRAWL_CITIES = os.getenv('CRAWL_CITIES', 'riyadh').split(',')
+
+        # Crawl Planner Configuration
+        cls.CRAWL_MAX_PARTITION_PAGES = int(os.getenv('CRAWL_MAX_PARTITION_PAGES', 20))
+        cls.CRAWL_MAX_STALE_PAGES = int(os.getenv('CRAWL_MAX_STALE_PAGES', 2))
+        cls.CRAWL_MAX_KNOWN_PAGES = int(os.getenv('CRAWL_MAX_KNOWN_PAGES', 1))  # full pages of known ads ending an incremental partition
+        cls.CRAWL_MIN_PRICE_BAND = int(os.getenv('CRAWL_MIN_PRICE_BAND', 1000))
+        cls.CRAWL_PARTITION_LOOKAHEAD = int(os.getenv('CRAWL_PARTITION_LOOKAHEAD', 2))
+        cls.CRAWL_MAX_PAGE_ATTEMPTS = int(os.getenv('CRAWL_MAX_PAGE_ATTEMPTS', 3))
+
+        # Token Prefetch Configuration
+        cls.TOKEN_QUEUE_DEPTH = int(os.getenv('TOKEN_QUEUE_DEPTH', 2))
+        cls.TOKEN_TTL = float(os.getenv('TOKEN_TTL', 900))  # seconds
+        cls.TOKEN_EXPIRY_MARGIN = float(os.getenv('TOKEN_EXPIRY_MARGIN', 30))  # seconds
+        cls.TOKEN_HARVEST_LEAD = float(os.getenv('TOKEN_HARVEST_LEAD', 60))  # seconds before the last token expires
+        cls.TOKEN_RETRY_DELAY = float(os.getenv('TOKEN_RETRY_DELAY', 5))
+        cls.TOKEN_STORE = os.getenv('TOKEN_STORE', 'true').lower() == 'true'  # reuse valid tokens across runs
+
+        # Concurrency Configuration
+        cls.SCRAPE_CONCURRENCY = int(os.getenv('SCRAPE_CONCURRENCY', 4))
+        cls.TOKEN_RATE_LIMIT = float(os.getenv('TOKEN_RATE_LIMIT', 5))  # requests/sec per token
+        cls.CRAWL_WORKERS = int(os.getenv('CRAWL_WORKERS', 1))  # processes, each with its own tokens
+
+        # HTTP Configuration
+        cls.HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+        cls.HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 20))
+        cls.HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+        cls.HTTP_BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', 0.5))
+        cls.HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', 30))
+
+        # Browser Configuration
+        cls.HEADLESS = os.getenv('HEADLESS', 'true').lower() == 'true'
+        cls.BROWSER_TIMEOUT = int(os.getenv('BROWSER_TIMEOUT', 30000))
+
+        # Incremental Crawl Configuration
+        cls.INCREMENTAL = os.getenv('INCREMENTAL', 'false').lower() == 'true'
+        cls.CHECKPOINT_INTERVAL = float(os.getenv('CHECKPOINT_INTERVAL', 30))  # seconds
+
+        # Output Configuration
+        cls.OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'data')
+        cls.LOG_DIR = os.getenv('LOG_DIR', 'logs')
+        cls.STATE_DIR = os.getenv('STATE_DIR', 'state')
+        cls.OUTPUT_FLUSH_EVERY = int(os.getenv('OUTPUT_FLUSH_EVERY', 100))
+        cls.OUTPUT_FORMATS = os.getenv('OUTPUT_FORMATS', 'csv,jsonl,parquet').split(',')
+        cls.PARQUET_ROW_GROUP_SIZE = int(os.getenv('PARQUET_ROW_GROUP_SIZE', 50000))
+        cls.PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'snappy')
+
+        # Manual Upload Configuration
+        cls.MANUAL_CHUNK_ROWS = int(os.getenv('MANUAL_CHUNK_ROWS', 100000))  # upload rows normalized at a time
+        cls.MANUAL_BLOCK_SIZE = int(os.getenv('MANUAL_BLOCK_SIZE', 1 << 20))  # bytes of CSV parsed at a time
+
+        # Change Data Capture Configuration
+        cls.CDC_OUTPUT = os.getenv('CDC_OUTPUT', 'true').lower() == 'true'  # write a _delta.csv of changed listings
+
+        # Near-Duplicate Detection Configuration
+        cls.DEDUP_OUTPUT = os.getenv('DEDUP_OUTPUT', 'true').lower() == 'true'  # write a _duplicates.csv of clustered listings
+        cls.DEDUP_MAX_METERS = float(os.getenv('DEDUP_MAX_METERS', 100))  # furthest apart two pins of one property can be
+        cls.DEDUP_AREA_TOLERANCE = float(os.getenv('DEDUP_AREA_TOLERANCE', 0.05))  # relative area difference allowed
+        cls.DEDUP_PRICE_TOLERANCE = float(os.getenv('DEDUP_PRICE_TOLERANCE', 0.1))  # relative price difference allowed
+        cls.DEDUP_TITLE_SIMILARITY = float(os.getenv('DEDUP_TITLE_SIMILARITY', 0.6))  # for listings without a location
+        cls.DEDUP_MAX_BLOCK = int(os.getenv('DEDUP_MAX_BLOCK', 50))  # recent listings compared per block
+
+        # Raw Response Archive Configuration
+        cls.ARCHIVE_RESPONSES = os.getenv('ARCHIVE_RESPONSES', 'true').lower() == 'true'
+        cls.ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
+        cls.ARCHIVE_COMPRESSION = os.getenv('ARCHIVE_COMPRESSION', 'gzip')  # gzip, zstd or none
+        cls.ARCHIVE_COMPRESSION_LEVEL = int(os.getenv('ARCHIVE_COMPRESSION_LEVEL', 3))
 
-    # API Configuration
-    BASE_URL = os.getenv('DEALAPP_BASE_URL', 'https://api.dealapp.sa/production')
-    API_ENDPOINT = '/ad'
+        # Analytics Configuration
+        cls.ANALYTICS_CAP_RATE = float(os.getenv('ANALYTICS_CAP_RATE', 0.06))  # rent -> value capitalisation rate
+        cls.SPATIAL_CELL_KM = float(os.getenv('SPATIAL_CELL_KM', 0.5))  # grid cell size of the spatial index
+        cls.DISTRICT_BACKFILL_MAX_KM = float(os.getenv('DISTRICT_BACKFILL_MAX_KM', 1.5))
+        cls.COMPARABLE_MAX_KM = float(os.getenv('COMPARABLE_MAX_KM', 5))
 
-    # Scraping Configuration
-    TARGET_PROPERTIES = int(os.getenv('TARGET_PROPERTIES', 500))
-    MAX_TOKENS = int(os.getenv('MAX_TOKENS', 20))
-    REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', 0.5))
-    TOKEN_DELAY = float(os.getenv('TOKEN_DELAY', 2))
+        # Metrics Configuration
+        cls.METRICS_PORT = int(os.getenv('METRICS_PORT', 0))  # Prometheus endpoint, 0 disables
 
-    # Browser Configuration
-    HEADLESS = os.getenv('HEADLESS', 'true').lower() == 'true'
-    BROWSER_TIMEOUT = int(os.getenv('BROWSER_TIMEOUT', 30000))
+    @classmethod
+    def init(cls, env_file: str = None):
+        """Load .env into the environment, re-read the settings and create the working directories"""
+        from dotenv import load_dotenv
+        # Values land in os.environ, so worker processes started later see them too
+        load_dotenv(env_file)
+        cls.load()
 
-    # Output Configuration
-    OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'data')
-    LOG_DIR = os.getenv('LOG_DIR', 'logs')
+        for directory in (cls.OUTPUT_DIR, cls.LOG_DIR, cls.STATE_DIR):
+            os.makedirs(directory, exist_ok=True)
 
-    # Ensure directories exist
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    os.makedirs(LOG_DIR, exist_ok=True)
\ No newline at end of file
+Settings.load()
\ No newline at end of file
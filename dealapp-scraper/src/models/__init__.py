@@ -1,3 +1,6 @@
 from .property import Property
+from .token import Token
+from .run_summary import RunSummary
+from .property_batch import PropertyBatch
 
-__all__ = ['Property']
\ No newline at end of file
+__all__ = ['Property', 'Token', 'RunSummary', 'PropertyBatch']
\ No newline at end of file
@@ -2,6 +2,14 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+# Output column order shared by the CSV writers and PropertyBatch
+FIELDNAMES = [
+    'type', 'listing_type', 'city', 'district', 'district_en',
+    'price', 'price_numeric', 'area', 'area_numeric',
+    'bedrooms', 'ad_id', 'code', 'title', 'lat', 'lng',
+    'created_at', 'source', 'extraction_date'
+]
+
 @dataclass
 class Property:
     """Property data model"""
@@ -45,4 +53,12 @@ class Property:
             'created_at': self.created_at,
             'source': self.source,
             'extraction_date': self.extraction_date.isoformat() if self.extraction_date else None
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Property':
+        """Create from a dictionary produced by to_dict"""
+        data = dict(data)
+        if data.get('extraction_date'):
+            data['extraction_date'] = datetime.fromisoformat(data['extraction_date'])
+        return cls(**data)
\ No newline at end of file
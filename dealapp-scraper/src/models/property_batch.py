@@ -0,0 +1,260 @@
+import csv
+import json
+import math
+import sys
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.models.property import Property, FIELDNAMES
+
+NUMERIC_COLUMNS = ('price_numeric', 'area_numeric', 'bedrooms', 'lat', 'lng')
+CATEGORICAL_COLUMNS = ('type', 'listing_type', 'city', 'district', 'district_en', 'source')
+TEXT_COLUMNS = ('ad_id', 'code', 'title')
+
+# Sentinel for missing timestamps in the int64 columns
+NULL_TIME = -(2 ** 63)
+EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+MILLISECOND = timedelta(milliseconds=1)
+
+class PropertyBatch:
+    """Column store of properties backed by typed arrays
+
+    Numbers live in float64 arrays (NaN for missing coordinates), repeated
+    strings are dictionary-encoded into int32 codes, and timestamps are int64
+    epoch offsets. The formatted price/area strings of Property are derived
+    on export instead of stored. created_at values that do not parse are kept
+    as strings on the side, so they survive a round trip. Arrays are exported to Arrow without
+    copying, so the batch must not grow while an exported table is alive.
+    """
+
+    __slots__ = ('_numeric', '_codes', '_dictionaries', '_lookup', '_text',
+                 '_created_at', '_unparsed_created_at', '_extraction_date')
+
+    def __init__(self, properties: Iterable[Property] = ()):
+        self._numeric = {name: array('d') for name in NUMERIC_COLUMNS}
+        self._codes = {name: array('i') for name in CATEGORICAL_COLUMNS}
+        self._dictionaries: Dict[str, List[Optional[str]]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self._lookup: Dict[str, Dict[Optional[str], int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_COLUMNS}
+        self._created_at = array('q')  # epoch milliseconds, UTC
+        self._unparsed_created_at: Dict[int, str] = {}  # row -> original value
+        self._extraction_date = array('q')  # epoch microseconds, naive local time
+
+        self.extend(properties)
+
+    def __len__(self) -> int:
+        return len(self._extraction_date)
+
+    def __getitem__(self, index: int) -> Property:
+        row = self._row(index)
+        row['extraction_date'] = self._extraction_datetime(index)
+        return Property(**row)
+
+    def __iter__(self) -> Iterator[Property]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, prop: Property):
+        """Add a property to the batch"""
+        values = vars(prop)
+        for name, column in self._numeric.items():
+            value = values[name]
+            column.append(math.nan if value is None else value)
+
+        for name, column in self._codes.items():
+            value = values[name]
+            code = self._lookup[name].get(value)
+            column.append(self._encode(name, value) if code is None else code)
+
+        for name, column in self._text.items():
+            column.append(values[name])
+
+        created_at = _to_epoch_ms(prop.created_at)
+        if created_at == NULL_TIME and prop.created_at:
+            self._unparsed_created_at[len(self._created_at)] = prop.created_at
+        self._created_at.append(created_at)
+        self._extraction_date.append(
+            (prop.extraction_date - EPOCH) // MICROSECOND if prop.extraction_date else NULL_TIME
+        )
+
+    def extend(self, properties: Iterable[Property]):
+        """Add several properties to the batch"""
+        for prop in properties:
+            self.append(prop)
+
+    def numeric(self, name: str) -> array:
+        """Raw float64 array of a numeric column"""
+        return self._numeric[name]
+
+    def codes(self, name: str) -> array:
+        """Raw int32 dictionary codes of a categorical column"""
+        return self._codes[name]
+
+    def dictionary(self, name: str) -> List[Optional[str]]:
+        """Values of a categorical column, indexed by code"""
+        return self._dictionaries[name]
+
+    def text(self, name: str) -> List[str]:
+        """Values of a free-text column"""
+        return self._text[name]
+
+    @property
+    def unparsed_timestamps(self) -> int:
+        """Number of created_at values that are not ISO-8601 timestamps"""
+        return len(self._unparsed_created_at)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch"""
+        arrays = list(self._numeric.values()) + list(self._codes.values())
+        arrays += [self._created_at, self._extraction_date]
+        total = sum(a.itemsize * len(a) for a in arrays)
+
+        for values in self._text.values():
+            total += sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+        for values in self._dictionaries.values():
+            total += sum(sys.getsizeof(v) for v in values)
+        total += sum(sys.getsizeof(v) for v in self._unparsed_created_at.values())
+
+        return total
+
+    @property
+    def bytes_per_record(self) -> float:
+        return self.nbytes / len(self) if len(self) else 0.0
+
+    def iter_dicts(self) -> Iterator[Dict]:
+        """Yield rows shaped like Property.to_dict, one at a time"""
+        for i in range(len(self)):
+            row = self._row(i)
+            extraction_date = self._extraction_datetime(i)
+            row['extraction_date'] = extraction_date.isoformat() if extraction_date else None
+            yield row
+
+    def to_csv(self, path: str) -> str:
+        """Write the batch as CSV in the scraper's column layout"""
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.iter_dicts())
+        return path
+
+    def to_jsonl(self, path: str) -> str:
+        """Write the batch as JSON Lines"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in self.iter_dicts():
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write('\n')
+        return path
+
+    def to_arrow(self, file_date: Optional[date] = None):
+        """Arrow table in the Parquet bronze schema, sharing the batch's buffers
+
+        file_date fills the ingest_date partition column. Unparsed created_at
+        values are null, as the column is a typed timestamp.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        from src.utils.parquet_writer import PARQUET_SCHEMA
+
+        n = len(self)
+        columns = {}
+
+        for name in NUMERIC_COLUMNS:
+            buffer = pa.py_buffer(self._numeric[name])
+            values = pa.Array.from_buffers(pa.float64(), n, [None, buffer])
+            if name in ('lat', 'lng'):
+                # NaN marks a missing coordinate
+                validity = pc.invert(pc.is_nan(values)).buffers()[1]
+                values = pa.Array.from_buffers(pa.float64(), n, [validity, buffer])
+            columns[name] = values
+
+        for name in CATEGORICAL_COLUMNS:
+            buffer = pa.py_buffer(self._codes[name])
+            dictionary = list(self._dictionaries[name])
+            validity = None
+            null_code = self._lookup[name].get(None)
+            if null_code is not None:
+                # Parquet cannot store a null inside a dictionary, so missing values get null indices
+                raw = pa.Array.from_buffers(pa.int32(), n, [None, buffer])
+                validity = pc.not_equal(raw, null_code).buffers()[1]
+                dictionary[null_code] = ''
+            indices = pa.Array.from_buffers(pa.int32(), n, [validity, buffer])
+            columns[name] = pa.DictionaryArray.from_arrays(indices, pa.array(dictionary, pa.string()))
+
+        for name in TEXT_COLUMNS:
+            columns[name] = pa.array(self._text[name], pa.string())
+
+        for name, values, unit_type in (('created_at', self._created_at, pa.timestamp('ms', tz='UTC')),
+                                        ('extraction_date', self._extraction_date, pa.timestamp('us'))):
+            raw = pa.Array.from_buffers(pa.int64(), n, [None, pa.py_buffer(values)])
+            validity = pc.not_equal(raw, NULL_TIME).buffers()[1]
+            columns[name] = pa.Array.from_buffers(unit_type, n, [validity, pa.py_buffer(values)])
+        columns['file_date'] = pa.array([file_date] * n, pa.date32())
+
+        return pa.Table.from_arrays(
+            [columns[f.name] for f in PARQUET_SCHEMA],
+            schema=PARQUET_SCHEMA
+        )
+
+    def to_parquet(self, path: str, file_date: Optional[date] = None) -> str:
+        """Write the batch as Parquet"""
+        import pyarrow.parquet as pq
+        from src.config import Settings
+        from src.utils.parquet_writer import DICTIONARY_COLUMNS
+
+        pq.write_table(self.to_arrow(file_date), path, compression=Settings.PARQUET_COMPRESSION,
+                       use_dictionary=DICTIONARY_COLUMNS)
+        return path
+
+    def _encode(self, name: str, value: Optional[str]) -> int:
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self._dictionaries[name])
+            lookup[value] = code
+            self._dictionaries[name].append(value)
+        return code
+
+    def _row(self, i: int) -> Dict:
+        row = {name: self._dictionaries[name][self._codes[name][i]] for name in CATEGORICAL_COLUMNS}
+        for name in TEXT_COLUMNS:
+            row[name] = self._text[name][i]
+        for name in NUMERIC_COLUMNS:
+            row[name] = self._numeric[name][i]
+
+        for name in ('lat', 'lng'):
+            if math.isnan(row[name]):
+                row[name] = None
+
+        row['price'] = f"{_compact_number(row['price_numeric']):,}"
+        row['area'] = str(_compact_number(row['area_numeric']))
+        row['created_at'] = self._unparsed_created_at.get(i) or _from_epoch_ms(self._created_at[i])
+        return row
+
+    def _extraction_datetime(self, i: int) -> Optional[datetime]:
+        value = self._extraction_date[i]
+        return EPOCH + value * MICROSECOND if value != NULL_TIME else None
+
+def _compact_number(value: float):
+    """Render whole floats as ints, as the API's own numbers usually are"""
+    return int(value) if value.is_integer() else value
+
+def _to_epoch_ms(value: Optional[str]) -> int:
+    """Parse an API timestamp such as 2025-09-15T08:44:57.097Z"""
+    if not value:
+        return NULL_TIME
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return NULL_TIME
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - UTC_EPOCH) // MILLISECOND
+
+def _from_epoch_ms(value: int) -> str:
+    if value == NULL_TIME:
+        return ''
+    moment = UTC_EPOCH + value * MILLISECOND
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
\ No newline at end of file
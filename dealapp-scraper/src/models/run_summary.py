@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Set
+from src.models.property import Property
+
+@dataclass
+class RunSummary:
+    """Running totals over scraped properties, kept without storing them"""
+    total: int = 0
+    districts: Set[str] = field(default_factory=set)
+    priced: int = 0
+    price_sum: float = 0.0
+    price_min: float = float('inf')
+    price_max: float = 0.0
+
+    def add(self, prop: Property):
+        """Include a property in the totals"""
+        self.total += 1
+        if prop.district:
+            self.districts.add(prop.district)
+        if prop.price_numeric > 0:
+            self.priced += 1
+            self.price_sum += prop.price_numeric
+            self.price_min = min(self.price_min, prop.price_numeric)
+            self.price_max = max(self.price_max, prop.price_numeric)
+
+    @property
+    def average_price(self) -> float:
+        return self.price_sum / self.priced if self.priced else 0.0
\ No newline at end of file
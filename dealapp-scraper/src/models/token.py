@@ -0,0 +1,49 @@
+import base64
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class Token:
+    """Harvested API token"""
+    value: str
+    expires_at: float
+    harvested_at: float = field(default_factory=time.time)
+    requests_served: int = 0
+    forbidden: int = 0
+    exhausted: bool = False
+
+    @classmethod
+    def from_value(cls, value: str, ttl: float) -> 'Token':
+        """Create a token expiring at its JWT exp claim, or after `ttl` seconds"""
+        expires_at = cls.jwt_expiry(value)
+        return cls(value=value, expires_at=expires_at if expires_at else time.time() + ttl)
+
+    @staticmethod
+    def jwt_expiry(value: str) -> Optional[float]:
+        """Decode the exp claim of a JWT without verifying its signature"""
+        parts = value.split('.')
+        if len(parts) != 3:
+            return None
+
+        try:
+            payload = base64.urlsafe_b64decode(parts[1] + '=' * (-len(parts[1]) % 4))
+            exp = json.loads(payload).get('exp')
+        except (ValueError, AttributeError):
+            return None
+        return float(exp) if isinstance(exp, (int, float)) else None
+
+    @property
+    def ttl(self) -> float:
+        """Seconds until the token expires"""
+        return self.expires_at - time.time()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the token was harvested"""
+        return time.time() - self.harvested_at
+
+    def is_usable(self, margin: float = 0) -> bool:
+        """Whether the token is neither exhausted nor about to expire"""
+        return not self.exhausted and self.ttl > margin
\ No newline at end of file
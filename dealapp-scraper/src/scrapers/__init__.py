@@ -1,3 +1,22 @@
-from .dealapp_scraper import DealAppScraper
+import importlib
 
-__all__ = ['DealAppScraper']
\ No newline at end of file
+# Submodules are imported on first access, see src.utils
+_EXPORTS = {
+    'DealAppScraper': 'dealapp_scraper',
+    'CrawlPlanner': 'crawl_planner',
+    'CrawlCoordinator': 'coordinator',
+    'ArchiveReplayer': 'replay',
+    'OutputExporter': 'exporter'
+}
+
+__all__ = ['DealAppScraper', 'CrawlPlanner', 'CrawlCoordinator', 'ArchiveReplayer', 'OutputExporter']
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
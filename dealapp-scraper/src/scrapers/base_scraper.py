@@ -1,13 +1,21 @@
+import logging
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List
-from src.models import Property
+from src.models import Property, RunSummary
+from src.config import Settings
+from src.utils import PropertyParser, FileHandler, DuplicateDetector
+
+logger = logging.getLogger(__name__)
 
 class BaseScraper(ABC):
     """Base scraper class"""
 
     def __init__(self):
-        self.properties: List[Property] = []
+        self.summary = RunSummary()
         self.seen_ids = set()
+        # Clusters near-duplicate listings, which seen_ids only catches when they share an ad id
+        self.dedup = DuplicateDetector() if Settings.DEDUP_OUTPUT else None
 
     @abstractmethod
     def scrape(self) -> int:
@@ -17,4 +25,45 @@ class BaseScraper(ABC):
     @abstractmethod
     def _save_results(self):
         """Save results method"""
-        pass
\ No newline at end of file
+        pass
+
+    def _merge_outputs(self, paths: List[str], timestamp: datetime, formats: List[str] = None) -> int:
+        """Write JSON Lines outputs into a run's files, keeping the first copy of each ad
+
+        Returns the number of duplicate ads dropped.
+        """
+        writers = FileHandler.open_writers(timestamp, formats=formats)
+        duplicates = 0
+
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    prop = Property.from_dict(PropertyParser.decode_json(line))
+                    if prop.ad_id in self.seen_ids:
+                        duplicates += 1
+                        continue
+
+                    self.seen_ids.add(prop.ad_id)
+                    self.summary.add(prop)
+                    if self.dedup is not None:
+                        self.dedup.add(prop.to_dict())
+                    for writer in writers.values():
+                        writer.write(prop)
+
+        if self.summary.total:
+            for writer in writers.values():
+                writer.close()
+            self._save_duplicates(timestamp)
+        else:
+            logger.warning("No properties to save")
+            for writer in writers.values():
+                writer.discard()
+
+        return duplicates
+
+    def _save_duplicates(self, timestamp: datetime):
+        """Publish the near-duplicate clusters found among the run's properties"""
+        if self.dedup is None:
+            return
+        path, clusters = self.dedup.save(FileHandler.duplicates_path(timestamp))
+        logger.info(f"{self.dedup.duplicates} near-duplicate listings in {clusters} clusters saved to {path}")
\ No newline at end of file
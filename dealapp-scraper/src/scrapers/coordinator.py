@@ -0,0 +1,216 @@
+import csv
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.crawl_planner import CrawlPlanner, Partition
+from src.scrapers.dealapp_scraper import DealAppScraper
+from src.utils import FileHandler, DeltaStreamWriter, CrawlCheckpoint, SeenIndex, metrics
+from src.utils.seen_index import GONE
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Properties collected by all workers, shared so every shard stops at the global target
+_collected = None
+_output_root = None
+
+def _init_worker(collected, output_root: str):
+    global _collected, _output_root
+    _collected = collected
+    _output_root = output_root
+
+class ShardScraper(DealAppScraper):
+    """DealAppScraper for one shard of partitions, stopping at the coordinator's target"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Duplicates can span shards, so the coordinator clusters the merged output
+        self.dedup = None
+        # Listings this shard found first in the run, the only ones it adds to the shared count
+        self.claimed = 0
+
+    def _reload_written(self):
+        super()._reload_written()
+        self.claimed = self.checkpoint.load().get('claimed', self.summary.total)
+        self._add_collected(self.claimed)
+
+    def _checkpoint_state(self, offsets: Dict[str, int]) -> Dict:
+        return {**super()._checkpoint_state(offsets), 'claimed': self.claimed}
+
+    def _target_reached(self) -> bool:
+        return _collected.value >= Settings.TARGET_PROPERTIES
+
+    def _write_metrics(self, status: str):
+        # Shard metrics are returned to the coordinator, which reports the whole run
+        pass
+
+    def _index_ads(self, ads: List[dict]):
+        run = self.timestamp.isoformat(timespec='microseconds')
+        # Holding the index's write lock from lookup to commit lets only the first shard to find a listing claim it
+        self.index.begin()
+        indexed, changes = super()._index_ads(ads)
+        # Other workers share the index, so keep write transactions short
+        self.index.commit()
+
+        found = {ad_id for ad_id, (last_seen, _) in indexed.items() if last_seen == run}
+        claimed = len({ad['_id'] for ad in ads} - found)
+        self.claimed += claimed
+        self._add_collected(claimed)
+        return indexed, changes
+
+    @staticmethod
+    def _add_collected(count: int):
+        with _collected.get_lock():
+            _collected.value += count
+
+def _crawl_shard(name: str, partitions: List[Partition], incremental: bool, timestamp: datetime) -> Dict:
+    """Crawl one shard in a worker process and return its JSON Lines output"""
+    # Pool processes may run several shards, so only report this shard's metrics
+    metrics.reset()
+
+    scraper = ShardScraper(
+        incremental=incremental,
+        planner=CrawlPlanner(incremental=incremental, partitions=partitions),
+        checkpoint=CrawlCheckpoint(os.path.join(Settings.STATE_DIR, 'shards', name)),
+        shard=name,
+        output_dir=os.path.join(_output_root, 'shards', name),
+        # Workers only write JSON Lines; the coordinator writes the other formats after merging
+        formats=['jsonl']
+    )
+    # One run timestamp across shards keeps the index's change tracking consistent
+    scraper.timestamp = timestamp
+    count = scraper.scrape()
+
+    return {
+        'shard': name,
+        'count': count,
+        'output': scraper.writers['jsonl'].path if count else None,
+        'delta': scraper.delta.path if scraper.delta else None,
+        'complete': scraper.planner.complete,
+        'requests': sum(p['requests'] for p in scraper.planner.yield_report()),
+        'partitions': scraper.planner.yield_report(),
+        'metrics': metrics.snapshot()
+    }
+
+class CrawlCoordinator(BaseScraper):
+    """Runs the crawl as shards of market partitions in a process pool"""
+
+    def __init__(self, workers: int = None, incremental: bool = None):
+        super().__init__()
+        self.workers = workers or Settings.CRAWL_WORKERS
+        self.incremental = Settings.INCREMENTAL if incremental is None else incremental
+        self.duplicates = 0
+
+        # Shards of an interrupted run resume under its timestamp
+        self.checkpoint = CrawlCheckpoint(os.path.join(Settings.STATE_DIR, 'shards'))
+        state = self.checkpoint.load()
+        self.timestamp = datetime.fromisoformat(state['timestamp']) if state else datetime.now()
+
+    def plan_shards(self) -> Dict[str, List[Partition]]:
+        """Deal the seed partitions round-robin into one shard per worker"""
+        partitions = CrawlPlanner.seed_partitions()
+        count = min(self.workers, len(partitions))
+        return {
+            f"shard-{i + 1:02d}-of-{count:02d}": partitions[i::count]
+            for i in range(count)
+        }
+
+    def scrape(self) -> int:
+        """Crawl all shards in parallel and merge their output"""
+        shards = self.plan_shards()
+        logger.info(f"Starting {len(shards)} crawl workers over "
+                    f"{sum(len(p) for p in shards.values())} partitions")
+
+        self.checkpoint.save({'timestamp': self.timestamp.isoformat()})
+        collected = multiprocessing.Value('q', 0)
+        results = []
+        with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_worker,
+                                 initargs=(collected, Settings.OUTPUT_DIR)) as executor:
+            futures = {
+                executor.submit(_crawl_shard, name, partitions, self.incremental, self.timestamp): name
+                for name, partitions in shards.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The shard's checkpoint is kept, so the next run resumes it
+                    logger.error(f"Shard {futures[future]} failed: {e}")
+                    continue
+
+                logger.info(f"Shard {result['shard']} collected {result['count']} properties "
+                            f"in {result['requests']} requests")
+                metrics.merge(result['metrics'])
+                results.append(result)
+
+        if len(results) == len(shards):
+            self.checkpoint.clear()
+        with metrics.timer('merge_seconds'):
+            if Settings.CDC_OUTPUT:
+                self._save_delta(results, complete=len(results) == len(shards))
+            self._save_results(results)
+
+        metrics.write_report(
+            FileHandler.metrics_path(self.timestamp),
+            timestamp=self.timestamp.isoformat(),
+            status='completed' if len(results) == len(shards) else 'partial',
+            incremental=self.incremental,
+            workers=len(shards),
+            properties=self.summary.total,
+            duplicates=self.duplicates,
+            partitions=[p for r in results for p in r['partitions']]
+        )
+        return self.summary.total
+
+    def _save_results(self, results: List[Dict] = None):
+        """Merge shard outputs into the run's files, dropping ads found by several shards"""
+        outputs = [r['output'] for r in results or [] if r['output']]
+        self.duplicates = self._merge_outputs(outputs, self.timestamp)
+
+        for path in outputs:
+            os.remove(path)
+        for root in (Settings.OUTPUT_DIR, Settings.STATE_DIR):
+            self._remove_empty_dirs(os.path.join(root, 'shards'), [r['shard'] for r in results or []])
+
+        logger.info(f"Merged {self.summary.total} unique properties from {len(outputs)} shards "
+                    f"({self.duplicates} duplicates dropped)")
+
+    def _save_delta(self, results: List[Dict], complete: bool):
+        """Merge shard deltas and add listings gone from the whole market"""
+        writer = DeltaStreamWriter(DeltaStreamWriter.path_for(self.timestamp))
+        seen = set()
+        for path in [r['delta'] for r in results if r['delta']]:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f):
+                    # Shards classify an ad they both saw the same way
+                    if row['ad_id'] not in seen:
+                        seen.add(row['ad_id'])
+                        writer.write_row(row)
+            os.remove(path)
+
+        if complete and all(r['complete'] for r in results):
+            index = SeenIndex()
+            scopes = sorted({p.scope for partitions in self.plan_shards().values() for p in partitions})
+            gone = index.mark_gone(scopes, self.timestamp)
+            index.close()
+            for ad_id in gone:
+                writer.write_change(GONE, ad_id=ad_id)
+            metrics.inc('delta_rows_total', len(gone), change=GONE)
+        else:
+            logger.info("Crawl did not cover every listing, so no listings are reported gone")
+
+        writer.close()
+        logger.info(f"Delta of {writer.count} changed listings saved to {writer.path}")
+
+    @staticmethod
+    def _remove_empty_dirs(root: str, names: List[str]):
+        """Remove finished shards' directories, keeping any that hold resume state"""
+        for path in [os.path.join(root, name) for name in names] + [root]:
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
\ No newline at end of file
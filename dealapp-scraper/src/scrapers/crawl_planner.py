@@ -0,0 +1,314 @@
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set
+from src.config import Settings, constants
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Partition:
+    """A (city, purpose, price band) slice of the market paged independently
+
+    A band without max_price is open-ended. An unpriced partition has no price
+    filter and pages the listings without a price, which match no band.
+    """
+    city: str
+    purpose: str
+    min_price: int
+    max_price: Optional[int]
+    unpriced: bool = False
+    next_page: int = 1
+    pages_fetched: int = 0
+    requests: int = 0
+    new_ads: int = 0
+    stale_pages: int = 0
+    stale_grace: int = 0
+    # Consecutive pages holding only ads seen by earlier runs
+    known_pages: int = 0
+    last_page: int = 0
+    done: bool = False
+    # Paged to its last page, directly or through its split children
+    covered: bool = False
+    abandoned_pages: int = 0
+    in_flight: Set[int] = field(default_factory=set)
+    retry_pages: List[int] = field(default_factory=list)
+    # Failed attempts of pages waiting for a retry
+    page_attempts: Dict[int, int] = field(default_factory=dict)
+    # Prices paged so far, to size the stale grace of split children
+    seen_prices: List[float] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        if self.unpriced:
+            return f"{self.city}/{self.purpose}/unpriced"
+        return f"{self.city}/{self.purpose}/{self.min_price}-{'' if self.max_price is None else self.max_price}"
+
+    @property
+    def scope(self) -> str:
+        return f"{self.city}/{self.purpose}"
+
+    @property
+    def yield_per_request(self) -> float:
+        return self.new_ads / self.requests if self.requests else 0.0
+
+@dataclass
+class CrawlRequest:
+    """A single page request planned for a partition"""
+    partition: Partition
+    page: int
+    limit: int
+    attempts: int = 0
+
+    @property
+    def params(self) -> Dict:
+        params = {
+            'page': self.page,
+            'limit': self.limit,
+            'city': self.partition.city,
+            'adPurpose': self.partition.purpose
+        }
+        if self.partition.unpriced:
+            params['sort'] = constants.UNPRICED_SORT
+            return params
+
+        params['minPrice'] = self.partition.min_price
+        if self.partition.max_price is not None:
+            params['maxPrice'] = self.partition.max_price
+        params['sort'] = constants.CRAWL_SORT
+        return params
+
+class CrawlPlanner:
+    """Plans paginated requests across market partitions"""
+
+    def __init__(self, cities: List[str] = None, purposes: List[str] = None, incremental: bool = False,
+                 partitions: List[Partition] = None):
+        self.incremental = incremental
+        self.partitions: List[Partition] = partitions or CrawlPlanner.seed_partitions(cities, purposes)
+        self._active = deque(self.partitions)
+        self._page_sizes = list(constants.PAGE_SIZES)
+        self.observed_page_size = 0
+
+    @staticmethod
+    def seed_partitions(cities: List[str] = None, purposes: List[str] = None) -> List[Partition]:
+        """Initial (city, purpose, price band) partitions of the market, plus unpriced listings"""
+        cities = cities or [constants.CITY_IDS[name] for name in Settings.CRAWL_CITIES]
+        purposes = purposes or constants.AD_PURPOSES
+        breaks = constants.PRICE_BREAKS
+
+        partitions = []
+        for city in cities:
+            for purpose in purposes:
+                partitions.extend(Partition(city=city, purpose=purpose, min_price=low, max_price=high)
+                                  for low, high in zip(breaks, breaks[1:]))
+                partitions.append(Partition(city=city, purpose=purpose, min_price=0, max_price=None,
+                                            unpriced=True))
+        return partitions
+
+    @property
+    def page_size(self) -> int:
+        return self._page_sizes[0]
+
+    @property
+    def done(self) -> bool:
+        return not any(self._has_work(p) or p.in_flight for p in self._active)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the crawl paged through every listing of its partitions"""
+        return self.done and all(p.covered and not p.abandoned_pages for p in self.partitions)
+
+    @property
+    def scopes(self) -> List[str]:
+        """City/purpose slices of the market covered by the partitions"""
+        return sorted({p.scope for p in self.partitions})
+
+    def next_requests(self, limit: int) -> List[CrawlRequest]:
+        """Plan up to `limit` requests, round-robin over active partitions"""
+        self._prune()
+        planned = []
+        idle_rounds = 0
+
+        while len(planned) < limit and self._active and idle_rounds < len(self._active):
+            partition = self._active[0]
+            self._active.rotate(-1)
+
+            if not self._has_work(partition):
+                idle_rounds += 1
+                continue
+
+            page = partition.retry_pages.pop(0) if partition.retry_pages else partition.next_page
+            if page == partition.next_page:
+                partition.next_page += 1
+            partition.in_flight.add(page)
+            planned.append(CrawlRequest(partition, page, self.page_size, partition.page_attempts.get(page, 0)))
+            idle_rounds = 0
+
+        return planned
+
+    def record(self, request: CrawlRequest, ads: List[Dict], new_count: int, known_count: int = 0):
+        """Record a page's results and decide whether to keep paging
+
+        known_count is the number of ads on the page seen by earlier runs.
+        """
+        partition = request.partition
+        partition.in_flight.discard(request.page)
+        partition.page_attempts.pop(request.page, None)
+        partition.requests += 1
+        partition.pages_fetched += 1
+        partition.new_ads += new_count
+        self.observed_page_size = max(self.observed_page_size, len(ads))
+
+        if new_count:
+            partition.stale_pages = 0
+        else:
+            partition.stale_pages += 1
+        if ads and known_count == len(ads):
+            partition.known_pages += 1
+        else:
+            partition.known_pages = 0
+
+        if partition.done:
+            return
+        partition.seen_prices.extend(ad['price'] for ad in ads if isinstance(ad.get('price'), (int, float)))
+
+        if not ads or len(ads) < min(request.limit, self.observed_page_size):
+            # Earlier pages that failed or were requeued are still fetched
+            partition.last_page = request.page
+            partition.covered = True
+            self._finish(partition, "last page reached")
+        elif partition.unpriced and any(ad.get('price') is not None for ad in ads):
+            # Sorted by price, so the unpriced listings end where priced ones start
+            partition.last_page = request.page
+            partition.covered = True
+            self._finish(partition, "reached priced listings")
+        elif (self.incremental and not partition.unpriced
+              and partition.known_pages >= Settings.CRAWL_MAX_KNOWN_PAGES):
+            self._finish(partition, f"{partition.known_pages} full pages of ads seen in earlier runs")
+        elif partition.stale_pages > max(Settings.CRAWL_MAX_STALE_PAGES, partition.stale_grace):
+            self._finish(partition, f"no new ads in {partition.stale_pages} pages")
+        elif partition.pages_fetched >= Settings.CRAWL_MAX_PARTITION_PAGES:
+            self._split(partition)
+
+    def release(self, request: CrawlRequest):
+        """Return an unfinished request so it is retried later"""
+        partition = request.partition
+        partition.in_flight.discard(request.page)
+        partition.requests += 1
+
+        if not self._wants_page(partition, request.page):
+            return
+
+        request.attempts += 1
+        if request.attempts >= Settings.CRAWL_MAX_PAGE_ATTEMPTS:
+            logger.warning(f"Giving up on page {request.page} of {partition.key}")
+            partition.page_attempts.pop(request.page, None)
+            partition.abandoned_pages += 1
+        else:
+            partition.page_attempts[request.page] = request.attempts
+            partition.retry_pages.append(request.page)
+
+    def requeue(self, request: CrawlRequest):
+        """Return a request that never reached the API, e.g. after a 403"""
+        partition = request.partition
+        partition.in_flight.discard(request.page)
+        if self._wants_page(partition, request.page):
+            partition.retry_pages.append(request.page)
+
+    def reject_page_size(self, request: CrawlRequest):
+        """Fall back to a smaller page size after the API refuses one"""
+        if request.limit == self.page_size and len(self._page_sizes) > 1:
+            self._page_sizes.pop(0)
+            logger.info(f"Page size {request.limit} rejected, using {self.page_size}")
+        self.requeue(request)
+
+    def yield_report(self) -> List[Dict]:
+        """Per-partition request and yield statistics"""
+        return [
+            {
+                'partition': p.key,
+                'requests': p.requests,
+                'new_ads': p.new_ads,
+                'yield_per_request': round(p.yield_per_request, 2),
+                'done': p.done
+            }
+            for p in self.partitions
+        ]
+
+    def to_state(self) -> Dict:
+        """Serializable snapshot of the crawl frontier"""
+        partitions = []
+        for p in self.partitions:
+            state = asdict(p)
+            # Pages in flight have no result yet, so they are fetched again on resume
+            pages = set(p.retry_pages) | p.in_flight
+            state['retry_pages'] = sorted(page for page in pages if self._wants_page(p, page))
+            del state['in_flight']
+            partitions.append(state)
+
+        return {
+            'page_sizes': self._page_sizes,
+            'observed_page_size': self.observed_page_size,
+            'partitions': partitions
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict, incremental: bool = False) -> 'CrawlPlanner':
+        """Restore a planner from to_state output"""
+        planner = cls.__new__(cls)
+        planner.incremental = incremental
+        planner.partitions = [Partition(**p) for p in state['partitions']]
+        for p in planner.partitions:
+            # JSON turns the page numbers into strings
+            p.page_attempts = {int(page): attempts for page, attempts in p.page_attempts.items()}
+        planner._active = deque(p for p in planner.partitions if not p.done or p.retry_pages)
+        planner._page_sizes = list(state['page_sizes'])
+        planner.observed_page_size = state['observed_page_size']
+        return planner
+
+    def _has_work(self, partition: Partition) -> bool:
+        if partition.retry_pages:
+            return True
+        if partition.done:
+            return False
+        return len(partition.in_flight) < Settings.CRAWL_PARTITION_LOOKAHEAD
+
+    @staticmethod
+    def _wants_page(partition: Partition, page: int) -> bool:
+        """Whether a page still needs fetching, e.g. one before the last page"""
+        return not partition.done or page < partition.last_page
+
+    def _prune(self):
+        """Forget finished partitions that have nothing in flight"""
+        self._active = deque(p for p in self._active if not p.done or p.in_flight or p.retry_pages)
+
+    def _finish(self, partition: Partition, reason: str):
+        partition.done = True
+        partition.seen_prices = []
+        partition.retry_pages = [page for page in partition.retry_pages if page < partition.last_page]
+        logger.info(f"Partition {partition.key} done: {reason} "
+                    f"({partition.new_ads} new ads in {partition.requests} requests)")
+
+    def _split(self, partition: Partition):
+        """Split a partition that is too deep into two narrower price bands"""
+        if partition.unpriced:
+            return
+        if partition.max_price is None:
+            # An open-ended band splits at twice its floor, leaving the upper half open
+            middle = max(2 * partition.min_price, 2 * Settings.CRAWL_MIN_PRICE_BAND)
+        elif partition.max_price - partition.min_price < 2 * Settings.CRAWL_MIN_PRICE_BAND:
+            return
+        else:
+            middle = (partition.min_price + partition.max_price) // 2
+        # Children first re-page the ads the parent already saw in their band, so allow that many stale pages
+        page_size = self.observed_page_size or self.page_size
+        children = []
+        for low, high in ((partition.min_price, middle), (middle, partition.max_price)):
+            seen = sum(1 for price in partition.seen_prices if low <= price and (high is None or price <= high))
+            children.append(Partition(city=partition.city, purpose=partition.purpose, min_price=low,
+                                      max_price=high, stale_grace=-(-seen // page_size)))
+
+        partition.covered = True
+        self._finish(partition, f"split at {middle:,} after {partition.pages_fetched} pages")
+        self.partitions.extend(children)
+        self._active.extend(children)
\ No newline at end of file
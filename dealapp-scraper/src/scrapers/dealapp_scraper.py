@@ -1,101 +1,350 @@
-import requests
+import threading
 import time
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from src.scrapers.base_scraper import BaseScraper
-from src.utils import TokenHarvester, PropertyParser, FileHandler
-from src.config import Settings, constants
-from src.models import Property
+from src.scrapers.crawl_planner import CrawlPlanner
+from src.utils import (PropertyParser, FileHandler, DeltaStreamWriter, RateLimiter, ApiClient,
+                       TokenPrefetcher, SeenIndex, CrawlCheckpoint, ResponseArchive, metrics)
+from src.utils.seen_index import UNCHANGED, GONE
+from src.config import Settings
+from src.models import Property, Token
 
 logger = logging.getLogger(__name__)
 
 class DealAppScraper(BaseScraper):
     """DealApp property scraper"""
 
-    def __init__(self):
+    def __init__(self, incremental: bool = None, planner: CrawlPlanner = None,
+                 checkpoint: CrawlCheckpoint = None, shard: str = None, output_dir: str = None,
+                 formats: List[str] = None):
         super().__init__()
         self.timestamp = datetime.now()
         self.base_url = Settings.BASE_URL
+        self.incremental = Settings.INCREMENTAL if incremental is None else incremental
+        self.client = ApiClient(self.base_url)
+        self.planner = planner or CrawlPlanner(incremental=self.incremental)
+        self.index = SeenIndex()
+        self.checkpoint = checkpoint or CrawlCheckpoint()
+        self.shard = shard
+        # Output goes to OUTPUT_DIR in OUTPUT_FORMATS unless these are given
+        self.output_dir = output_dir
+        self.formats = formats
+        self.writers = {}
+        self.delta = None
+        self.archive = None
+        self._last_checkpoint = time.monotonic()
 
     def scrape(self) -> int:
         """Main scraping method"""
-        logger.info("Starting DealApp Scraper")
+        logger.info(f"Starting DealApp Scraper ({'incremental' if self.incremental else 'full'} crawl, "
+                    f"{len(self.index)} ads indexed)")
+        offsets = self._resume()
+        self.writers = FileHandler.open_writers(self.timestamp, offsets, self.formats, self.output_dir)
+        if Settings.CDC_OUTPUT:
+            self.delta = DeltaStreamWriter(DeltaStreamWriter.path_for(self.timestamp, self.output_dir),
+                                           (offsets or {}).get('delta'))
+        if Settings.ARCHIVE_RESPONSES:
+            self.archive = ResponseArchive(ResponseArchive.path_for(self.timestamp, self.shard),
+                                           (offsets or {}).get('archive'))
+        if offsets:
+            self._reload_written()
 
-        token_count = 0
+        try:
+            self._run_sessions()
+        except BaseException:
+            self._save_checkpoint()
+            for writer in self.writers.values():
+                writer.close(publish=False)
+            if self.delta:
+                self.delta.close(publish=False)
+            if self.archive:
+                self.archive.close()
+            self._write_metrics('interrupted')
+            raise
+        finally:
+            self.client.close()
 
-        while len(self.properties) < Settings.TARGET_PROPERTIES and token_count < Settings.MAX_TOKENS:
-            token_count += 1
-            logger.info(f"\n=== Session {token_count} ===")
+        for stats in self.planner.yield_report():
+            logger.info(f"Partition {stats['partition']}: {stats['new_ads']} new ads "
+                        f"from {stats['requests']} requests ({stats['yield_per_request']}/request)")
 
-            # Harvest a new token
-            logger.info("Harvesting new token...")
-            token = TokenHarvester.harvest_single_token()
+        logger.info(f"\nTotal unique properties collected: {self.summary.total}")
+        self._save_results()
+        if self.delta:
+            self._save_delta()
+        if self.archive:
+            self.archive.close()
+        self.index.close()
+        self.checkpoint.clear()
+        self._write_metrics('completed')
 
-            if token:
-                logger.info(f"Token acquired: {token[:50]}...")
+        return self.summary.total
 
-                # Use the token to scrape
-                count = self._scrape_with_token(token, token_count)
-                logger.info(f"Session {token_count} collected {count} new properties")
-                logger.info(f"Total so far: {len(self.properties)} properties")
+    def _resume(self) -> Optional[Dict[str, int]]:
+        """Continue from the last checkpoint of an interrupted run
 
-                # Small delay before next token
-                time.sleep(Settings.TOKEN_DELAY)
-            else:
-                logger.error("Failed to harvest token, retrying...")
-                time.sleep(5)
+        Returns the checkpointed output file offsets, if any.
+        """
+        state = self.checkpoint.load()
+        if not state:
+            return None
 
-        logger.info(f"\nTotal unique properties collected: {len(self.properties)}")
-        self._save_results()
+        self.timestamp = datetime.fromisoformat(state['timestamp'])
+        self.planner = CrawlPlanner.from_state(state['planner'], incremental=self.incremental)
+        logger.info(f"Resuming run from {self.timestamp.isoformat()} "
+                    f"with {state['property_count']} properties")
+        return state['offsets']
+
+    def _reload_written(self):
+        """Rebuild dedup state, totals and non-resumable outputs from the JSON Lines output"""
+        rebuilt = [w for w in self.writers.values() if not w.resumable]
+
+        with open(self.writers['jsonl'].part_path, encoding='utf-8') as f:
+            for line in f:
+                prop = Property.from_dict(PropertyParser.decode_json(line))
+                self.seen_ids.add(prop.ad_id)
+                self.summary.add(prop)
+                if self.dedup is not None:
+                    self.dedup.add(prop.to_dict())
+                for writer in rebuilt:
+                    writer.write(prop)
+
+    def _write_metrics(self, status: str):
+        """Write the run's metrics report next to its log"""
+        metrics.write_report(
+            FileHandler.metrics_path(self.timestamp),
+            timestamp=self.timestamp.isoformat(),
+            status=status,
+            incremental=self.incremental,
+            properties=self.summary.total,
+            partitions=self.planner.yield_report()
+        )
+
+    def _maybe_checkpoint(self):
+        """Checkpoint if CHECKPOINT_INTERVAL has passed since the last one"""
+        if time.monotonic() - self._last_checkpoint >= Settings.CHECKPOINT_INTERVAL:
+            self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        """Persist the index, the crawl frontier and the output written so far"""
+        offsets = {extension: writer.flush() for extension, writer in self.writers.items()}
+        if self.delta:
+            offsets['delta'] = self.delta.flush()
+        if self.archive:
+            offsets['archive'] = self.archive.flush()
+        self.index.commit()
+        self.checkpoint.save(self._checkpoint_state(offsets))
+        self._last_checkpoint = time.monotonic()
+
+    def _checkpoint_state(self, offsets: Dict[str, int]) -> Dict:
+        """State saved in the checkpoint for `_resume`"""
+        return {
+            'timestamp': self.timestamp.isoformat(),
+            'property_count': self.summary.total,
+            'offsets': offsets,
+            'planner': self.planner.to_state()
+        }
+
+    def _run_sessions(self):
+        """Scrape with prefetched tokens until the target is reached"""
+        session_num = 0
 
-        return len(self.properties)
+        with TokenPrefetcher() as prefetcher:
+            while not self._target_reached() and not self.planner.done:
+                with metrics.timer('token_wait_seconds'):
+                    token = prefetcher.get()
+                if token is None:
+                    logger.warning("No more tokens available")
+                    break
+
+                session_num += 1
+                logger.info(f"\n=== Session {session_num} ===")
+                logger.info(f"Using token: {token.value[:50]}... (expires in {token.ttl:.0f}s)")
+
+                count = self._scrape_with_token(token, session_num)
+                prefetcher.release(token)
+                metrics.observe('token_requests_served', token.requests_served)
+                metrics.observe('token_lifetime_seconds', token.age)
+                logger.info(f"Session {session_num} collected {count} new properties")
+                logger.info(f"Token served {token.requests_served} requests over {token.age:.0f}s")
+                logger.info(f"Total so far: {self.summary.total} properties")
+
+    def _target_reached(self) -> bool:
+        """Whether enough properties have been collected"""
+        return self.summary.total >= Settings.TARGET_PROPERTIES
+
+    def _scrape_with_token(self, token: Token, session_num: int) -> int:
+        """Scrape planned pages with a specific token, fetching requests concurrently"""
+        headers = {'Authorization': f'Bearer {token.value}'}
+        token_id = ResponseArchive.token_id(token.value)
 
-    def _scrape_with_token(self, token: str, session_num: int) -> int:
-        """Scrape using a specific token"""
-        headers = constants.DEFAULT_HEADERS.copy()
-        headers['Authorization'] = f'Bearer {token}'
+        limiter = RateLimiter(Settings.TOKEN_RATE_LIMIT)
+        exhausted = threading.Event()
+
+        def fetch(params):
+            if exhausted.is_set() or not token.is_usable():
+                return None
+            return self.client.get(Settings.API_ENDPOINT, params=params, headers=headers, limiter=limiter)
 
         properties_count = 0
+        stats_before = self.client.connection_stats()
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=Settings.SCRAPE_CONCURRENCY) as executor:
+            while True:
+                if not exhausted.is_set() and not self._target_reached():
+                    for request in self.planner.next_requests(Settings.SCRAPE_CONCURRENCY - len(in_flight)):
+                        in_flight[executor.submit(fetch, request.params)] = request
 
-        for i, params in enumerate(constants.PARAM_COMBINATIONS):
-            try:
-                response = requests.get(
-                    f"{self.base_url}{Settings.API_ENDPOINT}", 
-                    params=params, 
-                    headers=headers
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    ads = data.get('data', [])
-
-                    new_count = 0
-                    for ad in ads:
-                        if ad['_id'] not in self.seen_ids:
-                            self.seen_ids.add(ad['_id'])
-                            property_obj = PropertyParser.parse_property(ad)
-                            if property_obj:
-                                self.properties.append(property_obj)
-                                properties_count += 1
-                                new_count += 1
-
-                    logger.info(f"Session {session_num}, Request {i+1}: Found {new_count} new properties")
-                    time.sleep(Settings.REQUEST_DELAY)
-
-                elif response.status_code == 403:
-                    logger.warning(f"Session {session_num}: Token exhausted")
+                if not in_flight:
                     break
 
-            except Exception as e:
-                logger.error(f"Request error: {e}")
+                # Responses are handled on this thread only, so seen_ids needs no locking
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    request = in_flight.pop(future)
+                    try:
+                        response = future.result()
+                        if response is None:
+                            self.planner.requeue(request)
+                            continue
+                        token.requests_served += 1
+                        if self.archive:
+                            self.archive.write(request.params, response.status_code, response.content,
+                                               token_id, datetime.now())
+
+                        if response.status_code == 200:
+                            with metrics.timer('json_decode_seconds'):
+                                ads = PropertyParser.decode_json(response.content).get('data', [])
+                            new_count, known_count = self._collect_ads(ads)
+                            self.planner.record(request, ads, new_count, known_count)
+                            metrics.inc('partition_ads_total', new_count, partition=request.partition.key, kind='new')
+                            metrics.inc('partition_ads_total', len(ads) - new_count,
+                                        partition=request.partition.key, kind='duplicate')
+                            properties_count += new_count
+                            logger.info(f"Session {session_num}, {request.partition.key} page {request.page}: "
+                                        f"Found {new_count} new properties")
+
+                        elif response.status_code == 403:
+                            token.forbidden += 1
+                            self.planner.requeue(request)
+                            if not exhausted.is_set():
+                                metrics.inc('token_exhausted_total')
+                                logger.warning(f"Session {session_num}: Token exhausted")
+                                token.exhausted = True
+                                exhausted.set()
+
+                        elif response.status_code == 401:
+                            # The API no longer accepts the token, e.g. a cached one that was revoked,
+                            # so retire it from the store and retry the page under the next token
+                            self.planner.requeue(request)
+                            if not exhausted.is_set():
+                                metrics.inc('token_rejected_total')
+                                logger.warning(f"Session {session_num}: Token rejected")
+                                token.exhausted = True
+                                exhausted.set()
+
+                        elif response.status_code in (400, 422):
+                            self.planner.reject_page_size(request)
+
+                        else:
+                            logger.warning(f"Unexpected status {response.status_code} for {request.params}")
+                            self.planner.release(request)
+
+                    except Exception as e:
+                        logger.error(f"Request error: {e}")
+                        self.planner.release(request)
+
+                self._maybe_checkpoint()
+
+        stats = self.client.connection_stats()
+        opened = stats['opened'] - stats_before['opened']
+        reused = stats['reused'] - stats_before['reused']
+        logger.info(f"Session {session_num}: {opened} connections opened, {reused} reused")
 
         return properties_count
 
+    def _collect_ads(self, ads: List[dict]) -> Tuple[int, int]:
+        """Parse unseen ads and stream them to the output files
+
+        Returns the number of new properties and of ads seen by earlier runs.
+        """
+        run_started = self.timestamp.isoformat(timespec='microseconds')
+        indexed, changes = self._index_ads(ads)
+        known_count = sum(1 for last_seen, _ in indexed.values() if last_seen < run_started)
+
+        unseen = []
+        for ad in ads:
+            if ad['_id'] not in self.seen_ids:
+                self.seen_ids.add(ad['_id'])
+                unseen.append(ad)
+
+        with metrics.timer('parse_seconds'):
+            properties = PropertyParser.parse_batch(unseen)
+        metrics.inc('properties_parsed_total', len(properties))
+        metrics.inc('parse_errors_total', len(unseen) - len(properties))
+
+        for extension, writer in self.writers.items():
+            with metrics.timer('output_write_seconds', format=extension):
+                for property_obj in properties:
+                    writer.write(property_obj)
+        for property_obj in properties:
+            self.summary.add(property_obj)
+        if self.dedup is not None:
+            with metrics.timer('dedup_seconds'):
+                duplicates = self.dedup.add_all(p.to_dict() for p in properties)
+            metrics.inc('near_duplicates_total', duplicates)
+
+        if self.delta:
+            counts = Counter(changes[p.ad_id] for p in properties)
+            for property_obj in properties:
+                if changes[property_obj.ad_id] != UNCHANGED:
+                    self.delta.write_change(changes[property_obj.ad_id], property_obj)
+            for change, count in counts.items():
+                metrics.inc('delta_rows_total', count, change=change)
+
+        return len(properties), known_count
+
+    def _index_ads(self, ads: List[dict]) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, str]]:
+        """Record ads in the seen index
+
+        Returns the index entries they had before and, with a delta, their changes.
+        """
+        indexed = self.index.lookup([ad['_id'] for ad in ads])
+        hashes = [(ad['_id'], SeenIndex.content_hash(ad)) for ad in ads]
+        changes = self.index.classify(hashes, self.timestamp) if self.delta else {}
+        self.index.upsert(((ad_id, content_hash, SeenIndex.scope(ad))
+                           for (ad_id, content_hash), ad in zip(hashes, ads)), self.timestamp)
+        return indexed, changes
+
+    def _save_delta(self):
+        """Add listings that disappeared to the delta and publish it"""
+        # Shards only see part of the market, so the coordinator finds gone listings
+        if self.shard is None and self.planner.complete:
+            gone = self.index.mark_gone(self.planner.scopes, self.timestamp)
+            for ad_id in gone:
+                self.delta.write_change(GONE, ad_id=ad_id)
+            metrics.inc('delta_rows_total', len(gone), change=GONE)
+        elif self.shard is None:
+            logger.info("Crawl did not cover every listing, so no listings are reported gone")
+
+        self.delta.close()
+        logger.info(f"Delta of {self.delta.count} changed listings saved to {self.delta.path}")
+
     def _save_results(self):
-        """Save results to files"""
-        FileHandler.save_to_csv(self.properties, self.timestamp)
-        FileHandler.save_to_json(self.properties, self.timestamp)
+        """Publish the streamed output files"""
+        if self.summary.total:
+            for writer in self.writers.values():
+                writer.close()
+            self._save_duplicates(self.timestamp)
+        else:
+            logger.warning("No properties to save")
+            for writer in self.writers.values():
+                writer.discard()
 
         # Log summary
         self._log_summary()
@@ -103,13 +352,11 @@ class DealAppScraper(BaseScraper):
     def _log_summary(self):
         """Log scraping summary"""
         logger.info(f"\nSummary:")
-        logger.info(f"- Total properties: {len(self.properties)}")
+        logger.info(f"- Total properties: {self.summary.total}")
 
-        if self.properties:
-            districts = set(p.district for p in self.properties if p.district)
-            logger.info(f"- Unique districts: {len(districts)}")
+        if self.summary.total:
+            logger.info(f"- Unique districts: {len(self.summary.districts)}")
 
-            prices = [p.price_numeric for p in self.properties if p.price_numeric > 0]
-            if prices:
-                logger.info(f"- Price range: {min(prices):,.0f} - {max(prices):,.0f} SAR")
-                logger.info(f"- Average price: {sum(prices)/len(prices):,.0f} SAR")
\ No newline at end of file
+            if self.summary.priced:
+                logger.info(f"- Price range: {self.summary.price_min:,.0f} - {self.summary.price_max:,.0f} SAR")
+                logger.info(f"- Average price: {self.summary.average_price:,.0f} SAR")
\ No newline at end of file
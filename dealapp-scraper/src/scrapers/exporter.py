@@ -0,0 +1,30 @@
+import logging
+from datetime import datetime
+from typing import List
+from src.scrapers.base_scraper import BaseScraper
+from src.utils import FileHandler
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+class OutputExporter(BaseScraper):
+    """Converts existing JSON Lines output into other formats without crawling"""
+
+    def __init__(self, paths: List[str], formats: List[str] = None):
+        super().__init__()
+        self.timestamp = datetime.now()
+        self.inputs = FileHandler.find_outputs(paths, ('jsonl',))
+        self.formats = formats or Settings.OUTPUT_FORMATS
+        self.duplicates = 0
+
+    def scrape(self) -> int:
+        """Merge the inputs into one run's files in the requested formats"""
+        logger.info(f"Exporting {len(self.inputs)} files to {', '.join(self.formats)}")
+        self._save_results()
+        return self.summary.total
+
+    def _save_results(self):
+        """Write the inputs' unique properties to the export files"""
+        self.duplicates = self._merge_outputs(self.inputs, self.timestamp, self.formats)
+        logger.info(f"Exported {self.summary.total} unique properties from {len(self.inputs)} files "
+                    f"({self.duplicates} duplicates dropped)")
\ No newline at end of file
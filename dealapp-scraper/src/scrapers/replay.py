@@ -0,0 +1,87 @@
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+from src.scrapers.base_scraper import BaseScraper
+from src.utils import PropertyParser, FileHandler, ResponseArchive, metrics
+from src.utils.file_handler import JsonLinesStreamWriter
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+def _replay_archive(path: str, output_dir: str) -> Dict:
+    """Parse one archive into a JSON Lines file in a worker process"""
+    name = os.path.basename(path).split('.')[0]
+    writer = JsonLinesStreamWriter(os.path.join(output_dir, f"{name}.jsonl"))
+    seen = set()
+    responses = 0
+
+    for record in ResponseArchive.read(path):
+        responses += 1
+        if record.get('status') != 200 or not record.get('response'):
+            continue
+
+        ads = [ad for ad in record['response'].get('data', []) if ad.get('_id') not in seen]
+        seen.update(ad.get('_id') for ad in ads)
+        # Properties keep the time they were originally fetched
+        for prop in PropertyParser.parse_batch(ads, datetime.fromisoformat(record['fetched_at'])):
+            writer.write(prop)
+
+    return {
+        'archive': path,
+        'responses': responses,
+        'properties': writer.count,
+        'output': writer.close(publish=True)
+    }
+
+class ArchiveReplayer(BaseScraper):
+    """Re-parses archived API responses into output files without network access"""
+
+    def __init__(self, paths: List[str], workers: int = None):
+        super().__init__()
+        self.timestamp = datetime.now()
+        self.archives = ResponseArchive.find(paths)
+        self.workers = workers or os.cpu_count() or 1
+        self.duplicates = 0
+
+    def scrape(self) -> int:
+        """Replay all archives in parallel and merge their properties"""
+        logger.info(f"Replaying {len(self.archives)} archives with {self.workers} workers")
+        work_dir = tempfile.mkdtemp(prefix='replay_', dir=Settings.OUTPUT_DIR)
+
+        try:
+            with metrics.timer('replay_parse_seconds'):
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    # map keeps archive order, so the earliest copy of an ad wins the merge
+                    results = list(executor.map(_replay_archive, self.archives,
+                                                [work_dir] * len(self.archives)))
+
+            for result in results:
+                logger.info(f"{result['archive']}: {result['properties']} properties "
+                            f"from {result['responses']} responses")
+                metrics.inc('replay_responses_total', result['responses'])
+
+            with metrics.timer('merge_seconds'):
+                self._save_results(results)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        metrics.write_report(
+            FileHandler.metrics_path(self.timestamp),
+            timestamp=self.timestamp.isoformat(),
+            status='completed',
+            mode='replay',
+            archives=len(self.archives),
+            properties=self.summary.total,
+            duplicates=self.duplicates
+        )
+        return self.summary.total
+
+    def _save_results(self, results: List[Dict] = None):
+        """Merge the replayed archives into the run's files"""
+        self.duplicates = self._merge_outputs([r['output'] for r in results or []], self.timestamp)
+        logger.info(f"Replayed {self.summary.total} unique properties from {len(results or [])} archives "
+                    f"({self.duplicates} duplicates dropped)")
\ No newline at end of file
@@ -1,5 +1,35 @@
-from .token_harvester import TokenHarvester
-from .property_parser import PropertyParser
-from .file_handler import FileHandler
+import importlib
+# Eager, since importing the submodule would otherwise shadow the registry; it is light
+from .metrics import Metrics, metrics
 
-__all__ = ['TokenHarvester', 'PropertyParser', 'FileHandler']
\ No newline at end of file
+# Submodules are imported on first access, so commands that never crawl
+# don't pay for requests or the browser tooling
+_EXPORTS = {
+    'TokenHarvester': 'token_harvester',
+    'PropertyParser': 'property_parser',
+    'FileHandler': 'file_handler',
+    'DeltaStreamWriter': 'file_handler',
+    'RateLimiter': 'rate_limiter',
+    'ApiClient': 'http_client',
+    'TokenStore': 'token_store',
+    'TokenPrefetcher': 'token_prefetcher',
+    'SeenIndex': 'seen_index',
+    'CrawlCheckpoint': 'checkpoint',
+    'ResponseArchive': 'response_archive',
+    'ManualUploadNormalizer': 'manual_normalizer',
+    'DuplicateDetector': 'dedup'
+}
+
+__all__ = ['TokenHarvester', 'PropertyParser', 'FileHandler', 'DeltaStreamWriter', 'RateLimiter', 'ApiClient', 'TokenStore',
+           'TokenPrefetcher', 'SeenIndex', 'CrawlCheckpoint', 'Metrics', 'metrics',
+           'ResponseArchive', 'ManualUploadNormalizer', 'DuplicateDetector']
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,41 @@
+import json
+import logging
+import os
+from typing import Dict, Optional
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+class CrawlCheckpoint:
+    """Periodic on-disk snapshot of the crawl frontier and output progress"""
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or Settings.STATE_DIR
+        os.makedirs(self.directory, exist_ok=True)
+        self.state_path = os.path.join(self.directory, 'checkpoint.json')
+
+    def load(self) -> Optional[Dict]:
+        """Load the last checkpointed state, if any"""
+        if not os.path.exists(self.state_path):
+            return None
+
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint: {e}")
+            return None
+
+    def save(self, state: Dict):
+        """Atomically replace the state file"""
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    def clear(self):
+        """Remove the checkpoint after a completed run"""
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
\ No newline at end of file
@@ -0,0 +1,309 @@
+import csv
+import json
+import logging
+import math
+import os
+import re
+import struct
+import zlib
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_FIELDNAMES = ['ad_id', 'source', 'canonical_id', 'canonical_source']
+TEXT_COLUMNS = ('ad_id', 'source', 'listing_type', 'district', 'title')
+NUMERIC_COLUMNS = ('lat', 'lng', 'area_numeric', 'price_numeric', 'bedrooms')
+RECORD_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
+
+METERS_PER_DEGREE = math.pi * 6371008.8 / 180
+# Longitude cells are twice as wide in degrees, so up to 60 degrees latitude
+# the 3x3 cells around a listing cover DEDUP_MAX_METERS in every direction
+LNG_CELL_WIDENING = 2.0
+
+# 8 bands of 2 MinHash bins pair titles from about 35% trigram overlap
+MINHASH_BANDS = 8
+MINHASH_ROWS = 2
+MINHASH_BINS = MINHASH_BANDS * MINHASH_ROWS
+EMPTY_BIN = 0xFFFFFFFF
+_BIN_BYTES = 4
+
+_DIACRITICS = re.compile('[\u064b-\u065f\u0670\u0640]')  # harakat and tatweel
+_NON_WORD = re.compile(r'\W+')
+_LETTERS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ى': 'ي', 'ة': 'ه',
+    **{chr(0x660 + i): str(i) for i in range(10)}
+})
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lower-case text with Arabic letter variants, diacritics and punctuation folded"""
+    if not text:
+        return ''
+    text = _DIACRITICS.sub('', text).translate(_LETTERS).lower()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+def minhash(text: str) -> Optional[bytes]:
+    """One-permutation MinHash of a normalized text's character trigrams
+
+    Each trigram's hash picks one of MINHASH_BINS bins with its top bits and
+    competes for that bin's minimum with the rest. Empty bins are EMPTY_BIN.
+    """
+    if not text:
+        return None
+    bins = [EMPTY_BIN] * MINHASH_BINS
+    for i in range(max(len(text) - 2, 1)):
+        # Multiplying by an odd constant spreads crc32's bits into the top four
+        h = zlib.crc32(text[i:i + 3].encode('utf-8')) * 0x9E3779B1 & 0xFFFFFFFF
+        value = h & 0x0FFFFFFF
+        if value < bins[h >> 28]:
+            bins[h >> 28] = value
+    return struct.pack(f"<{MINHASH_BINS}I", *bins)
+
+def title_similarity(a: bytes, b: bytes) -> float:
+    """Estimated trigram Jaccard similarity of two MinHash signatures"""
+    same = filled = 0
+    for x, y in zip(struct.unpack(f"<{MINHASH_BINS}I", a), struct.unpack(f"<{MINHASH_BINS}I", b)):
+        if x != EMPTY_BIN or y != EMPTY_BIN:
+            filled += 1
+            same += x == y
+    return same / filled if filled else 0.0
+
+class _Listing:
+    """Fields of a listing that blocking and matching look at"""
+
+    __slots__ = ('listing_type', 'district', 'lat', 'lng', 'area', 'price', 'bedrooms', 'signature')
+
+    def __init__(self, record: Dict):
+        self.listing_type = record.get('listing_type') or None
+        self.district = normalize_text(record.get('district')) or None
+        self.lat, self.lng = _coordinates(record.get('lat'), record.get('lng'))
+        self.area = _positive(record.get('area_numeric'))
+        self.price = _positive(record.get('price_numeric'))
+        self.bedrooms = _positive(record.get('bedrooms'))
+        self.signature = minhash(normalize_text(record.get('title')))
+
+class DuplicateDetector:
+    """Clusters likely duplicate listings across ads and sources in near-linear time
+
+    Each listing is only compared with the recent listings sharing a block:
+    its grid cell and the eight around it, its district and rounded area, or
+    a MinHash band of its title when it has no location. Blocks keep at most
+    DEDUP_MAX_BLOCK listings. Matches are joined in a disjoint set whose root
+    is the earliest listing, which becomes the cluster's canonical id.
+    """
+
+    def __init__(self):
+        self.lat_step = Settings.DEDUP_MAX_METERS / METERS_PER_DEGREE
+        self.lng_step = self.lat_step * LNG_CELL_WIDENING
+        self.duplicates = 0
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._listings: List[_Listing] = []
+        self._parent: List[int] = []
+        self._blocks: Dict[tuple, deque] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, record: Dict) -> Tuple[str, str]:
+        """Add a listing and return the (source, ad_id) of its cluster's canonical listing
+
+        Adding a listing that is already known only looks up its cluster.
+        """
+        key = (record.get('source') or '', str(record['ad_id']))
+        index = self._ids.get(key)
+        if index is not None:
+            return self._keys[self._find(index)]
+
+        index = len(self._keys)
+        listing = _Listing(record)
+        self._ids[key] = index
+        self._keys.append(key)
+        self._listings.append(listing)
+        self._parent.append(index)
+
+        candidates = set()
+        for block in self._lookup_blocks(listing):
+            candidates.update(self._blocks.get(block, ()))
+        root = index
+        for other in sorted(candidates):
+            if self._find(other) != root and self._matches(listing, self._listings[other]):
+                if root == index:
+                    self.duplicates += 1
+                self._union(index, other)
+                root = self._find(index)
+
+        for block in self._own_blocks(listing):
+            members = self._blocks.get(block)
+            if members is None:
+                members = self._blocks[block] = deque(maxlen=Settings.DEDUP_MAX_BLOCK)
+            members.append(index)
+
+        return self._keys[self._find(index)]
+
+    def add_all(self, records: Iterable[Dict]) -> int:
+        """Add listings and return how many joined an earlier listing's cluster"""
+        before = self.duplicates
+        for record in records:
+            self.add(record)
+        return self.duplicates - before
+
+    def canonical(self, source: str, ad_id: str) -> Optional[Tuple[str, str]]:
+        """(source, ad_id) of a known listing's canonical listing"""
+        index = self._ids.get((source or '', str(ad_id)))
+        return None if index is None else self._keys[self._find(index)]
+
+    def clusters(self) -> Dict[int, List[int]]:
+        """Listings of every cluster with more than one member, by canonical listing"""
+        members: Dict[int, List[int]] = {}
+        for index in range(len(self._keys)):
+            root = self._find(index)
+            if root != index:
+                members.setdefault(root, [root]).append(index)
+        return members
+
+    def save(self, path: str) -> Tuple[str, int]:
+        """Write every clustered listing with its canonical listing as CSV
+
+        Returns the path and the number of clusters.
+        """
+        clusters = self.clusters()
+        part_path = f"{path}.part"
+        with open(part_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(DUPLICATE_FIELDNAMES)
+            for root, members in clusters.items():
+                canonical_source, canonical_id = self._keys[root]
+                for index in members:
+                    source, ad_id = self._keys[index]
+                    writer.writerow([ad_id, source, canonical_id, canonical_source])
+        os.replace(part_path, path)
+        return path, len(clusters)
+
+    @staticmethod
+    def read_records(path: str) -> Iterator[Dict]:
+        """Listings of a CSV, JSON Lines, JSON or Parquet output file, with the fields dedup needs"""
+        # pyarrow is only needed when clustering historical output
+        import pyarrow as pa
+
+        schema = pa.schema([(name, pa.string()) for name in TEXT_COLUMNS] +
+                           [(name, pa.float64()) for name in NUMERIC_COLUMNS])
+        if path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            # Manual uploads have no title, so only read the columns a file has
+            names = set(pq.read_schema(path).names)
+            table = pq.read_table(path, columns=[name for name in RECORD_COLUMNS if name in names])
+        elif path.endswith('.csv'):
+            import pyarrow.csv as pa_csv
+            table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+                include_columns=list(RECORD_COLUMNS),
+                include_missing_columns=True,
+                column_types=schema,
+                strings_can_be_null=True
+            ))
+        elif path.endswith('.jsonl'):
+            import pyarrow.json as pa_json
+            table = pa_json.read_json(path, parse_options=pa_json.ParseOptions(
+                explicit_schema=schema,
+                unexpected_field_behavior='ignore'
+            ))
+        elif path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                table = pa.Table.from_pylist(json.load(f)['properties'], schema=schema)
+        else:
+            raise ValueError(f"Unsupported output file: {path}")
+
+        logger.info(f"Loaded {table.num_rows} properties from {path}")
+        for batch in table.to_batches():
+            yield from batch.to_pylist()
+
+    def _lookup_blocks(self, listing: _Listing) -> Iterator[tuple]:
+        if listing.lat is not None:
+            row, column = self._cell(listing)
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    yield ('cell', listing.listing_type, row + dy, column + dx)
+        yield from self._attribute_blocks(listing)
+
+    def _own_blocks(self, listing: _Listing) -> Iterator[tuple]:
+        if listing.lat is not None:
+            yield ('cell', listing.listing_type) + self._cell(listing)
+        yield from self._attribute_blocks(listing)
+
+    @staticmethod
+    def _attribute_blocks(listing: _Listing) -> Iterator[tuple]:
+        if listing.district and listing.area:
+            yield ('district', listing.listing_type, listing.district, round(listing.area))
+        # Listings with a location are found through their cell, so only the others are blocked by title
+        if listing.signature and listing.lat is None:
+            width = MINHASH_ROWS * _BIN_BYTES
+            for band in range(MINHASH_BANDS):
+                rows = listing.signature[band * width:(band + 1) * width]
+                # Bands with empty bins would pair every short title
+                if struct.pack('<I', EMPTY_BIN) not in rows:
+                    yield ('title', listing.listing_type, band, rows)
+
+    def _cell(self, listing: _Listing) -> Tuple[int, int]:
+        return math.floor(listing.lat / self.lat_step), math.floor(listing.lng / self.lng_step)
+
+    @staticmethod
+    def _matches(a: _Listing, b: _Listing) -> bool:
+        """Whether two listings in a shared block describe the same property"""
+        if a.listing_type != b.listing_type:
+            return False
+        if a.bedrooms and b.bedrooms and a.bedrooms != b.bedrooms:
+            return False
+
+        # At least one of area and price must be known on both sides and agree
+        compared = False
+        for x, y, tolerance in ((a.area, b.area, Settings.DEDUP_AREA_TOLERANCE),
+                                (a.price, b.price, Settings.DEDUP_PRICE_TOLERANCE)):
+            if x and y:
+                if abs(x - y) > tolerance * max(x, y):
+                    return False
+                compared = True
+        if not compared:
+            return False
+
+        if a.lat is not None and b.lat is not None:
+            dy = (a.lat - b.lat) * METERS_PER_DEGREE
+            dx = (a.lng - b.lng) * METERS_PER_DEGREE * math.cos(math.radians(a.lat))
+            return dx * dx + dy * dy <= Settings.DEDUP_MAX_METERS ** 2
+        # Without both locations, listings in different districts never match
+        if a.district and b.district and a.district != b.district:
+            return False
+        if a.signature and b.signature:
+            return title_similarity(a.signature, b.signature) >= Settings.DEDUP_TITLE_SIMILARITY
+        # Without titles either, only the same district and area count
+        return a.district is not None and a.district == b.district and bool(a.area and b.area)
+
+    def _find(self, index: int) -> int:
+        parent = self._parent
+        while parent[index] != index:
+            # Path halving keeps the trees shallow
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, a: int, b: int):
+        a, b = self._find(a), self._find(b)
+        if a != b:
+            # The earliest listing stays the root
+            self._parent[max(a, b)] = min(a, b)
+
+def _positive(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 and not math.isnan(value) else None
+
+def _coordinates(lat, lng) -> Tuple[Optional[float], Optional[float]]:
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None, None
+    if math.isnan(lat) or math.isnan(lng) or not (-90 <= lat <= 90 and -180 <= lng <= 180) or lat == lng == 0:
+        return None, None
+    return lat, lng
\ No newline at end of file
@@ -2,16 +2,235 @@ import csv
 import json
 import os
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 import logging
 from src.config import Settings
 from src.models import Property
+from src.models.property import FIELDNAMES
 
 logger = logging.getLogger(__name__)
 
+ANALYTICS_SUFFIX = '_analytics.csv'
+DELTA_SUFFIX = '_delta.csv'
+REJECTS_SUFFIX = '_rejects.csv'
+DUPLICATES_SUFFIX = '_duplicates.csv'
+# Reports written next to the output files, which are not property outputs themselves
+REPORT_SUFFIXES = (ANALYTICS_SUFFIX, DELTA_SUFFIX, REJECTS_SUFFIX, DUPLICATES_SUFFIX)
+OUTPUT_EXTENSIONS = ('csv', 'jsonl', 'json', 'parquet')
+DELTA_FIELDNAMES = ['change_type'] + FIELDNAMES
+
+class StreamingWriter:
+    """Appends records to a .part file and publishes it atomically on close"""
+
+    extension = None
+    # Resumable writers can be truncated back to a checkpointed offset
+    resumable = True
+
+    def __init__(self, path: str, resume_offset: Optional[int] = None):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.count = 0
+
+        resuming = resume_offset is not None and os.path.exists(self.part_path)
+        if resuming:
+            # Drop anything written after the last checkpoint
+            with open(self.part_path, 'r+b') as f:
+                f.truncate(resume_offset)
+
+        self._file = self._open('a' if resuming else 'w')
+        if not resuming:
+            self._write_header()
+
+    @classmethod
+    def path_for(cls, timestamp: datetime, output_dir: str = None) -> str:
+        """Path of a run's output file"""
+        return FileHandler.output_path(timestamp, cls.extension, output_dir)
+
+    def write(self, prop: Property):
+        """Append a single property"""
+        self._write_record(prop.to_dict())
+        self.count += 1
+        if self.count % Settings.OUTPUT_FLUSH_EVERY == 0:
+            self._file.flush()
+
+    def flush(self) -> int:
+        """Flush to disk and return the durable size of the part file"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return os.fstat(self._file.fileno()).st_size
+
+    def close(self, publish: bool = True) -> Optional[str]:
+        """Close the part file and rename it into place"""
+        self.flush()
+        self._file.close()
+        if not publish:
+            return None
+
+        os.replace(self.part_path, self.path)
+        logger.info(f"Results saved to {self.path}")
+        return self.path
+
+    def discard(self):
+        """Close and delete the part file"""
+        self._file.close()
+        os.remove(self.part_path)
+
+    def _open(self, mode: str):
+        raise NotImplementedError
+
+    def _write_header(self):
+        pass
+
+    def _write_record(self, record: Dict):
+        raise NotImplementedError
+
+class CsvStreamWriter(StreamingWriter):
+    """Streams properties as CSV rows"""
+
+    extension = 'csv'
+    fieldnames = FIELDNAMES
+
+    def _open(self, mode: str):
+        f = open(self.part_path, mode, encoding='utf-8-sig', newline='')
+        self._writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction='ignore')
+        return f
+
+    def _write_header(self):
+        self._writer.writeheader()
+
+    def _write_record(self, record: Dict):
+        self._writer.writerow(record)
+
+class DeltaStreamWriter(CsvStreamWriter):
+    """Streams a run's changes as CSV rows tagged new, changed or gone
+
+    Gone rows only carry the ad_id; unchanged listings are left out, so the
+    file grows with churn rather than with the market.
+    """
+
+    fieldnames = DELTA_FIELDNAMES
+
+    @classmethod
+    def path_for(cls, timestamp: datetime, output_dir: str = None) -> str:
+        return FileHandler.delta_path(timestamp, output_dir)
+
+    def write_change(self, change_type: str, prop: Property = None, ad_id: str = None):
+        """Append a new or changed property, or the id of a listing that is gone"""
+        record = prop.to_dict() if prop else {'ad_id': ad_id}
+        record['change_type'] = change_type
+        self.write_row(record)
+
+    def write_row(self, record: Dict):
+        """Append a delta row, e.g. one read back from another delta file"""
+        self._write_record(record)
+        self.count += 1
+
+class JsonLinesStreamWriter(StreamingWriter):
+    """Streams properties as JSON Lines"""
+
+    extension = 'jsonl'
+
+    def _open(self, mode: str):
+        return open(self.part_path, mode, encoding='utf-8')
+
+    def _write_record(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+
 class FileHandler:
     """Handles file operations"""
 
+    STREAM_WRITERS = {
+        'csv': CsvStreamWriter,
+        'jsonl': JsonLinesStreamWriter
+    }
+
+    @staticmethod
+    def writer_class(extension: str) -> type:
+        """Streaming writer for an output format"""
+        if extension == 'parquet':
+            # pyarrow is only imported when Parquet output is requested
+            from src.utils.parquet_writer import ParquetStreamWriter
+            return ParquetStreamWriter
+        return FileHandler.STREAM_WRITERS[extension]
+
+    @staticmethod
+    def output_path(timestamp: datetime, extension: str, output_dir: str = None) -> str:
+        """Path of a run's output file, in OUTPUT_DIR unless another directory is given"""
+        return os.path.join(
+            output_dir or Settings.OUTPUT_DIR,
+            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}.{extension}"
+        )
+
+    @staticmethod
+    def analytics_path(timestamp: datetime) -> str:
+        """Path of the gold analytics computed from a run's output"""
+        return os.path.join(
+            Settings.OUTPUT_DIR,
+            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}{ANALYTICS_SUFFIX}"
+        )
+
+    @staticmethod
+    def delta_path(timestamp: datetime, output_dir: str = None) -> str:
+        """Path of a run's change-data-capture output"""
+        return os.path.join(
+            output_dir or Settings.OUTPUT_DIR,
+            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}{DELTA_SUFFIX}"
+        )
+
+    @staticmethod
+    def duplicates_path(timestamp: datetime) -> str:
+        """Path of the near-duplicate clusters found in a run's output"""
+        return os.path.join(
+            Settings.OUTPUT_DIR,
+            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}{DUPLICATES_SUFFIX}"
+        )
+
+    @staticmethod
+    def find_outputs(paths: List[str], extensions=OUTPUT_EXTENSIONS) -> List[str]:
+        """Output files under the given files or directories, skipping report files"""
+        suffixes = tuple(f".{ext}" for ext in extensions)
+        found = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    found.extend(os.path.join(root, name) for name in files
+                                 if name.endswith(suffixes) and not name.endswith(REPORT_SUFFIXES))
+            else:
+                found.append(path)
+        return sorted(found)
+
+    @staticmethod
+    def metrics_path(timestamp: datetime) -> str:
+        """Path of a run's metrics report, kept with the logs"""
+        return os.path.join(
+            Settings.LOG_DIR,
+            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}_metrics.json"
+        )
+
+    @staticmethod
+    def open_writers(timestamp: datetime, offsets: Dict[str, int] = None, formats: List[str] = None,
+                     output_dir: str = None) -> Dict[str, StreamingWriter]:
+        """Open streaming writers for a run, resuming at checkpointed offsets
+
+        Without explicit formats, JSON Lines output is always written along
+        with OUTPUT_FORMATS, since resuming a run rebuilds its state from it.
+        """
+        offsets = offsets or {}
+        os.makedirs(output_dir or Settings.OUTPUT_DIR, exist_ok=True)
+        if formats:
+            extensions = list(dict.fromkeys(formats))
+        else:
+            extensions = ['jsonl'] + [e for e in Settings.OUTPUT_FORMATS if e != 'jsonl']
+
+        writers = {}
+        for extension in extensions:
+            writer_class = FileHandler.writer_class(extension)
+            offset = offsets.get(extension) if writer_class.resumable else None
+            writers[extension] = writer_class(writer_class.path_for(timestamp, output_dir), offset)
+
+        return writers
+
     @staticmethod
     def save_to_csv(properties: List[Property], timestamp: datetime) -> str:
         """Save properties to CSV file"""
@@ -19,20 +238,10 @@ class FileHandler:
             logger.warning("No properties to save")
             return None
 
-        filename = os.path.join(
-            Settings.OUTPUT_DIR,
-            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}.csv"
-        )
-
-        fieldnames = [
-            'type', 'listing_type', 'city', 'district', 'district_en',
-            'price', 'price_numeric', 'area', 'area_numeric', 
-            'bedrooms', 'ad_id', 'code', 'title', 'lat', 'lng',
-            'created_at', 'source', 'extraction_date'
-        ]
+        filename = FileHandler.output_path(timestamp, 'csv')
 
         with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore')
             writer.writeheader()
             writer.writerows([p.to_dict() for p in properties])
 
@@ -46,10 +255,7 @@ class FileHandler:
             logger.warning("No properties to save")
             return None
 
-        filename = os.path.join(
-            Settings.OUTPUT_DIR,
-            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        )
+        filename = FileHandler.output_path(timestamp, 'json')
 
         data = {
             'metadata': {
@@ -64,4 +270,10 @@ class FileHandler:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
         logger.info(f"Results saved to {filename}")
-        return filename
\ No newline at end of file
+        return filename
+
+    @staticmethod
+    def save_to_parquet(properties: List[Property], timestamp: datetime) -> str:
+        """Save properties to a Parquet file in the lakehouse layout"""
+        from src.utils.parquet_writer import save_to_parquet
+        return save_to_parquet(properties, timestamp)
\ No newline at end of file
@@ -0,0 +1,123 @@
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from src.config import Settings, constants
+from src.utils.metrics import metrics
+from src.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+class ApiClient:
+    """Pooled keep-alive HTTP client for the DealApp API"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url: str = None, pool_size: int = None):
+        self.base_url = base_url or Settings.BASE_URL
+        self.timeout = (Settings.HTTP_CONNECT_TIMEOUT, Settings.HTTP_READ_TIMEOUT)
+
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size or Settings.SCRAPE_CONCURRENCY,
+            pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        self.session.headers.update(constants.DEFAULT_HEADERS)
+
+    def get(self, path: str, params: Dict = None, headers: Dict = None,
+            limiter: Optional[RateLimiter] = None) -> requests.Response:
+        """GET an API path, retrying 429/5xx and connection errors with backoff
+
+        Every attempt, retries included, first takes a slot from `limiter`. A
+        Retry-After longer than HTTP_BACKOFF_MAX returns the response instead
+        of retrying sooner than the server asked.
+        """
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(Settings.HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == Settings.HTTP_MAX_RETRIES
+            if limiter is not None:
+                with metrics.timer('rate_limit_wait_seconds'):
+                    limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.inc('http_requests_total', status='error')
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Request failed ({e}), retrying in {delay:.1f}s")
+            else:
+                metrics.observe('http_request_seconds', time.perf_counter() - started, status=response.status_code)
+                metrics.inc('http_requests_total', status=response.status_code)
+                metrics.inc('http_response_bytes_total', len(response.content))
+                if response.status_code not in self.RETRY_STATUSES or last_attempt:
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > Settings.HTTP_BACKOFF_MAX:
+                    logger.warning(f"HTTP {response.status_code} with Retry-After {delay:.0f}s, not retrying")
+                    return response
+                logger.warning(f"HTTP {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+
+            metrics.inc('http_retries_total')
+            time.sleep(delay)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Count connections opened vs. reused across the pool"""
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        requests_sent = 0
+        for key in pools.keys():
+            pool = pools[key]
+            opened += pool.num_connections
+            requests_sent += pool.num_requests
+
+        return {
+            'requests': requests_sent,
+            'opened': opened,
+            'reused': max(0, requests_sent - opened)
+        }
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        ceiling = min(Settings.HTTP_BACKOFF_MAX, Settings.HTTP_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+
+        return max(0.0, delay)
\ No newline at end of file
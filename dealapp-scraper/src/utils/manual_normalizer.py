@@ -0,0 +1,415 @@
+import csv
+import logging
+import os
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from src.config import Settings
+from src.utils.file_handler import REJECTS_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+# Columns of a manual upload, in the order of bronze.manual_properties_external
+MANUAL_COLUMNS = [
+    'advertisement_number', 'user_number', 'creation_time', 'last_update_time', 'age_less_than',
+    'number_of_apartment', 'number_of_bedrooms', 'floor', 'number_of_kitchens', 'closed',
+    'residential_or_commercial', 'property_type', 'driver_room', 'duplex', 'families_or_singles',
+    'furnished', 'number_of_living_rooms', 'maids_room', 'price_per_meter', 'type_of_advertiser',
+    'swimming_pool', 'paid', 'price', 'rental_period', 'number_of_rooms', 'area_dimension',
+    'street_direction', 'street_width', 'for_sale_or_rent', 'number_of_bathrooms', 'latitude',
+    'longitude', 'region_name_ar', 'region_name_en', 'province_name', 'nearest_city_name_ar',
+    'nearest_city_name_en', 'district_name_ar', 'district_name_en', 'zip_code_no'
+]
+
+REJECT_FIELDNAMES = ['reason', 'line'] + MANUAL_COLUMNS
+
+# Typed schema; columns shared with scraped listings keep the scraper's Parquet names and types
+MANUAL_SCHEMA = pa.schema([
+    ('type', pa.dictionary(pa.int32(), pa.string())),
+    ('listing_type', pa.dictionary(pa.int32(), pa.string())),
+    ('city', pa.dictionary(pa.int32(), pa.string())),
+    ('district', pa.dictionary(pa.int32(), pa.string())),
+    ('district_en', pa.string()),
+    ('price_numeric', pa.float64()),
+    ('area_numeric', pa.float64()),
+    ('bedrooms', pa.float64()),
+    ('ad_id', pa.string()),
+    ('lat', pa.float64()),
+    ('lng', pa.float64()),
+    ('created_at', pa.timestamp('ms')),
+    ('source', pa.dictionary(pa.int32(), pa.string())),
+    ('extraction_date', pa.timestamp('us')),
+    ('region', pa.dictionary(pa.int32(), pa.string())),
+    ('bathrooms', pa.int32()),
+    ('living_rooms', pa.int32()),
+    ('kitchens', pa.int32()),
+    ('floor', pa.int32()),
+    ('has_driver_room', pa.bool_()),
+    ('has_maid_room', pa.bool_()),
+    ('has_swimming_pool', pa.bool_()),
+    ('is_duplex', pa.bool_()),
+    ('is_furnished', pa.bool_()),
+    ('families_or_singles', pa.dictionary(pa.int32(), pa.string())),
+    ('street_direction', pa.dictionary(pa.int32(), pa.string())),
+    ('street_width', pa.int32()),
+    ('advertiser_type', pa.dictionary(pa.int32(), pa.string())),
+    ('rental_period', pa.dictionary(pa.int32(), pa.string())),
+    ('status', pa.dictionary(pa.int32(), pa.string())),
+    ('last_updated_at', pa.timestamp('ms')),
+    ('file_date', pa.date32()),
+])
+
+DICTIONARY_COLUMNS = [f.name for f in MANUAL_SCHEMA if pa.types.is_dictionary(f.type)]
+
+# Upload column -> typed column, for the plain text and count columns
+TEXT_COLUMNS = {
+    'property_type': 'type',
+    'nearest_city_name_ar': 'city',
+    'district_name_ar': 'district',
+    'district_name_en': 'district_en',
+    'region_name_ar': 'region',
+    'families_or_singles': 'families_or_singles',
+    'street_direction': 'street_direction',
+    'type_of_advertiser': 'advertiser_type',
+    'rental_period': 'rental_period'
+}
+COUNT_COLUMNS = {
+    'number_of_bedrooms': 'bedrooms',
+    'number_of_bathrooms': 'bathrooms',
+    'number_of_living_rooms': 'living_rooms',
+    'number_of_kitchens': 'kitchens',
+    'floor': 'floor',
+    'street_width': 'street_width'
+}
+# Amenity column -> flag, set when the value says the amenity exists
+AMENITY_COLUMNS = {
+    'driver_room': 'has_driver_room',
+    'maids_room': 'has_maid_room',
+    'swimming_pool': 'has_swimming_pool',
+    'furnished': 'is_furnished'
+}
+
+# Columns that are parsed or compared, and so have surrounding whitespace trimmed
+PARSED_COLUMNS = ['advertisement_number', 'creation_time', 'last_update_time', 'closed', 'duplex', 'price',
+                  'area_dimension', 'for_sale_or_rent', 'latitude', 'longitude'] + \
+                 list(COUNT_COLUMNS) + list(AMENITY_COLUMNS)
+
+LISTING_TYPES = {'للبيع': 'sale', 'للإيجار': 'rent'}
+EXISTS = 'يوجد'
+NOT_EXISTS = 'لا'
+DUPLEX = 'دوبلكس'
+CLOSED = 'مغلق'
+
+NUMBER = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+INTEGER = r'^[+-]?\d+$'
+# Range of SQL Server's INT, which the count columns are loaded into
+INT_RANGE = (-2**31, 2**31 - 1)
+# Formats SQL Server's DATETIME conversion accepted, tried in order
+TIMESTAMP_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+                     '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%m/%d/%Y']
+TIMESTAMP_SUFFIX = r'(\.\d+)?(Z|[+-]\d{2}:?\d{2})?$'
+
+class ManualUploadNormalizer:
+    """Normalizes manual CSV/Excel uploads into typed Parquet, chunk by chunk
+
+    Applies the conversions of silver.sp_load_manual_properties with vectorized
+    Arrow kernels, so memory is bounded by the chunk size rather than the file.
+    Rows missing an advertisement number, repeating one, or carrying a
+    price, area, coordinate or creation time that cannot be parsed are
+    written to a rejects CSV instead; other unparseable values become null,
+    as TRY_CAST would make them.
+    """
+
+    def __init__(self, file_date: date = None, encoding: str = 'utf8'):
+        self.file_date = file_date or date.today()
+        self.encoding = encoding
+        self.extraction_date = datetime.now()
+        self.rows = 0
+        self.rejected = 0
+        self._reset_seen()
+        self._malformed = []
+
+    @staticmethod
+    def output_path(path: str, file_date: date) -> str:
+        """source=manual/ingest_date=YYYY-MM-DD/ path of an upload's Parquet file"""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(
+            Settings.OUTPUT_DIR,
+            'source=manual',
+            f"ingest_date={file_date.strftime('%Y-%m-%d')}",
+            f"manual_{name}.parquet"
+        )
+
+    @staticmethod
+    def rejects_path(path: str) -> str:
+        """Path of the rows rejected from an upload"""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(Settings.OUTPUT_DIR, f"manual_{name}{REJECTS_SUFFIX}")
+
+    def normalize(self, path: str) -> Dict:
+        """Normalize one upload, returning its output paths and row counts"""
+        output = self.output_path(path, self.file_date)
+        rejects = self.rejects_path(path)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+
+        self.rows = self.rejected = 0
+        self._reset_seen()
+        self._malformed = []
+
+        writer = pq.ParquetWriter(f"{output}.part", MANUAL_SCHEMA,
+                                  compression=Settings.PARQUET_COMPRESSION, use_dictionary=DICTIONARY_COLUMNS)
+        try:
+            with open(f"{rejects}.part", 'w', encoding='utf-8-sig', newline='') as f:
+                reject_writer = csv.DictWriter(f, fieldnames=REJECT_FIELDNAMES)
+                reject_writer.writeheader()
+
+                for chunk in self.read_chunks(path):
+                    table, rejected = self.normalize_chunk(chunk)
+                    if table.num_rows:
+                        writer.write_table(table, row_group_size=Settings.PARQUET_ROW_GROUP_SIZE)
+                    reject_writer.writerows(rejected)
+                    # Rows the CSV parser could not split into columns
+                    reject_writer.writerows(self._malformed)
+                    self.rows += table.num_rows
+                    self.rejected += len(rejected) + len(self._malformed)
+                    self._malformed = []
+        except BaseException:
+            # Leave no partial output behind for a failed upload
+            writer.close()
+            for part in (f"{output}.part", f"{rejects}.part"):
+                if os.path.exists(part):
+                    os.remove(part)
+            raise
+
+        writer.close()
+        os.replace(f"{output}.part", output)
+        if self.rejected:
+            os.replace(f"{rejects}.part", rejects)
+        else:
+            os.remove(f"{rejects}.part")
+            rejects = None
+
+        logger.info(f"Normalized {self.rows} rows of {path} to {output} ({self.rejected} rejected)")
+        return {'upload': path, 'output': output, 'rejects': rejects,
+                'rows': self.rows, 'rejected': self.rejected}
+
+    def read_chunks(self, path: str) -> Iterator[pa.Table]:
+        """Read an upload as tables of string columns named after MANUAL_COLUMNS"""
+        if path.lower().endswith(('.xlsx', '.xlsm')):
+            return self._read_excel(path)
+        return self._read_csv(path)
+
+    def _read_csv(self, path: str) -> Iterator[pa.Table]:
+        reader = pa_csv.open_csv(
+            path,
+            # The reader parses several blocks ahead, so blocks are kept small and batched into chunks
+            read_options=pa_csv.ReadOptions(column_names=MANUAL_COLUMNS, skip_rows=1,
+                                            block_size=Settings.MANUAL_BLOCK_SIZE, encoding=self.encoding),
+            parse_options=pa_csv.ParseOptions(invalid_row_handler=self._malformed_row),
+            convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in MANUAL_COLUMNS},
+                                                  strings_can_be_null=False, quoted_strings_can_be_null=False)
+        )
+        batches, rows = [], 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= Settings.MANUAL_CHUNK_ROWS:
+                yield pa.Table.from_batches(batches)
+                batches, rows = [], 0
+        if batches:
+            yield pa.Table.from_batches(batches)
+
+    def _read_excel(self, path: str) -> Iterator[pa.Table]:
+        # openpyxl is only imported for Excel uploads; read-only mode streams the sheet
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(min_row=2, values_only=True)
+            columns = [[] for _ in MANUAL_COLUMNS]
+            for row in rows:
+                for i, column in enumerate(columns):
+                    value = row[i] if i < len(row) else None
+                    column.append(self._excel_text(value))
+                if len(columns[0]) >= Settings.MANUAL_CHUNK_ROWS:
+                    yield pa.table(dict(zip(MANUAL_COLUMNS, columns)))
+                    columns = [[] for _ in MANUAL_COLUMNS]
+            if columns[0]:
+                yield pa.table(dict(zip(MANUAL_COLUMNS, columns)))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _excel_text(value) -> str:
+        """Cell value as the text a CSV export of the sheet would hold"""
+        if value is None:
+            return ''
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ')
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    def _malformed_row(self, row) -> str:
+        record = {'reason': f"expected {row.expected_columns} columns, got {row.actual_columns}",
+                  'line': row.number}
+        record.update(zip(MANUAL_COLUMNS, next(csv.reader([row.text]), [])))
+        self._malformed.append(record)
+        return 'skip'
+
+    def normalize_chunk(self, chunk: pa.Table) -> Tuple[pa.Table, List[Dict]]:
+        """Convert a chunk of string columns, returning the typed table and the rejected rows"""
+        text = {name: chunk.column(name).combine_chunks() for name in TEXT_COLUMNS}
+        text.update({name: pc.utf8_trim_whitespace(chunk.column(name).combine_chunks()) for name in PARSED_COLUMNS})
+
+        price, price_ok = _number(pc.replace_substring(text['price'], ',', ''))
+        area, area_ok = _number(pc.replace_substring(text['area_dimension'], ',', ''))
+        lat, lat_ok = _number(text['latitude'])
+        lng, lng_ok = _number(text['longitude'])
+        created_at, created_ok = _timestamp(text['creation_time'])
+        updated_at, _ = _timestamp(text['last_update_time'])
+        ad_id = text['advertisement_number']
+
+        checks = [
+            (pc.equal(ad_id, ''), 'missing advertisement_number'),
+            (self._repeated(ad_id), 'duplicate advertisement_number'),
+            (pc.invert(price_ok), 'invalid price'),
+            (pc.invert(area_ok), 'invalid area_dimension'),
+            (pc.invert(pc.and_(lat_ok, _within(lat, 90))), 'invalid latitude'),
+            (pc.invert(pc.and_(lng_ok, _within(lng, 180))), 'invalid longitude'),
+            (pc.invert(created_ok), 'invalid creation_time')
+        ]
+        reason = pa.nulls(chunk.num_rows, pa.string())
+        for failed, message in reversed(checks):
+            # Later checks are applied first, so each row keeps the first reason it fails
+            reason = pc.if_else(failed, message, reason)
+        accepted = pc.is_null(reason)
+
+        columns = {
+            'listing_type': _lookup(text['for_sale_or_rent'], LISTING_TYPES, 'unknown'),
+            'price_numeric': price,
+            'area_numeric': area,
+            'ad_id': ad_id,
+            'lat': lat,
+            'lng': lng,
+            'created_at': created_at,
+            'source': pa.repeat('manual', chunk.num_rows),
+            'extraction_date': pa.repeat(pa.scalar(self.extraction_date, pa.timestamp('us')), chunk.num_rows),
+            'is_duplex': pc.equal(text['duplex'], DUPLEX),
+            'status': _lookup(text['closed'], {CLOSED: 'closed'}, 'active'),
+            'last_updated_at': updated_at,
+            'file_date': pa.repeat(pa.scalar(self.file_date, pa.date32()), chunk.num_rows)
+        }
+        for source, name in TEXT_COLUMNS.items():
+            columns[name] = pc.if_else(pc.equal(text[source], ''), None, text[source])
+        for source, name in COUNT_COLUMNS.items():
+            columns[name] = _integer(text[source])
+        for source, name in AMENITY_COLUMNS.items():
+            # 'لا يوجد' (there is none) also contains 'يوجد'
+            columns[name] = pc.and_(pc.match_substring(text[source], EXISTS),
+                                    pc.invert(pc.starts_with(text[source], NOT_EXISTS)))
+
+        arrays = []
+        for field in MANUAL_SCHEMA:
+            values = pc.filter(columns[field.name], accepted)
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pc.cast(values, pa.string()).dictionary_encode())
+            else:
+                arrays.append(pc.cast(values, field.type))
+        table = pa.Table.from_arrays(arrays, schema=MANUAL_SCHEMA)
+
+        rejected = []
+        if table.num_rows < chunk.num_rows:
+            rows = pc.invert(accepted)
+            rejected = chunk.filter(rows).append_column('reason', pc.filter(reason, rows)).to_pylist()
+        return table, rejected
+
+    def _reset_seen(self):
+        # Sorted 64-bit hashes of the ids seen so far, with each id's row in the stored ids
+        self._seen_hashes = np.empty(0, dtype=np.int64)
+        self._seen_rows = np.empty(0, dtype=np.int64)
+        # The ids themselves, one Arrow array per chunk, to confirm hash hits
+        self._seen_ids = []
+        self._seen_count = 0
+
+    def _repeated(self, ad_id: pa.Array) -> pa.Array:
+        """Whether each advertisement number already appeared earlier in the upload"""
+        # Dictionary codes number the chunk's distinct ids in order of first appearance
+        encoded = ad_id.dictionary_encode()
+        ids = encoded.dictionary
+        codes = encoded.indices.to_numpy(zero_copy_only=False)
+        hashes = np.fromiter(map(hash, ids.to_pylist()), dtype=np.int64, count=len(ids))
+        earlier = self._seen_before(ids, hashes)
+
+        # Repeats within the chunk: all but the first occurrence
+        later = np.ones(len(codes), dtype=bool)
+        later[np.unique(codes, return_index=True)[1]] = False
+
+        new = np.flatnonzero(~earlier)
+        self._seen_ids.append(ids.take(pa.array(new)))
+        rows = np.arange(self._seen_count, self._seen_count + len(new), dtype=np.int64)
+        self._seen_count += len(new)
+        hashes = np.concatenate([self._seen_hashes, hashes[new]])
+        order = np.argsort(hashes, kind='stable')
+        self._seen_hashes = hashes[order]
+        self._seen_rows = np.concatenate([self._seen_rows, rows])[order]
+        return pa.array(earlier[codes] | later)
+
+    def _seen_before(self, ids: pa.Array, hashes: np.ndarray) -> np.ndarray:
+        """Whether each of a chunk's distinct ids appeared in an earlier chunk"""
+        earlier = np.zeros(len(ids), dtype=bool)
+        seen = self._seen_hashes
+        start = np.searchsorted(seen, hashes, side='left')
+        end = np.searchsorted(seen, hashes, side='right')
+        hits = np.flatnonzero(end > start)
+        if not len(hits):
+            return earlier
+
+        # Hash hits are confirmed against the stored ids, so a collision never rejects a row
+        stored = pa.chunked_array(self._seen_ids, pa.string())
+        same = pc.equal(ids.take(pa.array(hits)), stored.take(pa.array(self._seen_rows[start[hits]])))
+        earlier[hits] = same.to_numpy(zero_copy_only=False)
+        for i in hits[(end[hits] - start[hits] > 1) & ~earlier[hits]]:
+            # Other ids sharing the hash
+            earlier[i] = ids[i].as_py() in stored.take(pa.array(self._seen_rows[start[i]:end[i]])).to_pylist()
+        return earlier
+
+def _number(values: pa.Array):
+    """TRY_CAST to float: (values, whether each value is empty or parsed)"""
+    valid = pc.match_substring_regex(values, NUMBER)
+    return pc.cast(pc.if_else(valid, values, None), pa.float64()), pc.or_(valid, pc.equal(values, ''))
+
+def _integer(values: pa.Array) -> pa.Array:
+    """TRY_CAST to INT, with null for anything that is not a whole number in INT's range"""
+    valid = pc.match_substring_regex(values, INTEGER)
+    # Through float64 so even digit strings beyond int64 parse before the range check
+    numbers = pc.cast(pc.if_else(valid, values, None), pa.float64())
+    in_range = pc.and_(pc.greater_equal(numbers, INT_RANGE[0]), pc.less_equal(numbers, INT_RANGE[1]))
+    return pc.cast(pc.if_else(in_range, numbers, None), pa.int32())
+
+def _timestamp(values: pa.Array):
+    """TRY_CAST to DATETIME: (values, whether each value is empty or parsed)"""
+    parsed = pc.strptime(values, format=TIMESTAMP_FORMATS[0], unit='ms', error_is_null=True)
+    pending = pc.and_(pc.is_null(parsed), pc.not_equal(values, ''))
+    if pc.any(pending).as_py():
+        # Only values the usual format missed go through the other formats
+        rest = pc.replace_substring_regex(pc.filter(values, pending), TIMESTAMP_SUFFIX, '')
+        found = pa.nulls(len(rest), pa.timestamp('ms'))
+        for fmt in TIMESTAMP_FORMATS:
+            found = pc.coalesce(found, pc.strptime(rest, format=fmt, unit='ms', error_is_null=True))
+        parsed = pc.replace_with_mask(parsed, pending, found)
+    return parsed, pc.or_(pc.is_valid(parsed), pc.equal(values, ''))
+
+def _within(values: pa.Array, limit: float) -> pa.Array:
+    return pc.fill_null(pc.less_equal(pc.abs(values), limit), True)
+
+def _lookup(values: pa.Array, mapping: Dict[str, str], default: str) -> pa.Array:
+    """Map known values, and everything else to a default, like a SQL CASE"""
+    result = pa.repeat(default, len(values))
+    for value, mapped in mapping.items():
+        result = pc.if_else(pc.equal(values, value), mapped, result)
+    return result
\ No newline at end of file
@@ -0,0 +1,195 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds; latencies are in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+BUCKETS = {
+    'token_requests_served': COUNT_BUCKETS
+}
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'buckets': buckets
+        }
+
+    def merge(self, data: Dict):
+        """Add the observations of a to_dict snapshot with the same buckets"""
+        previous = 0
+        for i, cumulative in enumerate(data['buckets'].values()):
+            self.counts[i] += cumulative - previous
+            previous = cumulative
+        self.count += data['count']
+        self.sum += data['sum']
+        self.max = max(self.max, data['max'])
+
+class Metrics:
+    """Thread-safe registry of counters and histograms for one process"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str], float] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter"""
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation"""
+        key = (name, self._labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(BUCKETS.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the wall time of a block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        """Drop everything recorded so far"""
+        with self._lock:
+            self.started = time.time()
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict:
+        """Counters and histograms keyed by Prometheus-style series name"""
+        with self._lock:
+            return {
+                'counters': {self._series(*key): value for key, value in sorted(self._counters.items())},
+                'histograms': {self._series(*key): h.to_dict() for key, h in sorted(self._histograms.items())}
+            }
+
+    def merge(self, snapshot: Dict):
+        """Add a snapshot taken in another process, e.g. a crawl worker"""
+        with self._lock:
+            for series, value in snapshot['counters'].items():
+                key = self._parse_series(series)
+                self._counters[key] = self._counters.get(key, 0) + value
+            for series, data in snapshot['histograms'].items():
+                key = self._parse_series(series)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(BUCKETS.get(key[0], LATENCY_BUCKETS))
+                self._histograms[key].merge(data)
+
+    def write_report(self, path: str, **run_info) -> str:
+        """Write the run's metrics as a JSON report"""
+        report = dict(run_info)
+        report['duration_seconds'] = round(time.time() - self.started, 3)
+        report.update(self.snapshot())
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Metrics report saved to {path}")
+        return path
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format"""
+        lines = []
+        typed = set()
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{self._series(name, labels)} {value:g}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                prefix = f"{labels}," if labels else ''
+                for bound, cumulative in histogram.to_dict()['buckets'].items():
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f"{self._series(name + '_sum', labels)} {histogram.sum:g}")
+                lines.append(f"{self._series(name + '_count', labels)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int, host: str = '0.0.0.0'):
+        """Serve /metrics for Prometheus from a background thread, returning the ThreadingHTTPServer"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics-endpoint', daemon=True).start()
+        logger.info(f"Serving Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+    @staticmethod
+    def _labels(labels: Dict) -> str:
+        return ','.join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+
+    @staticmethod
+    def _series(name: str, labels: str) -> str:
+        return f"{name}{{{labels}}}" if labels else name
+
+    @staticmethod
+    def _parse_series(series: str) -> Tuple[str, str]:
+        name, _, labels = series.partition('{')
+        return name, labels[:-1]
+
+# Process-wide registry used by the scrape pipeline
+metrics = Metrics()
\ No newline at end of file
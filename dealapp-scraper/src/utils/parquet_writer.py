@@ -0,0 +1,120 @@
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.config import Settings
+from src.models import Property, PropertyBatch
+from src.utils.file_handler import StreamingWriter
+
+logger = logging.getLogger(__name__)
+
+# Typed bronze schema; the formatted price/area strings of the CSV are dropped
+PARQUET_SCHEMA = pa.schema([
+    ('type', pa.dictionary(pa.int32(), pa.string())),
+    ('listing_type', pa.dictionary(pa.int32(), pa.string())),
+    ('city', pa.dictionary(pa.int32(), pa.string())),
+    ('district', pa.dictionary(pa.int32(), pa.string())),
+    ('district_en', pa.string()),
+    ('price_numeric', pa.float64()),
+    ('area_numeric', pa.float64()),
+    ('bedrooms', pa.float64()),
+    ('ad_id', pa.string()),
+    ('code', pa.string()),
+    ('title', pa.string()),
+    ('lat', pa.float64()),
+    ('lng', pa.float64()),
+    ('created_at', pa.timestamp('ms', tz='UTC')),
+    ('source', pa.dictionary(pa.int32(), pa.string())),
+    ('extraction_date', pa.timestamp('us')),
+    # The run's ingest_date partition, which silver loads by
+    ('file_date', pa.date32()),
+])
+DICTIONARY_COLUMNS = [f.name for f in PARQUET_SCHEMA if pa.types.is_dictionary(f.type)]
+
+class ParquetStreamWriter(StreamingWriter):
+    """Streams properties into a Parquet file in the lakehouse raw layout"""
+
+    extension = 'parquet'
+    resumable = False
+
+    def __init__(self, path: str, resume_offset: Optional[int] = None):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.count = 0
+        self.file_date = _ingest_date(path)
+        self._batch = PropertyBatch()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._writer = pq.ParquetWriter(
+            self.part_path,
+            PARQUET_SCHEMA,
+            compression=Settings.PARQUET_COMPRESSION,
+            use_dictionary=DICTIONARY_COLUMNS
+        )
+
+    @classmethod
+    def path_for(cls, timestamp: datetime, output_dir: str = None) -> str:
+        """source=dealapp/ingest_date=YYYY-MM-DD/ path of a run's Parquet file"""
+        return os.path.join(
+            output_dir or Settings.OUTPUT_DIR,
+            'source=dealapp',
+            f"ingest_date={timestamp.strftime('%Y-%m-%d')}",
+            f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}.parquet"
+        )
+
+    def write(self, prop: Property):
+        """Buffer a property, writing a row group when the buffer is full"""
+        self._batch.append(prop)
+        self.count += 1
+        if len(self._batch) >= Settings.PARQUET_ROW_GROUP_SIZE:
+            self._write_row_group()
+
+    def flush(self) -> int:
+        """Parquet output is rebuilt on resume, so there is no offset to report"""
+        return 0
+
+    def close(self, publish: bool = True) -> Optional[str]:
+        """Write buffered rows, finalize the footer and rename into place"""
+        self._write_row_group()
+        self._writer.close()
+        if not publish:
+            return None
+
+        os.replace(self.part_path, self.path)
+        logger.info(f"Results saved to {self.path}")
+        return self.path
+
+    def discard(self):
+        """Close and delete the part file"""
+        self._writer.close()
+        os.remove(self.part_path)
+
+    def _write_row_group(self):
+        if not len(self._batch):
+            return
+
+        if self._batch.unparsed_timestamps:
+            logger.warning(f"{self._batch.unparsed_timestamps} created_at values are not timestamps "
+                           f"and are written as null to {self.path}")
+        # The table shares the batch's buffers, so the batch is replaced rather than cleared
+        self._writer.write_table(self._batch.to_arrow(self.file_date))
+        self._batch = PropertyBatch()
+
+def _ingest_date(path: str) -> date:
+    """Date of the ingest_date=YYYY-MM-DD partition a file is written to, or today"""
+    match = re.search(r'ingest_date=(\d{4}-\d{2}-\d{2})', path)
+    return date.fromisoformat(match.group(1)) if match else date.today()
+
+def save_to_parquet(properties: List[Property], timestamp: datetime) -> Optional[str]:
+    """Save properties to a Parquet file in one batch"""
+    if not properties:
+        logger.warning("No properties to save")
+        return None
+
+    writer = ParquetStreamWriter(ParquetStreamWriter.path_for(timestamp))
+    for prop in properties:
+        writer.write(prop)
+    return writer.close()
\ No newline at end of file
@@ -1,66 +1,142 @@
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import json
 import logging
 from datetime import datetime
 from src.models import Property
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Parsed field -> (key path into an API ad, default when missing or null)
+AD_SCHEMA = {
+    'property_type': (('propertyType', 'propertyType_ar'), ''),
+    'purpose': (('purpose',), ''),
+    'city': (('city', 'name_ar'), 'الرياض'),
+    'district': (('district', 'name_ar'), ''),
+    'district_en': (('district', 'name_en'), ''),
+    'price': (('price',), 0),
+    'area': (('area',), None),
+    'rooms': (('relatedQuestions', 'roomsNumRange'), '0'),
+    'coordinates': (('location', 'value', 'coordinates'), ()),
+    'ad_id': (('_id',), ''),
+    'code': (('code',), ''),
+    'title': (('title',), ''),
+    'created_at': (('createdAt',), '')
+}
+
+# API purpose -> (listing type, suffix appended to the Arabic property type)
+PURPOSES = {
+    'SALE': ('sale', ' للبيع'),
+    'RENT': ('rent', ' للإيجار')
+}
+
+def _accessor(path: Sequence[str], default: Any) -> Callable[[Dict], Any]:
+    """Compile a key path into a getter for nested ad dicts"""
+    if len(path) == 1:
+        key = path[0]
+
+        def get(ad: Dict) -> Any:
+            value = ad.get(key)
+            return default if value is None else value
+        return get
+
+    def get_nested(ad: Dict) -> Any:
+        value = ad
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                return default
+        return value
+    return get_nested
+
+ACCESSORS = {name: _accessor(path, default) for name, (path, default) in AD_SCHEMA.items()}
+
+@lru_cache(maxsize=256)
+def _parse_rooms(rooms_num: str) -> float:
+    """Bedrooms from a rooms value such as '3' or a range such as '3-4'"""
+    try:
+        return float(rooms_num.split('-')[0]) if rooms_num else 0
+    except ValueError:
+        return 0
+
 class PropertyParser:
     """Handles property data parsing"""
 
+    @staticmethod
+    def decode_json(content: Union[bytes, str]) -> Any:
+        """Decode an API response body, using orjson when it is installed"""
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
     @staticmethod
     def parse_property(ad: Dict) -> Optional[Property]:
         """Parse property data from API response"""
-        try:
-            property_type = ad.get('propertyType', {})
-            property_type_ar = property_type.get('propertyType_ar', '')
-
-            purpose = ad.get('purpose', '')
-            if purpose == 'SALE':
-                listing_type = 'sale'
-                full_type = f"{property_type_ar} للبيع"
-            elif purpose == 'RENT':
-                listing_type = 'rent'
-                full_type = f"{property_type_ar} للإيجار"
-            else:
-                listing_type = purpose.lower()
-                full_type = property_type_ar
-
-            district = ad.get('district', {})
-            related_questions = ad.get('relatedQuestions', {})
-
-            rooms_num = related_questions.get('roomsNumRange', '0')
+        properties = PropertyParser.parse_batch([ad])
+        return properties[0] if properties else None
+
+    @staticmethod
+    def parse_batch(ads: List[Dict], extraction_date: datetime = None) -> List[Property]:
+        """Parse a response's ads in one pass, skipping ads that fail to parse
+
+        All properties in the batch share a single extraction timestamp.
+        """
+        extraction_date = extraction_date or datetime.now()
+        (get_type, get_purpose, get_city, get_district, get_district_en, get_price, get_area,
+         get_rooms, get_coordinates, get_ad_id, get_code, get_title, get_created_at) = ACCESSORS.values()
+
+        properties = []
+        errors = 0
+        first_error = None
+
+        for ad in ads:
             try:
-                if '-' in str(rooms_num):
-                    bedrooms = float(str(rooms_num).split('-')[0])
+                property_type_ar = get_type(ad)
+                purpose = get_purpose(ad)
+                if purpose in PURPOSES:
+                    listing_type, suffix = PURPOSES[purpose]
+                    full_type = property_type_ar + suffix
                 else:
-                    bedrooms = float(rooms_num) if rooms_num else 0
-            except:
-                bedrooms = 0
-
-            location = ad.get('location', {}).get('value', {}).get('coordinates', [])
-            lng = location[0] if len(location) > 0 else None
-            lat = location[1] if len(location) > 1 else None
-
-            return Property(
-                type=full_type,
-                listing_type=listing_type,
-                city=ad.get('city', {}).get('name_ar', 'الرياض'),
-                district=district.get('name_ar', ''),
-                district_en=district.get('name_en', ''),
-                price=f"{ad.get('price', 0):,}",
-                price_numeric=float(ad.get('price', 0)),
-                area=str(ad.get('area', '')),
-                area_numeric=float(ad.get('area', 0)),
-                bedrooms=bedrooms,
-                ad_id=ad.get('_id', ''),
-                code=ad.get('code', ''),
-                title=ad.get('title', ''),
-                lat=lat,
-                lng=lng,
-                created_at=ad.get('createdAt', ''),
-                extraction_date=datetime.now()
-            )
-        except Exception as e:
-            logger.error(f"Parse error: {e}")
-            return None
\ No newline at end of file
+                    listing_type = purpose.lower()
+                    full_type = property_type_ar
+
+                rooms_num = get_rooms(ad)
+                bedrooms = float(rooms_num) if isinstance(rooms_num, (int, float)) else _parse_rooms(str(rooms_num))
+
+                location = get_coordinates(ad)
+                price = get_price(ad)
+                area = get_area(ad)
+
+                properties.append(Property(
+                    type=full_type,
+                    listing_type=listing_type,
+                    city=get_city(ad),
+                    district=get_district(ad),
+                    district_en=get_district_en(ad),
+                    price=format(price, ','),
+                    price_numeric=float(price),
+                    area='' if area is None else str(area),
+                    area_numeric=float(area or 0),
+                    bedrooms=bedrooms,
+                    ad_id=get_ad_id(ad),
+                    code=get_code(ad),
+                    title=get_title(ad),
+                    lat=location[1] if len(location) > 1 else None,
+                    lng=location[0] if len(location) > 0 else None,
+                    created_at=get_created_at(ad),
+                    extraction_date=extraction_date
+                ))
+            except (AttributeError, TypeError, ValueError) as e:
+                errors += 1
+                if first_error is None:
+                    first_error = f"{ad.get('_id') if isinstance(ad, dict) else ad!r}: {e}"
+
+        if errors:
+            logger.error(f"Parse error in {errors} of {len(ads)} ads (first: {first_error})")
+
+        return properties
\ No newline at end of file
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List
+from src.config import Settings
+from src.utils.property_parser import PropertyParser
+
+logger = logging.getLogger(__name__)
+
+# Compression setting -> archive file extension
+EXTENSIONS = {
+    'gzip': 'jsonl.gz',
+    'zstd': 'jsonl.zst',
+    'none': 'jsonl'
+}
+
+class ResponseArchive:
+    """Appends raw API responses to a compressed JSON Lines archive
+
+    Each flush ends the current gzip member or zstd frame, so a checkpointed
+    offset is always a clean point to truncate back to and keep appending.
+    """
+
+    def __init__(self, path: str, resume_offset: int = None):
+        self.path = path
+        self.compression = next(c for c, ext in EXTENSIONS.items() if path.endswith(f".{ext}"))
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        resuming = resume_offset is not None and os.path.exists(path)
+        if resuming:
+            with open(path, 'r+b') as f:
+                f.truncate(resume_offset)
+
+        self._file = open(path, 'ab' if resuming else 'wb')
+        self._stream = self._open_stream()
+
+    @staticmethod
+    def path_for(timestamp: datetime, shard: str = None) -> str:
+        """Archive path of a run, partitioned by ingest date"""
+        name = f"dealapp_{timestamp.strftime('%Y%m%d_%H%M%S')}"
+        if shard:
+            name = f"{name}_{shard}"
+        return os.path.join(
+            Settings.ARCHIVE_DIR,
+            f"ingest_date={timestamp.strftime('%Y-%m-%d')}",
+            f"{name}.{EXTENSIONS[Settings.ARCHIVE_COMPRESSION]}"
+        )
+
+    @staticmethod
+    def token_id(token_value: str) -> str:
+        """Stable identifier for a token that does not reveal it"""
+        return hashlib.sha1(token_value.encode('utf-8')).hexdigest()[:12]
+
+    def write(self, params: Dict, status: int, content: bytes, token_id: str, fetched_at: datetime):
+        """Append one response; the body is embedded as-is for successful responses"""
+        header = json.dumps({
+            'fetched_at': fetched_at.isoformat(),
+            'token_id': token_id,
+            'status': status,
+            'params': params
+        }, ensure_ascii=False)
+
+        # JSON only has raw line breaks as whitespace, so the body fits on one line
+        body = content.replace(b'\r', b' ').replace(b'\n', b' ') if status == 200 and content else b'null'
+        self._stream.write(header[:-1].encode('utf-8') + b', "response": ' + body + b'}\n')
+        self.count += 1
+
+    def flush(self) -> int:
+        """End the current compressed block, sync it and return the archive size"""
+        self._stream.close()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        size = os.fstat(self._file.fileno()).st_size
+        self._stream = self._open_stream()
+        return size
+
+    def close(self):
+        """Flush and close the archive"""
+        self._stream.close()
+        self._file.close()
+        logger.info(f"Archived {self.count} responses to {self.path}")
+
+    def _open_stream(self):
+        if self.compression == 'gzip':
+            return gzip.GzipFile(fileobj=self._file, mode='wb', compresslevel=Settings.ARCHIVE_COMPRESSION_LEVEL)
+        if self.compression == 'zstd':
+            import zstandard
+            compressor = zstandard.ZstdCompressor(level=Settings.ARCHIVE_COMPRESSION_LEVEL)
+            return compressor.stream_writer(self._file, closefd=False)
+        return _Unclosable(self._file)
+
+    @staticmethod
+    def find(paths: List[str]) -> List[str]:
+        """Archive files under the given files or directories, oldest first by name"""
+        suffixes = tuple(f".{ext}" for ext in EXTENSIONS.values())
+        found = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    found.extend(os.path.join(root, name) for name in files if name.endswith(suffixes))
+            else:
+                found.append(path)
+        return sorted(found, key=os.path.basename)
+
+    @staticmethod
+    def read(path: str) -> Iterator[Dict]:
+        """Yield archived responses, stopping cleanly at a truncated tail"""
+        if path.endswith('.gz'):
+            stream = gzip.open(path, 'rb')
+            errors = (EOFError, zlib.error, gzip.BadGzipFile)
+        elif path.endswith('.zst'):
+            import zstandard
+            raw = open(path, 'rb')
+            stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True))
+            errors = (EOFError, zstandard.ZstdError)
+        else:
+            stream = open(path, 'rb')
+            errors = ()
+
+        try:
+            with stream:
+                for line in stream:
+                    try:
+                        yield PropertyParser.decode_json(line)
+                    except ValueError:
+                        # A partially written last line
+                        logger.warning(f"Skipping unreadable record in {path}")
+        except errors as e:
+            logger.warning(f"Archive {path} is truncated, stopping early: {e}")
+
+class _Unclosable:
+    """Uncompressed stream whose close leaves the underlying file open"""
+
+    def __init__(self, file):
+        self._file = file
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def close(self):
+        pass
\ No newline at end of file
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# How a listing changed since the previous run, as written to the delta output
+NEW, CHANGED, UNCHANGED, GONE = 'new', 'changed', 'unchanged', 'gone'
+
+class SeenIndex:
+    """Persistent ad_id -> (last seen, content hash) index backed by SQLite
+
+    The hash from the previous run is kept alongside the current one, so every
+    process of a run classifies an ad the same way however often it is seen.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(Settings.STATE_DIR, 'seen_index.sqlite3')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        # Crawl workers in other processes may hold the write lock briefly
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen_ads ('
+            ' ad_id TEXT PRIMARY KEY,'
+            ' first_seen TEXT NOT NULL,'
+            ' last_seen TEXT NOT NULL,'
+            ' content_hash TEXT NOT NULL,'
+            ' previous_hash TEXT,'
+            ' scope TEXT,'
+            ' removed_at TEXT)'
+        )
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """Add the change-tracking columns to indexes created before them"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(seen_ads)')}
+        for column in ('previous_hash', 'scope', 'removed_at'):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE seen_ads ADD COLUMN {column} TEXT')
+
+    def lookup(self, ad_ids: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Return (last_seen, content_hash) for the ids already indexed"""
+        if not ad_ids:
+            return {}
+
+        placeholders = ','.join('?' * len(ad_ids))
+        rows = self._conn.execute(
+            f'SELECT ad_id, last_seen, content_hash FROM seen_ads WHERE ad_id IN ({placeholders})',
+            ad_ids
+        )
+        return {ad_id: (last_seen, content_hash) for ad_id, last_seen, content_hash in rows}
+
+    def classify(self, entries: List[Tuple[str, str]], seen_at: datetime) -> Dict[str, str]:
+        """Classify (ad_id, content_hash) pairs as NEW, CHANGED or UNCHANGED for the run at `seen_at`"""
+        if not entries:
+            return {}
+
+        run = seen_at.isoformat(timespec='microseconds')
+        placeholders = ','.join('?' * len(entries))
+        rows = {
+            ad_id: row for ad_id, *row in self._conn.execute(
+                'SELECT ad_id, first_seen, last_seen, content_hash, previous_hash, removed_at '
+                f'FROM seen_ads WHERE ad_id IN ({placeholders})',
+                [ad_id for ad_id, _ in entries]
+            )
+        }
+
+        changes = {}
+        for ad_id, content_hash in entries:
+            row = rows.get(ad_id)
+            if row is None:
+                changes[ad_id] = NEW
+                continue
+
+            first_seen, last_seen, current_hash, previous_hash, removed_at = row
+            if removed_at or first_seen == run:
+                # Listings reported gone come back as new ones
+                changes[ad_id] = NEW
+            else:
+                # Once this run has upserted the ad, its earlier hash is the previous one
+                earlier_hash = previous_hash if last_seen == run else current_hash
+                changes[ad_id] = UNCHANGED if content_hash == earlier_hash else CHANGED
+        return changes
+
+    def upsert(self, entries: Iterable[Tuple[str, str, str]], seen_at: datetime):
+        """Record (ad_id, content_hash, scope) triples as seen at `seen_at`"""
+        seen = seen_at.isoformat(timespec='microseconds')
+        # The right-hand sides read the row as it was before this statement
+        self._conn.executemany(
+            'INSERT INTO seen_ads (ad_id, first_seen, last_seen, content_hash, scope) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(ad_id) DO UPDATE SET '
+            'first_seen = CASE WHEN seen_ads.removed_at IS NULL THEN seen_ads.first_seen '
+            'ELSE excluded.first_seen END, '
+            'previous_hash = CASE WHEN seen_ads.last_seen < excluded.last_seen THEN seen_ads.content_hash '
+            'ELSE seen_ads.previous_hash END, '
+            'last_seen = excluded.last_seen, '
+            'content_hash = excluded.content_hash, '
+            'scope = excluded.scope, '
+            'removed_at = NULL',
+            ((ad_id, seen, seen, content_hash, scope) for ad_id, content_hash, scope in entries)
+        )
+
+    def mark_gone(self, scopes: List[str], seen_at: datetime) -> List[str]:
+        """Mark ads in `scopes` not seen by the run at `seen_at` as removed, returning their ids
+
+        Only call this after a crawl that paged through every listing in the scopes.
+        """
+        if not scopes:
+            return []
+
+        run = seen_at.isoformat(timespec='microseconds')
+        placeholders = ','.join('?' * len(scopes))
+        condition = f'last_seen < ? AND removed_at IS NULL AND scope IN ({placeholders})'
+        gone = [ad_id for ad_id, in self._conn.execute(
+            f'SELECT ad_id FROM seen_ads WHERE {condition}', [run, *scopes]
+        )]
+        self._conn.execute(f'UPDATE seen_ads SET removed_at = ? WHERE {condition}', [run, run, *scopes])
+        self._conn.commit()
+        return gone
+
+    def begin(self):
+        """Commit pending updates and take the write lock until the next commit
+
+        Lookups inside the transaction then see no writes from other processes.
+        """
+        self._conn.commit()
+        self._conn.execute('BEGIN IMMEDIATE')
+
+    def commit(self):
+        """Flush pending updates to disk"""
+        self._conn.commit()
+
+    def close(self):
+        """Commit and close the index"""
+        self._conn.commit()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM seen_ads').fetchone()[0]
+
+    @staticmethod
+    def content_hash(ad: Dict) -> str:
+        """Hash the listing fields whose changes matter downstream"""
+        location = (ad.get('location') or {}).get('value') or {}
+        fields = [
+            ad.get('price'),
+            ad.get('area'),
+            ad.get('status'),
+            location.get('coordinates')
+        ]
+        return hashlib.sha1(json.dumps(fields, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def scope(ad: Dict) -> str:
+        """City/purpose slice of the market an ad belongs to, as in Partition.key"""
+        return f"{(ad.get('city') or {}).get('_id')}/{ad.get('purpose')}"
\ No newline at end of file
@@ -1,111 +1,126 @@
-from playwright.sync_api import sync_playwright, Browser
 from typing import Optional
+from urllib.parse import urlparse
 import logging
 from src.config import Settings, constants
+from src.utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 class TokenHarvester:
-    """Handles token harvesting from DealApp"""
+    """Harvests tokens from DealApp using a long-lived browser"""
+
+    def __init__(self):
+        # playwright.sync_api.Playwright and Browser, created by start()
+        self._playwright = None
+        self._browser = None
+        self._api_host = urlparse(Settings.BASE_URL).netloc
+
+    def start(self):
+        """Launch the shared browser process"""
+        if self._playwright is None:
+            # Playwright is only imported once a browser is actually needed
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+
+        if self._browser is None or not self._browser.is_connected():
+            self._browser = self._playwright.chromium.launch(
+                headless=Settings.HEADLESS,
+                args=constants.BROWSER_ARGS
+            )
+            logger.info("Browser launched for token harvesting")
+
+    def close(self):
+        """Shut down the browser process"""
+        try:
+            if self._browser:
+                self._browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+        finally:
+            self._browser = None
+
+        if self._playwright:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def harvest(self) -> Optional[str]:
+        """Harvest a token in a fresh context, launching the browser on first use"""
+        with metrics.timer('token_harvest_seconds'):
+            token = self._harvest()
+        metrics.inc('token_harvests_total', result='success' if token else 'failure')
+        return token
+
+    def _harvest(self) -> Optional[str]:
+        try:
+            self.start()
+            from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+            context = self._browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=constants.USER_AGENT,
+                locale='ar-SA',
+                timezone_id='Asia/Riyadh'
+            )
+        except Exception as e:
+            logger.error(f"Critical error in token harvesting: {e}")
+            self.close()
+            return None
 
-    @staticmethod
-    def harvest_single_token() -> Optional[str]:
-        """Harvest a single token reliably"""
-        browser = None
         try:
-            with sync_playwright() as p:
-                # Launch with specific args for Docker
-                browser = p.chromium.launch(
-                    headless=Settings.HEADLESS,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-dev-shm-usage',  # Important for Docker
-                        '--disable-setuid-sandbox',
-                        '--no-sandbox',  # Required in Docker
-                        '--disable-gpu',
-                        '--disable-web-security',
-                        '--disable-features=IsolateOrigins,site-per-process'
-                    ]
-                )
-
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent=constants.USER_AGENT,
-                    locale='ar-SA',
-                    timezone_id='Asia/Riyadh'
-                )
-
-                # Set extra headers
-                context.set_extra_http_headers({
-                    'Accept-Language': 'ar,en;q=0.9'
-                })
-
-                page = context.new_page()
-                captured_token = None
-
-                # Intercept requests to capture token
-                def capture_token(request):
-                    auth_header = request.headers.get('authorization', '')
-                    if auth_header.startswith('Bearer ') and 'api.dealapp.sa' in request.url:
-                        nonlocal captured_token
-                        captured_token = auth_header.replace('Bearer ', '')
-                        logger.debug(f"Token captured from request to: {request.url}")
-
-                page.on('request', capture_token)
+            context.set_extra_http_headers({
+                'Accept-Language': 'ar,en;q=0.9'
+            })
+            # The token only needs the app's API calls, not its media
+            context.route('**/*', self._route_request)
 
+            page = context.new_page()
+
+            for url in (Settings.SITE_URL, f"{Settings.SITE_URL}{constants.MARKET_PATH}"):
                 try:
-                    # Navigate to site with retry
-                    max_retries = 3
-                    for attempt in range(max_retries):
-                        try:
-                            page.goto('https://dealapp.sa', 
-                                    wait_until='networkidle', 
-                                    timeout=Settings.BROWSER_TIMEOUT)
-                            break
-                        except Exception as e:
-                            logger.warning(f"Navigation attempt {attempt + 1} failed: {e}")
-                            if attempt == max_retries - 1:
-                                raise
-
-                    # Wait for page to stabilize
-                    page.wait_for_timeout(3000)
-
-                    # Try multiple methods to trigger API calls
-                    # Method 1: Click on market link
-                    try:
-                        market = page.locator('text=السوق').first
-                        if market.is_visible():
-                            market.click()
-                            page.wait_for_timeout(2000)
-                            logger.debug("Clicked on السوق")
-                    except:
-                        logger.debug("Could not click market link")
-
-                    # Method 2: Try direct navigation to properties
-                    if not captured_token:
-                        try:
-                            page.goto('https://dealapp.sa/ar/السوق/الاعلانات', 
-                                    wait_until='domcontentloaded',
-                                    timeout=10000)
-                            page.wait_for_timeout(2000)
-                        except:
-                            pass
-
-                    if captured_token:
-                        logger.info("Successfully captured token")
-                    else:
-                        logger.warning("Failed to capture token from requests")
-
-                except Exception as e:
-                    logger.error(f"Error during token harvesting: {e}")
-                finally:
-                    context.close()
-
-                browser.close()
-                return captured_token
+                    with page.expect_request(self._is_authorized_api_request,
+                                             timeout=Settings.BROWSER_TIMEOUT) as request_info:
+                        page.goto(url, wait_until='commit', timeout=Settings.BROWSER_TIMEOUT)
+
+                    request = request_info.value
+                    logger.debug(f"Token captured from request to: {request.url}")
+                    logger.info("Successfully captured token")
+                    return request.headers['authorization'][len('Bearer '):]
+
+                except PlaywrightTimeoutError:
+                    logger.warning(f"No authorized API request seen on {url}")
+
+            logger.warning("Failed to capture token from requests")
+            return None
 
         except Exception as e:
-            logger.error(f"Critical error in token harvesting: {e}")
-            if browser:
-                browser.close()
-            return None
\ No newline at end of file
+            logger.error(f"Error during token harvesting: {e}")
+            return None
+        finally:
+            context.close()
+
+    @staticmethod
+    def harvest_single_token() -> Optional[str]:
+        """Harvest a single token with a short-lived browser"""
+        harvester = TokenHarvester()
+        try:
+            return harvester.harvest()
+        finally:
+            harvester.close()
+
+    def _is_authorized_api_request(self, request) -> bool:
+        """Whether a request carries the API bearer token"""
+        auth_header = request.headers.get('authorization', '')
+        return auth_header.startswith('Bearer ') and self._api_host in request.url
+
+    @staticmethod
+    def _route_request(route):
+        """Skip heavy resources that never carry the token"""
+        if route.request.resource_type in constants.BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
\ No newline at end of file
@@ -0,0 +1,184 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Optional
+from src.config import Settings
+from src.models import Token
+from src.utils.metrics import metrics
+from src.utils.token_harvester import TokenHarvester
+from src.utils.token_store import TokenStore
+
+logger = logging.getLogger(__name__)
+
+class TokenPrefetcher:
+    """Keeps a bounded queue of fresh tokens filled from a background thread
+
+    Valid tokens cached by earlier runs are used before the browser is started.
+    A token is only fetched once a consumer waits for one or every token in
+    hand is about to expire, so runs covered by cached tokens never launch it.
+    """
+
+    def __init__(self, depth: int = None, ttl: float = None, max_tokens: int = None,
+                 store: Optional[TokenStore] = None):
+        self.depth = depth or Settings.TOKEN_QUEUE_DEPTH
+        self.ttl = ttl or Settings.TOKEN_TTL
+        self.max_tokens = max_tokens or Settings.MAX_TOKENS
+        self.store = store if store is not None else (TokenStore() if Settings.TOKEN_STORE else None)
+        self.harvest_attempts = 0
+
+        # Heap ordered by expiry so tokens closest to expiring are used first
+        self._heap = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._finished = False
+        self._harvesting = False
+        self._waiting = 0
+        # Tokens handed out by get() and not released yet, by id
+        self._in_use = {}
+        self._thread = threading.Thread(target=self._run, name='token-prefetcher', daemon=True)
+
+    def start(self):
+        """Start the background harvesting thread"""
+        self._thread.start()
+
+    def stop(self):
+        """Stop harvesting and return unused tokens to the store
+
+        A harvest already in progress is not waited for; its token goes to the store.
+        """
+        with self._cond:
+            self._stopped.set()
+            harvesting = self._harvesting
+            self._cond.notify_all()
+        if not harvesting and self._thread.is_alive():
+            self._thread.join()
+
+        with self._cond:
+            unused = [entry[2] for entry in self._heap]
+            self._heap.clear()
+        for token in unused:
+            self.release(token)
+
+    def release(self, token: Token):
+        """Record a used token's requests and 403s so later runs can reuse it"""
+        with self._cond:
+            self._in_use.pop(id(token), None)
+            self._cond.notify_all()
+        if self.store is not None:
+            self.store.release(token)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get(self, timeout: float = None) -> Optional[Token]:
+        """Take the usable token closest to expiry, waiting for one if needed"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._cond:
+            self._waiting += 1
+            self._cond.notify_all()
+            try:
+                while True:
+                    self._discard_expired()
+                    if self._heap:
+                        token = heapq.heappop(self._heap)[2]
+                        self._in_use[id(token)] = token
+                        self._cond.notify_all()
+                        return token
+
+                    if self._finished:
+                        return None
+
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def _run(self):
+        """Fetch a token from the store or the browser whenever one is needed"""
+        harvester = TokenHarvester()
+        try:
+            while not self._stopped.is_set() and self.harvest_attempts < self.max_tokens:
+                with self._cond:
+                    while not self._stopped.is_set():
+                        self._discard_expired()
+                        wait = self._seconds_until_needed()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(min(wait, self.ttl / 10))
+                if self._stopped.is_set():
+                    break
+
+                token = self.store.checkout() if self.store is not None else None
+                if token is not None:
+                    metrics.inc('token_store_hits_total')
+                    self._push(token, 'cached')
+                    continue
+
+                with self._cond:
+                    if self._stopped.is_set():
+                        break
+                    self._harvesting = True
+                self.harvest_attempts += 1
+                logger.info(f"Harvesting token {self.harvest_attempts}/{self.max_tokens}...")
+                try:
+                    value = harvester.harvest()
+                finally:
+                    with self._cond:
+                        self._harvesting = False
+
+                if value:
+                    token = Token.from_value(value, self.ttl)
+                    if self.store is not None:
+                        self.store.add(token)
+                    if self._stopped.is_set():
+                        # stop() returned without this harvest, so later runs get the token
+                        self.release(token)
+                        break
+                    self._push(token, 'harvested')
+                else:
+                    logger.error("Failed to harvest token, retrying...")
+                    self._stopped.wait(Settings.TOKEN_RETRY_DELAY)
+
+        except Exception as e:
+            logger.error(f"Token prefetcher stopped: {e}")
+        finally:
+            harvester.close()
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def _push(self, token: Token, source: str):
+        with self._cond:
+            heapq.heappush(self._heap, (token.expires_at, next(self._sequence), token))
+            self._cond.notify_all()
+            ready = len(self._heap)
+        logger.info(f"Token queued ({source}): {token.value[:50]}... ({ready}/{self.depth} ready, "
+                    f"expires in {token.ttl:.0f}s)")
+
+    def _seconds_until_needed(self) -> float:
+        """Seconds until another token is needed, 0 once a consumer waits or the tokens in hand near expiry"""
+        if len(self._heap) >= self.depth:
+            return self.ttl / 10
+        if self._waiting > len(self._heap):
+            return 0
+
+        # Without usable tokens in hand, the next get() signals the need
+        horizon = Settings.TOKEN_EXPIRY_MARGIN + Settings.TOKEN_HARVEST_LEAD
+        tokens = [entry[2] for entry in self._heap] + list(self._in_use.values())
+        return max([token.ttl - horizon for token in tokens if not token.exhausted], default=self.ttl / 10)
+
+    def _discard_expired(self):
+        """Drop queued tokens that would expire before they can be used"""
+        while self._heap and not self._heap[0][2].is_usable(Settings.TOKEN_EXPIRY_MARGIN):
+            token = heapq.heappop(self._heap)[2]
+            logger.info(f"Discarding expired token harvested {token.age:.0f}s ago")
\ No newline at end of file
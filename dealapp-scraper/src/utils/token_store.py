@@ -0,0 +1,113 @@
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from src.config import Settings
+from src.models import Token
+
+logger = logging.getLogger(__name__)
+
+class TokenStore:
+    """On-disk token cache shared by runs and processes, backed by SQLite
+
+    A token checked out by a process is leased to its pid until it is
+    released, so concurrent crawl workers never share a token.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(Settings.STATE_DIR, 'tokens.sqlite3')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS tokens ('
+                ' value TEXT PRIMARY KEY,'
+                ' expires_at REAL NOT NULL,'
+                ' harvested_at REAL NOT NULL,'
+                ' requests_served INTEGER NOT NULL DEFAULT 0,'
+                ' forbidden INTEGER NOT NULL DEFAULT 0,'
+                ' exhausted INTEGER NOT NULL DEFAULT 0,'
+                ' lease_pid INTEGER)'
+            )
+
+    def add(self, token: Token):
+        """Store a freshly harvested token, leased to this process"""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO tokens (value, expires_at, harvested_at, requests_served, '
+                'forbidden, exhausted, lease_pid) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (token.value, token.expires_at, token.harvested_at, token.requests_served,
+                 token.forbidden, int(token.exhausted), os.getpid())
+            )
+
+    def checkout(self, margin: float = None) -> Optional[Token]:
+        """Lease the unexhausted token closest to expiry that is valid for at least `margin` seconds"""
+        margin = Settings.TOKEN_EXPIRY_MARGIN if margin is None else margin
+        now = time.time()
+
+        with self._connect() as conn:
+            # Take the write lock up front so two processes cannot lease the same token
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM tokens WHERE expires_at <= ?', (now,))
+            rows = conn.execute(
+                'SELECT value, expires_at, harvested_at, requests_served, forbidden, lease_pid '
+                'FROM tokens WHERE exhausted = 0 AND expires_at > ? ORDER BY expires_at',
+                (now + margin,)
+            ).fetchall()
+
+            for value, expires_at, harvested_at, requests_served, forbidden, lease_pid in rows:
+                if lease_pid is not None and self._alive(lease_pid):
+                    continue
+
+                conn.execute('UPDATE tokens SET lease_pid = ? WHERE value = ?', (os.getpid(), value))
+                return Token(value=value, expires_at=expires_at, harvested_at=harvested_at,
+                             requests_served=requests_served, forbidden=forbidden)
+
+        return None
+
+    def release(self, token: Token):
+        """Record a token's usage and return it to the store unless it is exhausted"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE tokens SET requests_served = ?, forbidden = ?, exhausted = ?, lease_pid = NULL '
+                'WHERE value = ?',
+                (token.requests_served, token.forbidden, int(token.exhausted), token.value)
+            )
+
+    def available(self) -> int:
+        """Number of unexpired, unexhausted tokens"""
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM tokens WHERE exhausted = 0 AND expires_at > ?', (time.time(),)
+            ).fetchone()[0]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the store usable from any thread
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.execute('COMMIT')
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        """Whether the process holding a lease is still running"""
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
\ No newline at end of file